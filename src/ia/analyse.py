@@ -0,0 +1,187 @@
+""" Analyse en série de positions, par exemple celles de parties enregistrées. Les positions sont lues au fil de l'eau
+    sur l'entrée standard ou dans un fichier, une par ligne, sous l'une des deux formes :
+        - texte : le plateau (24 caractères 'x', '1' ou '2'), la phase (1 placement, 2 ou 3 déplacement) et le joueur
+        au trait ('1' ou '2'), séparés par des espaces, par exemple « 1x2x1xx2xx12xx1x2xx1x2xx 1 1 » ;
+        - JSON : un objet {"plateau": ..., "phase": ..., "joueur": ...}, avec éventuellement "enMain" (pions restant à
+        placer à chaque joueur, voir minimax) et "id" (recopié dans le résultat).
+    Les lignes vides et celles qui commencent par « # » sont ignorées.
+
+    Chaque position est cherchée par minimax, à profondeur fixe ou avec un budget de temps, et son résultat est écrit
+    aussitôt sur la sortie standard, sous forme d'une ligne JSON : numéro de ligne, coup choisi, plateau obtenu, score
+    (du point de vue du joueur '1', comme minimax ; « +inf » ou « -inf » pour une partie gagnée ou perdue), profondeur
+    atteinte et nœuds cherchés. Une ligne invalide produit un résultat contenant seulement son numéro et l'erreur.
+
+    Avec --processus, les positions sont réparties sur un ensemble de processus. Les résultats sont écrits dans l'ordre
+    des positions, et seul un nombre borné de positions est lu d'avance : la mémoire occupée ne dépend pas de la taille
+    de l'entrée.
+
+    Utilisation : python3 -m src.ia.analyse [--entree fichier] [--niveau 3] [--profondeur 4] [--temps T]
+                  [--processus N] """
+
+import json
+import multiprocessing
+import os
+import sys
+from collections import deque
+
+from src.ia.benchmark import HEURISTIQUES
+from src.ia.minimax import minimax, minimaxIteratif, PROFONDEUR_MAX
+from src.ia.utils import extraireOption
+
+PROFONDEUR_DEFAUT = 4
+TACHES_PAR_PROCESSUS = 2  # Positions en attente par processus : assez pour l'occuper, sans lire toute l'entrée
+
+
+def lirePosition(ligne):
+    """ Lit une position sous forme de texte ou d'objet JSON.
+        :param ligne: str - Ligne de l'entrée, sans espaces superflus.
+        :return: dict - Plateau (liste), phase 1 (booléen), joueur ('1' ou '2'), pions en main (tuple ou None) et
+        identifiant (ou None). Lève ValueError si la ligne est invalide. """
+
+    if ligne.startswith('{'):
+        objet = json.loads(ligne)  # json.JSONDecodeError est une ValueError
+        if not isinstance(objet, dict):
+            raise ValueError("objet JSON attendu")
+        try:
+            plateau, phase, joueur = objet['plateau'], str(objet['phase']), str(objet['joueur'])
+        except KeyError as cle:
+            raise ValueError(f"champ {cle} manquant")
+        enMain, identifiant = objet.get('enMain'), objet.get('id')
+    else:
+        champs = ligne.split()
+        if len(champs) != 3:
+            raise ValueError("plateau, phase et joueur attendus")
+        plateau, phase, joueur = champs
+        enMain = identifiant = None
+
+    if not isinstance(plateau, str) or len(plateau) != 24 or set(plateau) - set('x12'):
+        raise ValueError("le plateau doit compter 24 cases 'x', '1' ou '2'")
+    if phase not in ('1', '2', '3'):
+        raise ValueError("la phase doit valoir 1, 2 ou 3")
+    if joueur not in ('1', '2'):
+        raise ValueError("le joueur doit valoir '1' ou '2'")
+    if enMain is not None:
+        if not isinstance(enMain, list) or len(enMain) != 2 \
+                or not all(isinstance(n, int) and 0 <= n <= 9 for n in enMain):
+            raise ValueError("enMain doit donner les pions restant à placer (de 0 à 9) à chaque joueur")
+        enMain = tuple(enMain)
+    return {'plateau': list(plateau), 'etape1': phase == '1', 'joueur': joueur, 'enMain': enMain,
+            'id': identifiant}
+
+
+def score(valeur):
+    """ Convertit un score pour l'écriture en JSON, qui ne connaît pas l'infini.
+        :param valeur: float - Score de minimax.
+        :return: Le score, ou « +inf » / « -inf ». """
+
+    if valeur == float('inf'):
+        return '+inf'
+    if valeur == float('-inf'):
+        return '-inf'
+    return valeur
+
+
+def analyserLigne(tache):
+    """ Analyse une ligne de l'entrée. Exécutée dans un processus du pool, ou directement sans --processus.
+        :param tache: Tuple (numéro de la ligne, ligne, niveau de l'heuristique, profondeur, temps ou None).
+        :return: dict - Résultat de l'analyse, ou numéro de ligne et erreur. """
+
+    numero, ligne, niveau, profondeur, temps = tache
+    try:
+        position = lirePosition(ligne)
+    except ValueError as erreur:
+        return {'ligne': numero, 'erreur': str(erreur)}
+
+    resultat = {'ligne': numero}
+    if position['id'] is not None:
+        resultat['id'] = position['id']
+    maximisant = position['joueur'] == '1'
+    heuristique = HEURISTIQUES[niveau]
+    if temps is None:
+        evaluation = minimax(position['plateau'], profondeur, maximisant, float('-inf'), float('inf'),
+                             position['etape1'], heuristique, enMain=position['enMain'])
+    else:
+        evaluation = minimaxIteratif(position['plateau'], maximisant, position['etape1'], heuristique, temps,
+                                     profondeurMax=profondeur, enMain=position['enMain'])
+    coup = evaluation.coup
+    resultat['coup'] = None if coup is None else {'depart': coup.depart, 'arrivee': coup.arrivee,
+                                                  'capture': coup.capture}
+    resultat['plateau'] = "".join(evaluation.plateau)
+    resultat['score'] = score(evaluation.evaluer)
+    resultat['profondeur'] = evaluation.profondeur
+    resultat['noeuds'] = evaluation.noeuds
+    return resultat
+
+
+def taches(lignes, niveau, profondeur, temps):
+    """ Transforme les lignes de l'entrée en tâches d'analyse, à mesure qu'elles sont lues.
+        :param lignes: Itérable de lignes (par exemple un fichier ouvert).
+        :param niveau: str - Niveau de l'heuristique ('1', '2' ou '3').
+        :param profondeur: int - Profondeur de recherche (maximale si un budget de temps est donné).
+        :param temps: float ou None - Budget de temps par position, en secondes.
+        :return: Générateur de tuples (numéro de ligne, ligne, niveau, profondeur, temps). """
+
+    for numero, ligne in enumerate(lignes, 1):
+        ligne = ligne.strip()
+        if ligne and not ligne.startswith('#'):
+            yield numero, ligne, niveau, profondeur, temps
+
+
+def analyserFlux(lignes, niveau='3', profondeur=PROFONDEUR_DEFAUT, temps=None, processus=1):
+    """ Analyse les positions lues au fil de l'eau et produit leurs résultats dans l'ordre de l'entrée.
+        :param lignes: Itérable de lignes.
+        :param niveau: str - Niveau de l'heuristique ('1' naïve, '2' avancée, '3' experte).
+        :param profondeur: int - Profondeur de recherche (maximale si un budget de temps est donné).
+        :param temps: float ou None - Budget de temps par position, en secondes.
+        :param processus: int - Nombre de processus ; au-delà de 1, les positions sont analysées en parallèle.
+        :return: Générateur des résultats (dictionnaires, voir analyserLigne). """
+
+    if processus <= 1:
+        for tache in taches(lignes, niveau, profondeur, temps):
+            yield analyserLigne(tache)
+        return
+
+    # Pool.imap lirait toute l'entrée d'avance : les tâches sont soumises une à une, dans une fenêtre bornée, et
+    # leurs résultats sont attendus dans l'ordre de soumission
+    with multiprocessing.Pool(processus) as pool:
+        enCours = deque()
+        for tache in taches(lignes, niveau, profondeur, temps):
+            enCours.append(pool.apply_async(analyserLigne, (tache,)))
+            if len(enCours) >= processus * TACHES_PAR_PROCESSUS:
+                yield enCours.popleft().get()
+        while enCours:
+            yield enCours.popleft().get()
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    try:
+        entreeDonnee = extraireOption(arguments, "entree", str)
+        niveauDonne = extraireOption(arguments, "niveau", str)
+        if niveauDonne is None:
+            niveauDonne = '3'
+        profondeurDonnee = extraireOption(arguments, "profondeur", int)
+        tempsDonne = extraireOption(arguments, "temps", float)
+        processusDonnes = extraireOption(arguments, "processus", int)
+        if processusDonnes is None:
+            processusDonnes = 1
+        if arguments or niveauDonne not in HEURISTIQUES or processusDonnes < 1 \
+                or (profondeurDonnee is not None and profondeurDonnee < 1) \
+                or (tempsDonne is not None and tempsDonne <= 0):
+            raise ValueError("arguments invalides")
+        entree = sys.stdin if entreeDonnee in (None, '-') else open(entreeDonnee)
+    except (ValueError, OSError) as erreur:
+        print(f"\033[91mErreur : {erreur}.\033[0m", file=sys.stderr)
+        print("Utilisation : python3 -m src.ia.analyse [--entree fichier] [--niveau 3] [--profondeur 4] [--temps T] "
+              "[--processus N]", file=sys.stderr)
+        sys.exit(1)
+
+    if profondeurDonnee is None:
+        profondeurDonnee = PROFONDEUR_DEFAUT if tempsDonne is None else PROFONDEUR_MAX
+    try:
+        with entree:
+            for resultatAnalyse in analyserFlux(entree, niveauDonne, profondeurDonnee, tempsDonne, processusDonnes):
+                print(json.dumps(resultatAnalyse, ensure_ascii=False), flush=True)
+    except BrokenPipeError:  # Sortie fermée avant la fin (par exemple par « head ») : rien de plus à écrire
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
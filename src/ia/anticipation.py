@@ -0,0 +1,115 @@
+""" Réflexion sur le temps de l'adversaire (« pondering »). Pendant que l'humain choisit son coup, l'IA resterait
+    inactive, puis chercherait sa réponse à partir de rien. Un processus en arrière-plan cherche donc la position
+    pendant ce temps : par approfondissement itératif, il cherche la position obtenue après chacune des réponses
+    possibles de l'adversaire, en commençant par les plus dangereuses pour l'IA.
+
+    Les résultats sont écrits dans une table de transposition en mémoire partagée (comme pour parallele.py), que la
+    recherche de l'IA reçoit ensuite : si la position jouée a déjà été cherchée assez profondément, la recherche lit
+    directement son score et son coup à la racine ; sinon, elle profite des sous-arbres déjà explorés. """
+
+import multiprocessing
+from multiprocessing import shared_memory
+
+from src.ia.bitboard import coupsPossibles
+from src.ia.etat import mainsSelonPhase
+from src.ia.finales import chargerFinales
+from src.ia.heuristiques import versionBitboard
+from src.ia.minimax import ContexteRecherche, TempsEcoule, creerEtat, negamax, PROFONDEUR_MAX, NOEUDS_QUIESCENCE
+from src.ia.ordonnancement import OrdonnancementCoups
+from src.ia.transposition import TableTransposition, MEMOIRE_DEFAUT, FORMAT_ENTREE
+from src.ia.vectorisation import versionGroupee
+
+
+def anticiper(nomMemoire, plateau, joueur, enMain, heuristique, arret, generation=0):
+    """ Corps du processus d'anticipation : cherche, à des profondeurs croissantes, chaque position obtenue après une
+    réponse de l'adversaire, jusqu'à ce que l'arrêt soit demandé.
+        :param nomMemoire: Nom du segment de mémoire partagée contenant la table de transposition.
+        :param plateau: Liste représentant l'état du plateau, l'adversaire de l'IA étant au trait.
+        :param joueur: Indice de l'adversaire de l'IA (0 ou 1).
+        :param enMain: Tuple des pions restant à placer à chaque joueur (voir mainsSelonPhase).
+        :param heuristique: Fonction heuristique (sur liste) de l'IA.
+        :param arret: multiprocessing.Event signalant que l'adversaire a joué.
+        :param generation: int - Génération de la table dans le processus principal, utilisée pour les écritures. """
+
+    memoire = shared_memory.SharedMemory(name=nomMemoire)
+    try:
+        table = TableTransposition(tampon=memoire.buf)
+        table.generation = generation
+        contexte = ContexteRecherche(versionBitboard(heuristique), table,
+                                     ordonnancement=OrdonnancementCoups(), arret=arret,
+                                     groupee=versionGroupee(heuristique), finales=chargerFinales(),
+                                     quiescence=NOEUDS_QUIESCENCE, pvs=True)
+        etat = creerEtat(plateau, joueur, heuristique, enMain)
+        reponses = coupsPossibles(etat.pions, joueur, etat.etape1)
+        scores = {}
+        try:
+            for profondeur in range(1, PROFONDEUR_MAX + 1):
+                for reponse in reponses:
+                    if arret.is_set():
+                        return
+                    etat.appliquer(reponse, joueur)
+                    # Recherche à fenêtre complète : la racine est enregistrée dans la table comme valeur exacte
+                    scores[reponse], _ = negamax(etat, profondeur, 1 - joueur, float('-inf'), float('inf'), contexte)
+                    etat.annuler(reponse, joueur)
+                # Les réponses les plus dangereuses pour l'IA sont les plus probables : elles sont cherchées en premier
+                reponses.sort(key=lambda coup: scores[coup])
+        except TempsEcoule:
+            pass  # L'adversaire a joué : la recherche en cours est abandonnée
+        finally:
+            del contexte, table  # Libère la vue sur la mémoire partagée avant de la fermer
+    finally:
+        memoire.close()
+
+
+class Anticipation:
+    """ Réflexion de l'IA pendant le tour de son adversaire, dans un processus séparé partageant avec elle une table de
+    transposition. """
+
+    def __init__(self, heuristique, memoire=MEMOIRE_DEFAUT):
+        """ :param heuristique: Fonction heuristique de l'IA (doit pouvoir être transmise à un autre processus).
+            :param memoire: Taille de la table de transposition partagée, en octets. """
+
+        self.heuristique = heuristique
+        taille = max(1, memoire // FORMAT_ENTREE.size) * FORMAT_ENTREE.size
+        self.memoire = shared_memory.SharedMemory(create=True, size=taille)
+        self.table = TableTransposition(tampon=self.memoire.buf)  # Table à transmettre à la recherche de l'IA
+        self.table.vider()
+        self.contexteMp = multiprocessing.get_context()
+        self.processus = None
+        self.arret = None
+
+    def demarrer(self, plateau, joueur, etape1, enMain=None):
+        """ Commence à réfléchir sur la position, pendant que l'adversaire choisit son coup.
+            :param plateau: Liste représentant l'état du plateau, l'adversaire de l'IA étant au trait.
+            :param joueur: Indice de l'adversaire de l'IA (0 ou 1).
+            :param etape1: Booléen indiquant si l'on est à l'étape 1 du jeu.
+            :param enMain: Tuple des pions restant à placer à chaque joueur, ou None (voir minimax) ; il doit être
+            celui que recevra la recherche de l'IA, les pions en main faisant partie des clés de la table. """
+
+        self.arreter()
+        self.arret = self.contexteMp.Event()
+        self.processus = self.contexteMp.Process(target=anticiper, daemon=True,
+                                                 args=(self.memoire.name, plateau[:], joueur,
+                                                       mainsSelonPhase(etape1, enMain), self.heuristique, self.arret,
+                                                       self.table.generation))
+        self.processus.start()
+
+    def arreter(self):
+        """ Arrête la réflexion en cours (l'adversaire a joué) ; la table conserve tout ce qui a été cherché. """
+
+        if self.processus is None:
+            return
+        self.arret.set()
+        self.processus.join(timeout=2.0)
+        if self.processus.is_alive():
+            self.processus.terminate()
+            self.processus.join()
+        self.processus = None
+
+    def fermer(self):
+        """ Arrête la réflexion et libère la mémoire partagée. """
+
+        self.arreter()
+        self.table = None
+        self.memoire.close()
+        self.memoire.unlink()
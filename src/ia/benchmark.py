@@ -0,0 +1,251 @@
+""" Banc d'essai reproductible de la recherche et de l'évaluation. Sur un ensemble fixe de positions (début et milieu
+    de placement, phase 2, phase 3 avec vol), il mesure pour chaque heuristique :
+        - à chaque profondeur : le temps de recherche, le nombre de nœuds et les nœuds par seconde ;
+        - le nombre d'évaluations par seconde (version sur liste et version sur bitboards utilisée par la recherche) ;
+    et, indépendamment des heuristiques, le nombre de générations de coups par seconde (utils.py et bitboard.py).
+
+    Chaque mesure est le meilleur de plusieurs répétitions. Les résultats sont écrits en JSON et peuvent être comparés
+    à une référence enregistrée auparavant : une mesure est une régression si elle se dégrade de plus du seuil donné
+    (en pourcentage), et le programme se termine alors avec le code 1. La progression et la comparaison sont écrites
+    sur la sortie d'erreur, pour que la sortie standard ne contienne que le JSON.
+
+    Utilisation : python3 -m src.ia.benchmark [--profondeurs 1,2,3,4] [--heuristiques 1,2,3] [--repetitions 3]
+                  [--sortie resultats.json] [--reference reference.json] [--seuil 10] """
+
+import json
+import platform
+import sys
+import time
+
+from src.ia.bitboard import coupsPossibles, versBitboard
+from src.ia.heuristiques import heuristiqueNaive, heuristiqueAvancee, heuristiqueExperte, versionBitboard
+from src.ia.minimax import minimax
+from src.ia.utils import mouvementsPossiblesEtape1, mouvementsPossiblesEtape2ou3, extraireOption
+
+HEURISTIQUES = {'1': heuristiqueNaive, '2': heuristiqueAvancee, '3': heuristiqueExperte}
+
+# Positions de référence : (nom, plateau, phase 1, joueur au trait)
+POSITIONS = (
+    ("placement_debut", "xxxxxxxxxxxxxxxxxxxxxxxx", True, '1'),
+    ("placement_debut_2", "xxxx1xxxxx1xxxxxxxx2xxxx", True, '2'),
+    ("placement_milieu", "1x2x1xx2xx12xx1x2xx1x2xx", True, '1'),
+    ("placement_milieu_2", "12xx1x2x2x1xxx1x2xx21xx1", True, '2'),
+    ("phase2_ouverte", "1x21x2x12x1x2xx1x2x1x2x1", False, '1'),
+    ("phase2_serree", "12121x2x1x2121x21x2x1x12", False, '2'),
+    ("phase2_moulins", "111x2x2x2x1x2x1xx22xx1x1", False, '1'),
+    ("phase3_vol", "1x2xx2x1xx2x2xx1xxx2xx2x", False, '1'),
+    ("phase3_vol_2", "2xx1x1x2xx1xx2xxxx1x1xx1", False, '2'),
+)
+
+
+def chronometrer(fonction, repetitions):
+    """ Exécute une fonction plusieurs fois et garde la meilleure durée (la moins perturbée par le reste du système).
+        :param fonction: Fonction sans argument à mesurer.
+        :param repetitions: int - Nombre d'exécutions.
+        :return: tuple - (meilleure durée en secondes, résultat de la dernière exécution). """
+
+    meilleure = float('inf')
+    resultat = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        meilleure = min(meilleure, time.perf_counter() - debut)
+    return meilleure, resultat
+
+
+def mesurerRecherche(heuristique, profondeur, repetitions):
+    """ Cherche chaque position de référence à une profondeur fixe.
+        :param heuristique: Fonction heuristique (sur liste).
+        :param profondeur: int - Profondeur de recherche.
+        :param repetitions: int - Nombre de répétitions de chaque recherche.
+        :return: dict - Temps total, nœuds, nœuds par seconde, et détail par position. """
+
+    detail = {}
+    for nom, plateau, phase1, joueur in POSITIONS:
+        def rechercher():
+            return minimax(list(plateau), profondeur, joueur == '1', float('-inf'), float('inf'), phase1, heuristique,
+                           finales=False)  # Indépendant des bases de finales générées, comme la référence de perft
+        duree, evaluation = chronometrer(rechercher, repetitions)
+        detail[nom] = {'temps': duree, 'noeuds': evaluation.noeuds}
+    temps = sum(mesure['temps'] for mesure in detail.values())
+    noeuds = sum(mesure['noeuds'] for mesure in detail.values())
+    return {'temps': temps, 'noeuds': noeuds, 'noeudsParSeconde': noeuds / temps if temps else 0.0,
+            'positions': detail}
+
+
+def mesurerEvaluations(heuristique, repetitions, nombre=200):
+    """ Mesure le débit d'une heuristique sur les positions de référence.
+        :param heuristique: Fonction heuristique (sur liste).
+        :param repetitions: int - Nombre de répétitions.
+        :param nombre: int - Nombre de passages sur l'ensemble des positions par répétition.
+        :return: dict - Évaluations par seconde, sur liste et sur bitboards. """
+
+    plateaux = [(list(plateau), phase1) for _, plateau, phase1, _ in POSITIONS]
+    bitboards = [(*versBitboard(plateau), phase1) for plateau, phase1 in plateaux]
+    heuristiqueBits = versionBitboard(heuristique)
+
+    def evaluerListes():
+        for _ in range(nombre):
+            for plateau, phase1 in plateaux:
+                heuristique(plateau, phase1)
+
+    def evaluerBitboards():
+        for _ in range(nombre):
+            for b1, b2, phase1 in bitboards:
+                heuristiqueBits(b1, b2, phase1, 0)
+
+    appels = nombre * len(POSITIONS)
+    dureeListes, _ = chronometrer(evaluerListes, repetitions)
+    dureeBitboards, _ = chronometrer(evaluerBitboards, repetitions)
+    return {'evaluationsParSeconde': appels / dureeBitboards, 'evaluationsListeParSeconde': appels / dureeListes}
+
+
+def mesurerGeneration(repetitions, nombre=200):
+    """ Mesure le débit des générateurs de coups sur les positions de référence.
+        :param repetitions: int - Nombre de répétitions.
+        :param nombre: int - Nombre de passages sur l'ensemble des positions par répétition.
+        :return: dict - Générations par seconde, sur liste (utils.py) et sur bitboards (bitboard.py). """
+
+    def genererListes():
+        for _ in range(nombre):
+            for _, plateau, phase1, joueur in POSITIONS:
+                liste = list(plateau)
+                if phase1:
+                    mouvementsPossiblesEtape1(liste)  # Génère les placements du joueur '2', comme minimax
+                else:
+                    mouvementsPossiblesEtape2ou3(liste, joueur)
+
+    positionsBits = [(list(versBitboard(list(plateau))), 0 if joueur == '1' else 1, phase1)
+                     for _, plateau, phase1, joueur in POSITIONS]
+
+    def genererBitboards():
+        for _ in range(nombre):
+            for pions, joueur, phase1 in positionsBits:
+                coupsPossibles(pions, joueur, phase1)
+
+    appels = nombre * len(POSITIONS)
+    dureeListes, _ = chronometrer(genererListes, repetitions)
+    dureeBitboards, _ = chronometrer(genererBitboards, repetitions)
+    return {'generationsParSeconde': appels / dureeBitboards, 'generationsListeParSeconde': appels / dureeListes}
+
+
+def lancerBenchmark(niveaux=('1', '2', '3'), profondeurs=(1, 2, 3, 4), repetitions=3, journal=print):
+    """ Lance l'ensemble des mesures.
+        :param niveaux: Niveaux des heuristiques mesurées ('1' naïve, '2' avancée, '3' experte).
+        :param profondeurs: Profondeurs de recherche mesurées.
+        :param repetitions: int - Nombre de répétitions de chaque mesure.
+        :param journal: Fonction d'affichage de la progression, ou None.
+        :return: dict - Résultats, prêts à être écrits en JSON. """
+
+    resultats = {'python': platform.python_version(), 'machine': platform.machine(), 'repetitions': repetitions,
+                 'positions': [nom for nom, _, _, _ in POSITIONS], 'heuristiques': {},
+                 'generation': mesurerGeneration(repetitions)}
+    for niveau in niveaux:
+        heuristique = HEURISTIQUES[niveau]
+        mesures = mesurerEvaluations(heuristique, repetitions)
+        mesures['profondeurs'] = {}
+        for profondeur in profondeurs:
+            mesures['profondeurs'][str(profondeur)] = mesurerRecherche(heuristique, profondeur, repetitions)
+            if journal:
+                recherche = mesures['profondeurs'][str(profondeur)]
+                journal(f"{heuristique.__name__}, profondeur {profondeur} : {recherche['temps']:.3f} s, "
+                        f"{recherche['noeuds']} nœuds, {recherche['noeudsParSeconde']:.0f} nœuds/s")
+        resultats['heuristiques'][heuristique.__name__] = mesures
+    return resultats
+
+
+def aplatir(resultats, prefixe=""):
+    """ Donne les mesures numériques des résultats, indexées par leur chemin (par exemple
+    'heuristiques/heuristiqueExperte/profondeurs/3/temps').
+        :param resultats: dict - Résultats (ou partie des résultats).
+        :param prefixe: str - Chemin de la partie reçue.
+        :return: dict - Chemin -> valeur. """
+
+    mesures = {}
+    for cle, valeur in resultats.items():
+        chemin = f"{prefixe}/{cle}" if prefixe else str(cle)
+        if isinstance(valeur, dict):
+            mesures.update(aplatir(valeur, chemin))
+        elif isinstance(valeur, (int, float)) and not isinstance(valeur, bool):
+            mesures[chemin] = valeur
+    return mesures
+
+
+def comparer(resultats, reference, seuil=10.0):
+    """ Compare des résultats à une référence. Les débits (…ParSeconde) doivent rester élevés et les temps faibles ;
+    seuls les totaux sont comparés, les temps de chaque position étant trop courts pour être stables. Les nombres de
+    nœuds, qui ne dépendent pas de la machine, sont signalés lorsqu'ils changent, position par position.
+        :param resultats: dict - Résultats de lancerBenchmark.
+        :param reference: dict - Résultats de référence.
+        :param seuil: float - Dégradation tolérée, en pourcentage.
+        :return: tuple - (liste des régressions, liste des nombres de nœuds modifiés), chacune sous forme de textes. """
+
+    mesures, mesuresReference = aplatir(resultats), aplatir(reference)
+    regressions, changements = [], []
+    for chemin, valeur in sorted(mesures.items()):
+        ancienne = mesuresReference.get(chemin)
+        if ancienne is None or chemin.endswith('repetitions'):
+            continue
+        if chemin.endswith('noeuds'):
+            if valeur != ancienne:
+                changements.append(f"{chemin} : {ancienne} -> {valeur}")
+            continue
+        if '/positions/' in chemin:
+            continue
+        if chemin.endswith('ParSeconde'):
+            degradation = 100 * (ancienne - valeur) / ancienne if ancienne else 0.0
+        elif chemin.endswith('temps'):
+            degradation = 100 * (valeur - ancienne) / ancienne if ancienne else 0.0
+        else:
+            continue
+        if degradation > seuil:
+            regressions.append(f"{chemin} : {ancienne:.4g} -> {valeur:.4g} ({degradation:+.1f} %)")
+    return regressions, changements
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    try:
+        profondeursDonnees = extraireOption(arguments, "profondeurs", lambda v: tuple(int(p) for p in v.split(',')))
+        niveauxDonnes = extraireOption(arguments, "heuristiques", lambda v: tuple(v.split(',')))
+        repetitionsDonnees = extraireOption(arguments, "repetitions", int)
+        if repetitionsDonnees is None:
+            repetitionsDonnees = 3
+        sortieDonnee = extraireOption(arguments, "sortie", str)
+        referenceDonnee = extraireOption(arguments, "reference", str)
+        seuilDonne = extraireOption(arguments, "seuil", float)
+        if arguments or any(niveau not in HEURISTIQUES for niveau in niveauxDonnes or ()) \
+                or any(profondeur <= 0 for profondeur in profondeursDonnees or ()) or repetitionsDonnees <= 0:
+            raise ValueError("arguments invalides")
+        referenceLue = None
+        if referenceDonnee:
+            with open(referenceDonnee) as fichierReference:
+                referenceLue = json.load(fichierReference)
+    except (ValueError, OSError) as erreur:
+        print(f"\033[91mErreur : {erreur}.\033[0m")
+        print("Utilisation : python3 -m src.ia.benchmark [--profondeurs 1,2,3,4] [--heuristiques 1,2,3] "
+              "[--repetitions 3] [--sortie resultats.json] [--reference reference.json] [--seuil 10]")
+        sys.exit(1)
+
+    def journalErreur(texte):
+        """ Écrit la progression sur la sortie d'erreur : la sortie standard ne reçoit que le JSON des résultats. """
+        print(texte, file=sys.stderr)
+
+    resultatsObtenus = lancerBenchmark(niveauxDonnes or ('1', '2', '3'), profondeursDonnees or (1, 2, 3, 4),
+                                       repetitionsDonnees, journal=journalErreur)
+    if sortieDonnee:
+        with open(sortieDonnee, 'w') as fichierSortie:
+            json.dump(resultatsObtenus, fichierSortie, indent=2)
+    else:
+        print(json.dumps(resultatsObtenus, indent=2))
+
+    if referenceLue is not None:
+        regressionsTrouvees, changementsTrouves = comparer(resultatsObtenus, referenceLue,
+                                                           10.0 if seuilDonne is None else seuilDonne)
+        for changement in changementsTrouves:
+            journalErreur(f"Nœuds modifiés : {changement}")
+        for regression in regressionsTrouvees:
+            journalErreur(f"\033[91mRégression : {regression}\033[0m")
+        if regressionsTrouvees:
+            sys.exit(1)
+        journalErreur("Aucune régression par rapport à la référence.")
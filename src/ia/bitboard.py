@@ -0,0 +1,313 @@
+""" Représentation compacte du plateau utilisée par le moteur de recherche : un entier de 24 bits par joueur.
+    Le bit i d'un entier vaut 1 si le joueur possède un pion sur la position i. Les masques des moulins et des
+    adjacences sont précalculés, ce qui remplace les parcours de listes de caractères par des opérations binaires.
+    La conversion depuis et vers la liste de 24 caractères ('x', '1', '2') n'a lieu qu'aux frontières du moteur. """
+
+from collections import namedtuple
+from src.ia.utils import positionsAdjacentes
+
+# Un coup : position de départ (None en phase de placement), position d'arrivée et pion adverse retiré (ou None)
+Coup = namedtuple('Coup', ['depart', 'arrivee', 'capture'])
+
+# Les 16 lignes du plateau (8 horizontales puis 8 verticales)
+MOULINS = ((0, 1, 2), (3, 4, 5), (6, 7, 8), (9, 10, 11), (12, 13, 14), (15, 16, 17), (18, 19, 20), (21, 22, 23),
+           (0, 9, 21), (3, 10, 18), (6, 11, 15), (1, 4, 7), (16, 19, 22), (8, 12, 17), (5, 13, 20), (2, 14, 23))
+
+PLATEAU_PLEIN = (1 << 24) - 1  # Masque des 24 positions
+BITS = tuple(1 << i for i in range(24))  # Masque de chaque position
+
+MASQUES_MOULINS = tuple(BITS[a] | BITS[b] | BITS[c] for a, b, c in MOULINS)
+MASQUES_ADJACENCES = tuple(sum(BITS[j] for j in positionsAdjacentes(i)) for i in range(24))
+
+# Pour chaque position, les masques des deux autres positions de chacune des deux lignes qui la traversent
+PAIRES_MOULINS = tuple(tuple(m & ~BITS[i] for m in MASQUES_MOULINS if m & BITS[i]) for i in range(24))
+
+# Pour chaque position, les masques complets des deux lignes qui la traversent
+MOULINS_PAR_POSITION = tuple(tuple(m for m in MASQUES_MOULINS if m & BITS[i]) for i in range(24))
+
+
+def versBitboard(plateau):
+    """ Convertit un plateau sous forme de liste en deux bitboards.
+        :param plateau: list - Liste représentant l'état du plateau.
+        :return: tuple - (bitboard du joueur '1', bitboard du joueur '2'). """
+
+    b1 = b2 = 0
+    for i in range(24):
+        if plateau[i] == '1':
+            b1 |= BITS[i]
+        elif plateau[i] == '2':
+            b2 |= BITS[i]
+    return b1, b2
+
+
+def versListe(b1, b2):
+    """ Convertit deux bitboards en plateau sous forme de liste, tel qu'utilisé par l'affichage et les modes de jeu.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :return: list - Liste de 24 caractères ('x', '1' ou '2'). """
+
+    return ['1' if b1 & BITS[i] else '2' if b2 & BITS[i] else 'x' for i in range(24)]
+
+
+def positions(b):
+    """ Donne les indices des positions occupées dans un bitboard, dans l'ordre croissant.
+        :param b: int - Bitboard à parcourir.
+        :return: list - Liste des indices des bits à 1. """
+
+    resultat = []
+    while b:
+        bit = b & -b  # Isole le bit de poids faible
+        resultat.append(bit.bit_length() - 1)
+        b ^= bit
+    return resultat
+
+
+def nombrePionBits(b):
+    """ Compte le nombre de pions d'un bitboard.
+        :param b: int - Bitboard du joueur.
+        :return: int - Nombre de bits à 1. """
+
+    return bin(b).count('1')
+
+
+def prochainMoulinBits(position, b):
+    """ Équivalent de prochainMoulin : vrai si le joueur possède les deux autres positions d'une ligne passant par
+    la position donnée.
+        :param position: int - L'indice de la position à vérifier.
+        :param b: int - Bitboard du joueur.
+        :return: bool - True si un moulin peut être formé (ou est formé) sur cette position. """
+
+    m1, m2 = PAIRES_MOULINS[position]
+    return b & m1 == m1 or b & m2 == m2
+
+
+def moulinCreeBits(position, b):
+    """ Équivalent de moulinCree pour le joueur propriétaire du bitboard.
+        :param position: int - L'indice de la position sur le plateau.
+        :param b: int - Bitboard du joueur dont on teste le pion.
+        :return: bool - True si le joueur a un pion sur la position et que ce pion appartient à un moulin. """
+
+    return bool(b & BITS[position]) and prochainMoulinBits(position, b)
+
+
+def nombrePossibleMoulinsBits(b, vides):
+    """ Équivalent de nombrePossibleMoulins : nombre de positions vides complétant une ligne du joueur.
+        :param b: int - Bitboard du joueur.
+        :param vides: int - Bitboard des positions vides.
+        :return: int - Nombre de moulins possibles. """
+
+    nombre = 0
+    for i in positions(vides):
+        m1, m2 = PAIRES_MOULINS[i]
+        if b & m1 == m1 or b & m2 == m2:
+            nombre += 1
+    return nombre
+
+
+def nombrePiecesMoulinEnFormationBits(b, bAdverse, joueur1):
+    """ Équivalent de nombrePiecesMoulinEnFormation, en conservant l'asymétrie de la version sur liste :
+    pour le joueur '1', on compte les pions adverses adjacents à un pion qui compléterait un moulin adverse ; pour le
+    joueur '2', on compte les pions du joueur '1' en formation de moulin adjacents à ses pions.
+        :param b: int - Bitboard du joueur concerné.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :param joueur1: bool - True si le joueur concerné est le joueur '1'.
+        :return: int - Nombre de pièces pouvant former un moulin. """
+
+    nombre = 0
+    if joueur1:
+        for i in positions(b):
+            if prochainMoulinBits(i, bAdverse):
+                nombre += nombrePionBits(MASQUES_ADJACENCES[i] & bAdverse)
+    else:
+        for i in positions(b):
+            for pos in positions(MASQUES_ADJACENCES[i] & bAdverse):
+                if MASQUES_ADJACENCES[pos] & bAdverse and not prochainMoulinBits(pos, bAdverse):
+                    nombre += 1
+    return nombre
+
+
+def nombrePionsBloques(b, vides):
+    """ Compte les pions d'un joueur dont toutes les positions adjacentes sont occupées.
+        :param b: int - Bitboard du joueur.
+        :param vides: int - Bitboard des positions vides.
+        :return: int - Nombre de pions bloqués. """
+
+    return sum(1 for i in positions(b) if not MASQUES_ADJACENCES[i] & vides)
+
+
+def piecesRetirables(bAdverse):
+    """ Donne les pions adverses pouvant être retirés après un moulin, c'est-à-dire ceux hors de tout moulin.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Indices des pions retirables, dans l'ordre croissant. """
+
+    return [i for i in positions(bAdverse) if not prochainMoulinBits(i, bAdverse)]
+
+
+def nombreCoupsPossiblesBits(b, bAdverse):
+    """ Équivalent de nombreCoupsPossibles : len(coupsEtape2ou3(b, bAdverse)), sans construire la liste des coups.
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: int - Nombre de coups possibles (un coup par pion retirable pour un déplacement formant un moulin). """
+
+    vides = PLATEAU_PLEIN & ~(b | bAdverse)
+    vol = nombrePionBits(b) == 3
+    retirables = None
+    nombre = 0
+    pions = b
+    while pions:
+        bit = pions & -pions
+        pions ^= bit
+        sans = b ^ bit  # Bitboard du joueur une fois le pion parti
+        cibles = vides if vol else MASQUES_ADJACENCES[bit.bit_length() - 1] & vides
+        while cibles:
+            cible = cibles & -cibles
+            cibles ^= cible
+            m1, m2 = PAIRES_MOULINS[cible.bit_length() - 1]
+            if sans & m1 == m1 or sans & m2 == m2:
+                if retirables is None:
+                    retirables = len(piecesRetirables(bAdverse))
+                nombre += retirables
+            else:
+                nombre += 1
+    return nombre
+
+
+def existeCoupPossibleBits(b, bAdverse):
+    """ Équivalent de existeCoupPossible : vrai si coupsEtape2ou3(b, bAdverse) n'est pas vide, en s'arrêtant au
+    premier coup trouvé.
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: bool - True si le joueur peut jouer. """
+
+    vides = PLATEAU_PLEIN & ~(b | bAdverse)
+    if not vides:
+        return False
+    vol = nombrePionBits(b) == 3
+    retirable = None
+    pions = b
+    while pions:
+        bit = pions & -pions
+        pions ^= bit
+        sans = b ^ bit
+        cibles = vides if vol else MASQUES_ADJACENCES[bit.bit_length() - 1] & vides
+        while cibles:
+            cible = cibles & -cibles
+            cibles ^= cible
+            m1, m2 = PAIRES_MOULINS[cible.bit_length() - 1]
+            if not (sans & m1 == m1 or sans & m2 == m2):
+                return True
+            if retirable is None:  # Un moulin n'est un coup que s'il reste un pion adverse à retirer
+                retirable = any(not prochainMoulinBits(i, bAdverse) for i in positions(bAdverse))
+            if retirable:
+                return True
+    return False
+
+
+def ajouterCoups(coups, b, bAdverse, depart, arrivee):
+    """ Ajoute à la liste les coups allant de depart à arrivee, en générant un coup par pion retirable si le coup
+    forme un moulin (même comportement que retirerPiece).
+        :param coups: list - Liste des coups à compléter.
+        :param b: int - Bitboard du joueur après le déplacement ou le placement.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :param depart: int ou None - Position de départ du pion (None pour un placement).
+        :param arrivee: int - Position d'arrivée du pion joué. """
+
+    if prochainMoulinBits(arrivee, b):
+        for i in piecesRetirables(bAdverse):
+            coups.append(Coup(depart, arrivee, i))
+    else:
+        coups.append(Coup(depart, arrivee, None))
+
+
+def coupsEtape1(b, bAdverse):
+    """ Équivalent de mouvementsPossiblesEtape1 pour un joueur quelconque, sans copie de plateau.
+        :param b: int - Bitboard du joueur qui place un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Liste des coups (placements) possibles. """
+
+    coups = []
+    for i in positions(PLATEAU_PLEIN & ~(b | bAdverse)):
+        ajouterCoups(coups, b | BITS[i], bAdverse, None, i)
+    return coups
+
+
+def coupsEtape2(b, bAdverse):
+    """ Équivalent de mouvementsPossiblesEtape2 pour un joueur quelconque, sans copie de plateau.
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Liste des coups (déplacements vers une position adjacente) possibles. """
+
+    coups = []
+    vides = PLATEAU_PLEIN & ~(b | bAdverse)
+    for i in positions(b):
+        for pos in positions(MASQUES_ADJACENCES[i] & vides):
+            ajouterCoups(coups, b ^ BITS[i] ^ BITS[pos], bAdverse, i, pos)
+    return coups
+
+
+def coupsEtape3(b, bAdverse):
+    """ Équivalent de mouvementsPossiblesEtape3 pour un joueur quelconque (le joueur vole vers toute case libre).
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Liste des coups possibles. """
+
+    coups = []
+    vides = positions(PLATEAU_PLEIN & ~(b | bAdverse))
+    for i in positions(b):
+        for j in vides:
+            ajouterCoups(coups, b ^ BITS[i] ^ BITS[j], bAdverse, i, j)
+    return coups
+
+
+def coupsEtape2ou3(b, bAdverse):
+    """ Équivalent de mouvementsPossiblesEtape2ou3 : phase 3 si le joueur n'a plus que trois pions, phase 2 sinon.
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Liste des coups possibles. """
+
+    if nombrePionBits(b) == 3:
+        return coupsEtape3(b, bAdverse)
+    else:
+        return coupsEtape2(b, bAdverse)
+
+
+def coupsPossibles(pions, joueur, etape1):
+    """ Génère les coups du joueur au trait, quelle que soit sa couleur : aucune inversion du plateau n'est nécessaire.
+        :param pions: list - Bitboards des deux joueurs ([joueur '1', joueur '2']).
+        :param joueur: int - Indice du joueur au trait (0 ou 1).
+        :param etape1: bool - True pendant la phase de placement.
+        :return: list - Liste des coups possibles. """
+
+    if etape1:
+        return coupsEtape1(pions[joueur], pions[1 - joueur])
+    return coupsEtape2ou3(pions[joueur], pions[1 - joueur])
+
+
+def coupsPrises(pions, joueur, etape1):
+    """ Génère uniquement les coups du joueur au trait qui forment un moulin, avec chacune des prises possibles, dans
+    l'ordre de coupsPossibles. Utilisée par la recherche de quiescence.
+        :param pions: list - Bitboards des deux joueurs ([joueur '1', joueur '2']).
+        :param joueur: int - Indice du joueur au trait (0 ou 1).
+        :param etape1: bool - True pendant la phase de placement.
+        :return: list - Liste des coups avec prise. """
+
+    b, bAdverse = pions[joueur], pions[1 - joueur]
+    vides = PLATEAU_PLEIN & ~(b | bAdverse)
+    coups = []
+    retirables = None
+    if etape1:
+        departs = (None,)
+    else:
+        departs = positions(b)
+        vol = nombrePionBits(b) == 3
+    for i in departs:
+        sans = b if i is None else b ^ BITS[i]
+        arrivees = vides if i is None or vol else MASQUES_ADJACENCES[i] & vides
+        for j in positions(arrivees):
+            m1, m2 = PAIRES_MOULINS[j]
+            if sans & m1 == m1 or sans & m2 == m2:
+                if retirables is None:
+                    retirables = piecesRetirables(bAdverse)
+                for k in retirables:
+                    coups.append(Coup(i, j, k))
+    return coups
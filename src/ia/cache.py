@@ -0,0 +1,89 @@
+""" Cache des évaluations. Une même feuille est évaluée de nombreuses fois : au cours d'une recherche (quiescence,
+    itérations successives de l'approfondissement, positions atteintes par plusieurs ordres de coups dont l'entrée a
+    été remplacée dans la table de transposition) et d'un coup à l'autre. Or chaque évaluation de heuristiqueAvancee ou
+    heuristiqueExperte parcourt toutes les lignes du plateau.
+
+    CacheEvaluations enveloppe une heuristique et mémorise ses derniers résultats, indexés par une clé compacte formée
+    des deux bitboards et de l'indicateur de phase. Le cache est borné : au-delà de sa taille, la position évaluée il
+    y a le plus longtemps est oubliée (LRU). L'objet obtenu s'utilise comme l'heuristique qu'il enveloppe (il peut
+    être passé en paramètre heuristique= à minimax) et porte le même nom, de sorte que le livre d'ouvertures et les
+    tables enregistrées des sessions restent valables. Conservé d'un coup à l'autre, il profite aussi des feuilles
+    communes aux recherches successives.
+
+    Avec heuristiqueExperte, l'état de la recherche maintient déjà l'évaluation de façon incrémentale
+    (evaluation.py) ; envelopper cette heuristique remplace ce calcul par le cache. """
+
+from collections import OrderedDict
+
+from src.ia.bitboard import versBitboard, versListe
+from src.ia.heuristiques import HEURISTIQUES_BITBOARD
+
+TAILLE_CACHE = 1 << 16  # Nombre de positions mémorisées par défaut
+
+
+class CacheEvaluations:
+    """ Heuristique mémorisant ses évaluations dans un cache LRU borné, avec compteurs de succès et d'échecs. """
+
+    def __init__(self, heuristique, taille=TAILLE_CACHE):
+        """ :param heuristique: Fonction heuristique prenant (plateau, phase1) à envelopper.
+            :param taille: int - Nombre maximal de positions mémorisées. """
+
+        if taille <= 0:
+            raise ValueError("la taille du cache doit être positive")
+        self.heuristique = heuristique
+        self.__name__ = heuristique.__name__  # Même nom que l'heuristique : mêmes livre d'ouvertures et tables
+        if heuristique in HEURISTIQUES_BITBOARD:
+            self.calcul = HEURISTIQUES_BITBOARD[heuristique]
+        else:
+            self.calcul = lambda b1, b2, phase1: heuristique(versListe(b1, b2), phase1)
+        self.taille = taille
+        self.entrees = OrderedDict()  # Clé de la position -> évaluation, de la plus ancienne à la plus récente
+        self.succes = 0  # Évaluations trouvées dans le cache
+        self.echecs = 0  # Évaluations calculées
+
+    def evaluerBits(self, b1, b2, phase1):
+        """ Évalue une position donnée par ses bitboards, du point de vue du joueur '1' (version sur bitboards de
+        l'heuristique, utilisée par minimax, voir versionBitboard).
+            :param b1: int - Bitboard du joueur '1'.
+            :param b2: int - Bitboard du joueur '2'.
+            :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+            :return: Le score de l'heuristique enveloppée. """
+
+        cle = b1 | b2 << 24 | phase1 << 48
+        valeur = self.entrees.get(cle)
+        if valeur is not None:
+            self.succes += 1
+            self.entrees.move_to_end(cle)
+            return valeur
+        self.echecs += 1
+        valeur = self.entrees[cle] = self.calcul(b1, b2, phase1)
+        if len(self.entrees) > self.taille:
+            self.entrees.popitem(last=False)
+        return valeur
+
+    def __call__(self, plateau, phase1):
+        """ Évalue un plateau sous forme de liste, comme l'heuristique enveloppée.
+            :param plateau: Liste représentant l'état du plateau.
+            :param phase1: Booléen indiquant si on est à la phase 1 (placement des pions).
+            :return: Le score de l'heuristique enveloppée. """
+
+        b1, b2 = versBitboard(plateau)
+        return self.evaluerBits(b1, b2, phase1)
+
+    def tauxSucces(self):
+        """ :return: float - Proportion des évaluations trouvées dans le cache (0 si aucune évaluation). """
+
+        total = self.succes + self.echecs
+        return self.succes / total if total else 0.0
+
+    def vider(self):
+        """ Oublie toutes les positions mémorisées et remet les compteurs à zéro. """
+
+        self.entrees.clear()
+        self.succes = self.echecs = 0
+
+    def resume(self):
+        """ :return: str - Résumé lisible des compteurs du cache. """
+
+        return (f"Cache des évaluations ({self.__name__}) : {len(self.entrees)}/{self.taille} positions, "
+                f"{self.succes} trouvées, {self.echecs} calculées ({100 * self.tauxSucces():.1f} % trouvées)")
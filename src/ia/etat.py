@@ -0,0 +1,126 @@
+""" État mutable du plateau utilisé par la recherche : au lieu de copier le plateau pour chaque coup envisagé,
+    minimax joue le coup sur un unique état (appliquer), explore le sous-arbre, puis le défait (annuler).
+    L'état maintient aussi la clé de Zobrist de la position de façon incrémentale, ainsi que le joueur au trait, le
+    nombre de pions restant à placer et le nombre de pions sur le plateau de chaque joueur : la recherche les lit sans
+    parcourir le plateau, et connaît ainsi exactement la phase de chaque nœud (un joueur place tant qu'il lui reste des
+    pions en main, puis déplace).
+
+    Les modes de jeu connaissent le nombre de pions restant à placer (voir mainsPlacement). Faute de cette information,
+    la recherche se contente de la phase de la racine (voir mainsSelonPhase) : pendant le placement, chaque joueur
+    dispose alors de EN_MAIN_MAX pions en main, et la phase ne change pas au cours de la recherche. """
+
+from src.ia.bitboard import BITS, versBitboard, versListe, nombrePionBits
+from src.ia.zobrist import ZOBRIST_PIONS, ZOBRIST_TRAIT, ZOBRIST_PLACEMENT, EN_MAIN_MAX, cleZobrist
+
+PIONS_PAR_JOUEUR = 9  # Pions placés par chaque joueur pendant la phase 1
+
+
+def mainsPlacement(ply):
+    """ Pions restant à placer à chaque joueur avant un demi-coup de la phase de placement, le joueur '1' plaçant le
+    premier.
+        :param ply: int - Nombre de pions déjà placés par les deux joueurs (de 0 à 17).
+        :return: tuple - (pions en main du joueur '1', pions en main du joueur '2'). """
+
+    return PIONS_PAR_JOUEUR - (ply + 1) // 2, PIONS_PAR_JOUEUR - ply // 2
+
+
+def mainsSelonPhase(etape1, enMain=None):
+    """ Pions en main à utiliser pour une recherche : ceux qui sont donnés, ou à défaut des mains qui maintiennent la
+    phase de la racine dans tout l'arbre (autant de pions que de positions pendant le placement, aucun ensuite).
+        :param etape1: bool - True pendant la phase de placement.
+        :param enMain: tuple ou None - Pions restant à placer à chaque joueur, s'ils sont connus.
+        :return: tuple - (pions en main du joueur '1', pions en main du joueur '2'). """
+
+    if enMain is not None:
+        return tuple(enMain)
+    return (EN_MAIN_MAX, EN_MAIN_MAX) if etape1 else (0, 0)
+
+
+class EtatJeu:
+    """ Plateau mutable sur bitboards. Les joueurs sont indicés 0 (joueur '1') et 1 (joueur '2'). """
+    __slots__ = ('pions', 'cle', 'joueur', 'enMain', 'nombres')
+
+    def __init__(self, b1=0, b2=0, joueur=0, enMain=(0, 0)):
+        """ :param b1: int - Bitboard du joueur '1'.
+            :param b2: int - Bitboard du joueur '2'.
+            :param joueur: int - Indice du joueur au trait, pris en compte dans la clé de Zobrist.
+            :param enMain: tuple - Nombre de pions restant à placer à chaque joueur. """
+
+        self.pions = [b1, b2]                          # Bitboard de chaque joueur
+        self.cle = cleZobrist(b1, b2, joueur, enMain)  # Clé de Zobrist de la position et du joueur au trait
+        self.joueur = joueur                           # Indice du joueur au trait
+        self.enMain = list(enMain)                     # Pions restant à placer à chaque joueur
+        self.nombres = [nombrePionBits(b1), nombrePionBits(b2)]  # Pions de chaque joueur sur le plateau
+
+    @classmethod
+    def depuisListe(cls, plateau, joueur=0, enMain=(0, 0)):
+        """ Construit un état à partir d'un plateau sous forme de liste.
+            :param plateau: list - Liste représentant l'état du plateau.
+            :param joueur: int - Indice du joueur au trait.
+            :param enMain: tuple - Nombre de pions restant à placer à chaque joueur.
+            :return: EtatJeu - L'état correspondant. """
+
+        b1, b2 = versBitboard(plateau)
+        return cls(b1, b2, joueur, enMain)
+
+    @property
+    def etape1(self):
+        """ :return: bool - True si le joueur au trait est en phase de placement (il lui reste des pions en main). """
+
+        return self.enMain[self.joueur] > 0
+
+    def versListe(self):
+        """ Donne le plateau sous forme de liste, pour l'affichage et les modes de jeu.
+            :return: list - Liste de 24 caractères ('x', '1' ou '2'). """
+
+        return versListe(self.pions[0], self.pions[1])
+
+    def appliquer(self, coup, joueur):
+        """ Joue un coup sur l'état.
+            :param coup: Coup - Le coup à jouer (départ, arrivée, pion retiré).
+            :param joueur: int - Indice du joueur qui joue (0 ou 1). """
+
+        cles = ZOBRIST_PIONS[joueur]
+        if coup.depart is None:
+            self.pions[joueur] |= BITS[coup.arrivee]
+            self.cle ^= cles[coup.arrivee] ^ ZOBRIST_TRAIT ^ ZOBRIST_PLACEMENT[joueur][self.enMain[joueur]]
+            self.enMain[joueur] -= 1
+            self.nombres[joueur] += 1
+        else:
+            self.pions[joueur] ^= BITS[coup.depart] | BITS[coup.arrivee]
+            self.cle ^= cles[coup.depart] ^ cles[coup.arrivee] ^ ZOBRIST_TRAIT
+        if coup.capture is not None:
+            self.pions[1 - joueur] ^= BITS[coup.capture]
+            self.cle ^= ZOBRIST_PIONS[1 - joueur][coup.capture]
+            self.nombres[1 - joueur] -= 1
+        self.joueur = 1 - joueur
+
+    def annuler(self, coup, joueur):
+        """ Défait un coup précédemment joué par appliquer.
+            :param coup: Coup - Le coup à défaire.
+            :param joueur: int - Indice du joueur qui l'avait joué (0 ou 1). """
+
+        cles = ZOBRIST_PIONS[joueur]
+        if coup.depart is None:
+            self.enMain[joueur] += 1
+            self.nombres[joueur] -= 1
+            self.pions[joueur] ^= BITS[coup.arrivee]
+            self.cle ^= cles[coup.arrivee] ^ ZOBRIST_TRAIT ^ ZOBRIST_PLACEMENT[joueur][self.enMain[joueur]]
+        else:
+            self.pions[joueur] ^= BITS[coup.depart] | BITS[coup.arrivee]
+            self.cle ^= cles[coup.depart] ^ cles[coup.arrivee] ^ ZOBRIST_TRAIT
+        if coup.capture is not None:
+            self.pions[1 - joueur] ^= BITS[coup.capture]
+            self.cle ^= ZOBRIST_PIONS[1 - joueur][coup.capture]
+            self.nombres[1 - joueur] += 1
+        self.joueur = joueur
+
+    def evaluer(self, heuristique, phase1, joueur):
+        """ Évalue la position avec la fonction d'évaluation de la recherche. Les états maintenant eux-mêmes leur
+        évaluation (voir evaluation.py) redéfinissent cette méthode.
+            :param heuristique: Fonction d'évaluation sur bitboards, prenant (b1, b2, phase1, joueur).
+            :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+            :param joueur: int - Indice du joueur du point de vue duquel la position est évaluée.
+            :return: Le score de la position. """
+
+        return heuristique(self.pions[0], self.pions[1], phase1, joueur)
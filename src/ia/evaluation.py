@@ -0,0 +1,168 @@
+""" Évaluation incrémentale de heuristiqueExperte. Chaque caractéristique de l'heuristique (pions, pions dans un
+    moulin, moulins possibles, pions bloqués, configurations à 2 pions) est une somme de contributions par position, et
+    la contribution d'une position q ne dépend que de son voisinage N(q) : q, ses positions adjacentes et les autres
+    positions des deux lignes qui la traversent. Un coup ne modifie que 2 ou 3 positions : seules les contributions des
+    positions de leurs voisinages sont recalculées lorsque le coup est appliqué, et l'annulation du coup restaure les
+    contributions sauvegardées.
+
+    Les dix compteurs sont regroupés dans un seul entier, à raison de 8 bits par compteur : la contribution d'une
+    position est un entier, et le total s'obtient par une simple addition. Aucun compteur ne peut dépasser 255
+    (au plus 24 positions, et au plus 4 pions adjacents par position).
+
+    Les tests (tests/test_evaluation.py) vérifient que l'évaluation incrémentale est identique à heuristiqueExperte
+    sur des positions et des suites de coups aléatoires. """
+
+from src.ia.bitboard import *
+from src.ia.etat import EtatJeu
+
+# Décalage de chaque compteur dans l'entier regroupant les contributions
+PIONS_1, PIONS_2 = 0, 8                        # Pions de chaque joueur
+EN_MOULIN_1, EN_MOULIN_2 = 16, 24              # Pions appartenant à un moulin
+MOULINS_POSSIBLES_1, MOULINS_POSSIBLES_2 = 32, 40  # Positions vides complétant une ligne du joueur
+BLOQUES_1, BLOQUES_2 = 48, 56                  # Pions sans position adjacente libre
+FORMATION_1, FORMATION_2 = 64, 72              # Termes de nombrePiecesMoulinEnFormation pour '1' et pour '2'
+
+# Pour chaque position p, le masque des positions dont la contribution dépend de p (relation symétrique)
+VOISINAGES = tuple(BITS[i] | MASQUES_ADJACENCES[i] | PAIRES_MOULINS[i][0] | PAIRES_MOULINS[i][1] for i in range(24))
+
+
+def contributionPosition(q, b1, b2):
+    """ Calcule la contribution d'une position à chacun des compteurs.
+        :param q: int - Indice de la position.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :return: int - Contributions regroupées (8 bits par compteur). """
+
+    bit = BITS[q]
+    m1, m2 = PAIRES_MOULINS[q]
+    adjacentes = MASQUES_ADJACENCES[q]
+    if b1 & bit:
+        contribution = 1 << PIONS_1
+        enMoulin = b1 & m1 == m1 or b1 & m2 == m2
+        if enMoulin:
+            contribution += 1 << EN_MOULIN_1
+        if not adjacentes & ~(b1 | b2):
+            contribution += 1 << BLOQUES_1
+        if adjacentes & b2:
+            adversesAdjacents = bin(adjacentes & b2).count('1')
+            if b2 & m1 == m1 or b2 & m2 == m2:  # Pion '1' complétant une ligne '2' (pour le joueur '1')
+                contribution += adversesAdjacents << FORMATION_1
+            if adjacentes & b1 and not enMoulin:  # Pion '1' hors moulin voisin de pions '2' (pour le joueur '2')
+                contribution += adversesAdjacents << FORMATION_2
+        return contribution
+    if b2 & bit:
+        contribution = 1 << PIONS_2
+        if b2 & m1 == m1 or b2 & m2 == m2:
+            contribution += 1 << EN_MOULIN_2
+        if not adjacentes & ~(b1 | b2):
+            contribution += 1 << BLOQUES_2
+        return contribution
+    contribution = 0
+    if b1 & m1 == m1 or b1 & m2 == m2:
+        contribution += 1 << MOULINS_POSSIBLES_1
+    if b2 & m1 == m1 or b2 & m2 == m2:
+        contribution += 1 << MOULINS_POSSIBLES_2
+    return contribution
+
+
+def evaluationExperte(total, phase1):
+    """ Calcule heuristiqueExperte à partir des compteurs, avec exactement les mêmes opérations que
+    heuristiqueExperteBits.
+        :param total: int - Compteurs regroupés de la position.
+        :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: int - Évaluation du point de vue du joueur '1'. """
+
+    poidsMoulinsFermes = 18 if phase1 else 14
+    poidsMoulins = 26 if phase1 else 43
+    poidsPionsBloques = 1 if phase1 else 10
+    poidsPions = 9 if phase1 else 11
+    poidsConfig2Pions = 10
+    poidsConfig3Pions = 7 if phase1 else 1086
+    poidsDoubleMoulins = 0 if phase1 else 8
+    poidsConfigGagnante = 0 if phase1 else 1190
+
+    doubleMoulinJoueur = (total >> EN_MOULIN_1) & 0xFF
+    doubleMoulinAdversaire = (total >> EN_MOULIN_2) & 0xFF
+    evaluation = poidsMoulinsFermes * (int(doubleMoulinJoueur > 0) - int(doubleMoulinAdversaire > 0))
+
+    evaluation += (poidsMoulins + poidsConfig3Pions) * (((total >> MOULINS_POSSIBLES_1) & 0xFF)
+                                                        - ((total >> MOULINS_POSSIBLES_2) & 0xFF))
+
+    pionsBloquesJoueur = (total >> BLOQUES_2) & 0xFF
+    pionsBloquesAdversaire = (total >> BLOQUES_1) & 0xFF
+    evaluation += poidsPionsBloques * (pionsBloquesAdversaire - pionsBloquesJoueur)
+
+    nbPionsJoueur = total & 0xFF
+    nbPionsAdversaire = (total >> PIONS_2) & 0xFF
+    evaluation += poidsPions * (nbPionsJoueur - nbPionsAdversaire)
+
+    evaluation += poidsConfig2Pions * (((total >> FORMATION_1) & 0xFF) - ((total >> FORMATION_2) & 0xFF))
+
+    evaluation += poidsDoubleMoulins * (doubleMoulinJoueur - doubleMoulinAdversaire)
+
+    victoireJoueur = int(nbPionsAdversaire < 3 or pionsBloquesAdversaire == nbPionsAdversaire)
+    defaiteJoueur = int(nbPionsJoueur < 3 or pionsBloquesJoueur == nbPionsJoueur)
+    evaluation += poidsConfigGagnante * (victoireJoueur - defaiteJoueur)
+
+    return evaluation
+
+
+class EtatExperte(EtatJeu):
+    """ État mutable maintenant, en plus des bitboards et de la clé de Zobrist, les compteurs de heuristiqueExperte.
+    Utilisé par la recherche lorsque l'heuristique choisie est heuristiqueExperte. """
+    __slots__ = ('contributions', 'total', 'pile')
+
+    def __init__(self, b1=0, b2=0, joueur=0, enMain=(0, 0)):
+        """ :param b1: int - Bitboard du joueur '1'.
+            :param b2: int - Bitboard du joueur '2'.
+            :param joueur: int - Indice du joueur au trait, pris en compte dans la clé de Zobrist.
+            :param enMain: tuple - Nombre de pions restant à placer à chaque joueur. """
+
+        super().__init__(b1, b2, joueur, enMain)
+        self.contributions = [contributionPosition(q, b1, b2) for q in range(24)]  # Contribution de chaque position
+        self.total = sum(self.contributions)  # Compteurs regroupés de la position
+        self.pile = []  # Pour chaque coup appliqué : (total précédent, contributions précédentes)
+
+    def appliquer(self, coup, joueur):
+        """ Joue un coup sur l'état et met à jour les contributions des positions voisines des positions modifiées.
+            :param coup: Coup - Le coup à jouer (départ, arrivée, pion retiré).
+            :param joueur: int - Indice du joueur qui joue (0 ou 1). """
+
+        super().appliquer(coup, joueur)
+        zone = VOISINAGES[coup.arrivee]
+        if coup.depart is not None:
+            zone |= VOISINAGES[coup.depart]
+        if coup.capture is not None:
+            zone |= VOISINAGES[coup.capture]
+
+        b1, b2 = self.pions
+        contributions = self.contributions
+        self.pile.append((self.total, contributions[:]))  # Copie de 24 entiers, moins coûteuse qu'un suivi fin
+        total = self.total
+        while zone:
+            bit = zone & -zone
+            zone ^= bit
+            q = bit.bit_length() - 1
+            nouvelle = contributionPosition(q, b1, b2)
+            total += nouvelle - contributions[q]
+            contributions[q] = nouvelle
+        self.total = total
+
+    def annuler(self, coup, joueur):
+        """ Défait un coup précédemment joué par appliquer, en restaurant les contributions sauvegardées.
+            :param coup: Coup - Le coup à défaire.
+            :param joueur: int - Indice du joueur qui l'avait joué (0 ou 1). """
+
+        super().annuler(coup, joueur)
+        self.total, self.contributions = self.pile.pop()
+
+    def evaluer(self, heuristique, phase1, joueur):
+        """ Évalue la position à partir des compteurs maintenus, sans parcourir le plateau. L'état n'est construit que
+        pour heuristiqueExperte : la fonction reçue n'est pas appelée.
+            :param heuristique: Fonction d'évaluation de la recherche (ignorée).
+            :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+            :param joueur: int - Indice du joueur du point de vue duquel la position est évaluée.
+            :return: Le score de heuristiqueExperte, opposé pour le joueur '2'. """
+
+        valeur = evaluationExperte(self.total, phase1)
+        return -valeur if joueur else valeur
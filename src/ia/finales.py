@@ -0,0 +1,425 @@
+""" Bases de finales : les positions à peu de pions (3 contre 3, 4 contre 3, 4 contre 4...) sont résolues une fois pour
+    toutes par analyse rétrograde, et minimax lit ensuite leur valeur exacte au lieu de les chercher. C'est en phase de
+    vol, justement à peu de pions, que l'arbre est le plus large et que les heuristiques se trompent le plus.
+
+    Une classe (a, b) regroupe les positions de phase 2 ou 3 où le joueur au trait a a pions et son adversaire b pions.
+    Chaque position reçoit un indice combinatoire (rang de l'ensemble des pions du joueur au trait, puis rang de
+    l'ensemble des pions adverses parmi les positions restantes), et la valeur de chaque position tient sur un octet :
+        - 0 : partie nulle ;
+        - 1 à 127 : victoire du joueur au trait en d demi-coups ;
+        - 128 + d : défaite du joueur au trait en d demi-coups.
+    Une position est perdue lorsque le joueur au trait n'a aucun coup, ou qu'il lui reste moins de 3 pions. Les coups
+    sont ceux du moteur (coupsEtape2ou3) : en particulier, un moulin ne permet de retirer qu'un pion hors moulin.
+
+    Les fichiers sont lus par projection en mémoire (mmap) : seules les pages consultées sont chargées. Ils sont générés
+    hors ligne, dans l'ordre des dépendances (une prise mène à une classe plus petite) :
+        python3 -m src.ia.finales [3-3 4-3 4-4] [--repertoire chemin] """
+
+import mmap
+import os
+import sys
+import time
+from array import array
+from math import comb
+
+from src.ia.bitboard import *
+
+REPERTOIRE_FINALES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'finales')
+CLASSES_DEFAUT = ((3, 3), (4, 3), (4, 4))
+PIONS_MAX = 9
+
+NULLE = 0         # Valeur des positions nulles (et des positions pas encore résolues pendant la génération)
+PERTE = 128       # Une défaite en d demi-coups est codée PERTE + d, une victoire en d demi-coups est codée d
+DISTANCE_MAX = 127
+SCORE_FINALE = 100000  # Score d'une victoire immédiate, diminué de la distance (au-dessus de toute heuristique finie)
+SEUIL_FINALE = SCORE_FINALE // 2  # Un score fini au-delà de ce seuil (en valeur absolue) provient des bases
+
+BINOMIAUX = tuple(tuple(comb(n, k) for k in range(25)) for n in range(25))
+
+
+def rangCombinaison(masque):
+    """ Rang d'un ensemble de positions parmi les ensembles de même taille (ordre colexicographique).
+        :param masque: int - Bitboard de l'ensemble.
+        :return: int - Rang, entre 0 et C(n, k) - 1. """
+
+    rang = 0
+    k = 1
+    while masque:
+        bit = masque & -masque
+        rang += BINOMIAUX[bit.bit_length() - 1][k]
+        k += 1
+        masque ^= bit
+    return rang
+
+
+def indicePosition(b, bAdverse):
+    """ Indice d'une position dans le fichier de sa classe.
+        :param b: int - Bitboard du joueur au trait.
+        :param bAdverse: int - Bitboard de son adversaire.
+        :return: int - Indice de la position. """
+
+    # Les positions adverses sont renumérotées parmi les 24 - a positions laissées libres par le joueur au trait
+    k = 1
+    rangAdverse = 0
+    while bAdverse:
+        bit = bAdverse & -bAdverse
+        p = bit.bit_length() - 1
+        rangAdverse += BINOMIAUX[p - bin(b & (bit - 1)).count('1')][k]
+        k += 1
+        bAdverse ^= bit
+    nombre = bin(b).count('1')
+    return rangCombinaison(b) * BINOMIAUX[24 - nombre][k - 1] + rangAdverse
+
+
+def nombrePositions(a, b):
+    """ Nombre de positions de la classe (a, b).
+        :return: int - C(24, a) * C(24 - a, b). """
+
+    return BINOMIAUX[24][a] * BINOMIAUX[24 - a][b]
+
+
+def cheminClasse(a, b, repertoire=REPERTOIRE_FINALES):
+    """ Chemin du fichier de la classe (a, b). """
+
+    return os.path.join(repertoire, f"finale_{a}_{b}.bin")
+
+
+def coder(valeur, ply=0):
+    """ Convertit une valeur lue dans un fichier en score pour la recherche (point de vue du joueur au trait). La
+    distance est comptée depuis la racine de la recherche, pour que les scores sondés à des profondeurs différentes
+    restent comparables (la table de transposition les enregistre comptés depuis la position, voir versTable).
+        :param valeur: int - Octet lu.
+        :param ply: int - Distance de la position à la racine de la recherche.
+        :return: int - 0 pour une nulle, SCORE_FINALE - distance pour une victoire, son opposé pour une défaite. """
+
+    if valeur == NULLE:
+        return 0
+    if valeur < PERTE:
+        return SCORE_FINALE - valeur - ply
+    return valeur - PERTE + ply - SCORE_FINALE
+
+
+def versTable(score, ply):
+    """ Convertit un score de la recherche en score à enregistrer dans la table de transposition. Pour un score issu
+    des bases, la distance est comptée depuis la position et non plus depuis la racine : la table étant conservée d'un
+    coup à l'autre, et une position pouvant être atteinte à des distances différentes de la racine, l'entrée doit
+    rester exacte quel que soit le nœud qui la relit.
+        :param score: Score du point de vue du joueur au trait, la distance étant comptée depuis la racine.
+        :param ply: int - Distance de la position à la racine de la recherche.
+        :return: Le score à enregistrer (inchangé s'il ne provient pas des bases). """
+
+    if score >= SEUIL_FINALE:
+        return score + ply
+    if score <= -SEUIL_FINALE:
+        return score - ply
+    return score
+
+
+def depuisTable(score, ply):
+    """ Opération inverse de versTable : convertit un score lu dans la table de transposition en score de la recherche.
+        :param score: Score lu dans la table.
+        :param ply: int - Distance de la position à la racine de la recherche.
+        :return: Le score, la distance étant comptée depuis la racine. """
+
+    if score >= SEUIL_FINALE:
+        return score - ply
+    if score <= -SEUIL_FINALE:
+        return score + ply
+    return score
+
+
+class BasesFinales:
+    """ Classes résolues disponibles sur le disque, projetées en mémoire. """
+
+    def __init__(self, repertoire=REPERTOIRE_FINALES):
+        """ :param repertoire: str - Répertoire contenant les fichiers finale_a_b.bin. """
+
+        self.tables = {}  # (a, b) -> mmap du fichier de la classe
+        for a in range(3, PIONS_MAX + 1):
+            for b in range(3, PIONS_MAX + 1):
+                chemin = cheminClasse(a, b, repertoire)
+                if not os.path.exists(chemin):
+                    continue
+                with open(chemin, 'rb') as fichier:
+                    table = mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ)
+                if len(table) != nombrePositions(a, b):
+                    table.close()
+                    raise ValueError(f"taille inattendue pour {chemin}")
+                self.tables[(a, b)] = table
+
+    def sonder(self, b, bAdverse, ply=0):
+        """ Lit la valeur exacte d'une position si sa classe est résolue.
+            :param b: int - Bitboard du joueur au trait.
+            :param bAdverse: int - Bitboard de son adversaire.
+            :param ply: int - Distance de la position à la racine de la recherche.
+            :return: Score du point de vue du joueur au trait (voir coder), ou None si la classe est absente. """
+
+        nombre = bin(b).count('1')
+        if nombre < 3:  # Partie perdue : le score doit rester comparable aux victoires lues dans les tables
+            return coder(PERTE, ply)
+        table = self.tables.get((nombre, bin(bAdverse).count('1')))
+        if table is None:
+            return None
+        return coder(table[indicePosition(b, bAdverse)], ply)
+
+    def couvreEnfants(self, b, bAdverse):
+        """ Indique si un coup joué depuis cette position peut mener à une classe résolue.
+            :param b: int - Bitboard du joueur au trait.
+            :param bAdverse: int - Bitboard de son adversaire.
+            :return: bool - True si les enfants (avec ou sans prise) peuvent être sondés. """
+
+        nombre, nombreAdverse = bin(b).count('1'), bin(bAdverse).count('1')
+        return (nombreAdverse, nombre) in self.tables or nombreAdverse <= 3 \
+            or (nombreAdverse - 1, nombre) in self.tables
+
+
+_bases = {}
+
+
+def chargerFinales(repertoire=REPERTOIRE_FINALES):
+    """ Donne les bases de finales du répertoire, chargées une seule fois par processus.
+        :param repertoire: str - Répertoire des fichiers.
+        :return: BasesFinales, ou None si aucune classe n'est disponible (la recherche ne sonde alors rien). """
+
+    if repertoire not in _bases:
+        bases = BasesFinales(repertoire) if os.path.isdir(repertoire) else None
+        _bases[repertoire] = bases if bases is not None and bases.tables else None
+    return _bases[repertoire]
+
+
+""" Génération par analyse rétrograde """
+
+
+def combinaisons(n, k):
+    """ Liste des ensembles de k positions parmi n, rangés selon rangCombinaison. """
+
+    resultat = [0] * BINOMIAUX[n][k]
+
+    def parcourir(debut, reste, masque):
+        if reste == 0:
+            resultat[rangCombinaison(masque)] = masque
+            return
+        for i in range(debut, n - reste + 1):
+            parcourir(i + 1, reste - 1, masque | BITS[i])
+
+    parcourir(0, k, 0)
+    return resultat
+
+
+class Decodeur:
+    """ Retrouve les bitboards d'une position à partir de son indice, pour une classe donnée. """
+
+    def __init__(self, a, b):
+        self.ensembles = combinaisons(24, a)
+        self.ensemblesAdverses = combinaisons(24 - a, b)
+        self.nombreAdverses = len(self.ensemblesAdverses)
+
+    def position(self, indice):
+        """ :return: tuple - (bitboard du joueur au trait, bitboard de son adversaire). """
+
+        b = self.ensembles[indice // self.nombreAdverses]
+        compresse = self.ensemblesAdverses[indice % self.nombreAdverses]
+        libres = positions(PLATEAU_PLEIN & ~b)
+        bAdverse = 0
+        for i in positions(compresse):
+            bAdverse |= BITS[libres[i]]
+        return b, bAdverse
+
+
+def coupsMoulins(b, bAdverse):
+    """ Déplacements (départ, arrivée) du joueur formant un moulin, dans l'ordre de coupsEtape2ou3.
+        :param b: int - Bitboard du joueur qui déplace un pion.
+        :param bAdverse: int - Bitboard de l'adversaire.
+        :return: list - Couples (départ, arrivée). """
+
+    vides = PLATEAU_PLEIN & ~(b | bAdverse)
+    vol = nombrePionBits(b) == 3
+    resultat = []
+    for i in positions(b):
+        sans = b ^ BITS[i]
+        for j in positions(vides if vol else MASQUES_ADJACENCES[i] & vides):
+            m1, m2 = PAIRES_MOULINS[j]
+            if sans & m1 == m1 or sans & m2 == m2:
+                resultat.append((i, j))
+    return resultat
+
+
+def resoudreGroupe(classes, connues, journal=None):
+    """ Résout un groupe de classes fermé pour les coups sans prise : (a, b) et (b, a), ou (a, a). Les prises mènent
+    à des classes plus petites, déjà résolues.
+
+    Analyse rétrograde par comptage : chaque position retient le nombre de ses coups dont l'issue n'est pas connue.
+    Les positions sont résolues par distance croissante ; quand une position est perdue, ses prédécesseurs sont gagnés
+    à la distance suivante ; quand elle est gagnée, le compteur de ses prédécesseurs diminue, et une position dont tous
+    les coups mènent à une victoire adverse est perdue. Les positions jamais résolues sont nulles.
+        :param classes: list - Une ou deux classes (a, b).
+        :param connues: dict - Valeurs des classes plus petites (bytes, bytearray ou mmap), indexées par (a, b).
+        :param journal: Fonction d'affichage de la progression, ou None.
+        :return: dict - Valeurs (bytearray) de chaque classe du groupe. """
+
+    numeros = {classe: numero for numero, classe in enumerate(classes)}
+    valeurs = {classe: bytearray(nombrePositions(*classe)) for classe in classes}
+    compteurs = {classe: array('H', bytes(2 * nombrePositions(*classe))) for classe in classes}
+    planchers = {classe: bytearray(nombrePositions(*classe)) for classe in classes}
+    decodeurs = {classe: Decodeur(*classe) for classe in classes}
+    niveaux = {}  # Distance -> array d'entrées (indice << 2 | numéro de classe << 1 | candidat)
+
+    def ajouter(distance, entree):
+        if distance > DISTANCE_MAX:
+            raise ValueError(f"distance supérieure à {DISTANCE_MAX}")
+        niveaux.setdefault(distance, array('q')).append(entree)
+
+    # Initialisation : nombre de coups de chaque position et issue des prises (classes plus petites)
+    for classe in classes:
+        a, b = classe
+        numero = numeros[classe]
+        valeursClasse, compteursClasse, planchersClasse = valeurs[classe], compteurs[classe], planchers[classe]
+        classePrise = connues.get((b - 1, a)) if b - 1 >= 3 else None
+        decodeur = decodeurs[classe]
+        for indice in range(len(valeursClasse)):
+            pions, pionsAdverses = decodeur.position(indice)
+            nombre = nombreCoupsPossiblesBits(pions, pionsAdverses)
+            if nombre == 0:  # Aucun coup : défaite immédiate
+                valeursClasse[indice] = PERTE
+                ajouter(0, indice << 2 | numero << 1)
+                continue
+
+            gainPrise = None  # Plus courte victoire obtenue par une prise
+            plancher = 0      # Distance minimale d'une éventuelle défaite, imposée par les prises
+            moulins = coupsMoulins(pions, pionsAdverses)
+            if moulins:
+                for capture in piecesRetirables(pionsAdverses):
+                    restants = pionsAdverses ^ BITS[capture]
+                    for depart, arrivee in moulins:
+                        if b - 1 < 3:  # L'adversaire n'a plus que 2 pions : il a perdu
+                            gainPrise = 1
+                            continue
+                        if classePrise is None:
+                            raise ValueError(f"la classe {(b - 1, a)} doit être résolue avant {classe}")
+                        valeur = classePrise[indicePosition(restants, pions ^ BITS[depart] ^ BITS[arrivee])]
+                        if valeur >= PERTE:
+                            distance = valeur - PERTE + 1
+                            gainPrise = distance if gainPrise is None else min(gainPrise, distance)
+                        elif valeur != NULLE:
+                            nombre -= 1
+                            plancher = max(plancher, valeur + 1)
+            compteursClasse[indice] = nombre
+            planchersClasse[indice] = plancher
+            if gainPrise is not None:  # Candidat : un coup sans prise peut encore gagner plus vite
+                ajouter(gainPrise, indice << 2 | numero << 1 | 1)
+            elif nombre == 0:  # Tous les coups sont des prises menant à une victoire adverse
+                valeursClasse[indice] = PERTE + plancher
+                ajouter(plancher, indice << 2 | numero << 1)
+        if journal:
+            journal(f"classe {classe} : initialisation terminée")
+
+    # Propagation par distance croissante
+    distance = 0
+    while niveaux:
+        niveau = niveaux.pop(distance, None)
+        resolues = 0
+        for entree in niveau or ():
+            classe = classes[entree >> 1 & 1]
+            indice = entree >> 2
+            valeursClasse = valeurs[classe]
+            if entree & 1:
+                if valeursClasse[indice] != NULLE:
+                    continue  # Déjà gagnée plus vite
+                valeursClasse[indice] = distance
+            resolues += 1
+            perdue = valeursClasse[indice] >= PERTE
+
+            # Prédécesseurs sans prise : l'adversaire vient de jouer un pion qui n'a pas formé de moulin
+            pions, pionsAdverses = decodeurs[classe].position(indice)
+            parent = (classe[1], classe[0])
+            numeroParent = numeros[parent]
+            valeursParent, compteursParent, planchersParent = valeurs[parent], compteurs[parent], planchers[parent]
+            vides = PLATEAU_PLEIN & ~(pions | pionsAdverses)
+            vol = nombrePionBits(pionsAdverses) == 3
+            for arrivee in positions(pionsAdverses):
+                if prochainMoulinBits(arrivee, pionsAdverses):
+                    continue
+                for depart in positions(vides if vol else MASQUES_ADJACENCES[arrivee] & vides):
+                    j = indicePosition(pionsAdverses ^ BITS[arrivee] ^ BITS[depart], pions)
+                    if valeursParent[j] != NULLE:
+                        continue
+                    if perdue:
+                        valeursParent[j] = distance + 1
+                        ajouter(distance + 1, j << 2 | numeroParent << 1)
+                    else:
+                        compteursParent[j] -= 1
+                        if compteursParent[j] == 0:
+                            d = max(distance + 1, planchersParent[j])
+                            valeursParent[j] = PERTE + d
+                            ajouter(d, j << 2 | numeroParent << 1)
+        if journal and resolues:
+            journal(f"distance {distance} : {resolues} positions résolues")
+        distance += 1
+    return valeurs
+
+
+def groupesAResoudre(classes):
+    """ Ajoute aux classes demandées leurs dépendances, et les regroupe dans l'ordre de résolution.
+        :param classes: Classes (a, b) demandées.
+        :return: list - Groupes de classes, chaque groupe ne dépendant que des précédents. """
+
+    groupes = set()
+    aTraiter = list(classes)
+    while aTraiter:
+        a, b = aTraiter.pop()
+        if min(a, b) < 3 or max(a, b) > PIONS_MAX:
+            raise ValueError(f"classe invalide : {(a, b)}")
+        groupe = tuple(sorted({(a, b), (b, a)}))
+        if groupe in groupes:
+            continue
+        groupes.add(groupe)
+        for dependance in ((b - 1, a), (a - 1, b)):
+            if min(dependance) >= 3:
+                aTraiter.append(dependance)
+    return sorted(groupes, key=lambda groupe: sum(groupe[0]))
+
+
+def genererFinales(classes=CLASSES_DEFAUT, repertoire=REPERTOIRE_FINALES, journal=print):
+    """ Génère les fichiers des classes demandées et de leurs dépendances. Les classes déjà présentes sont relues
+    plutôt que recalculées, ce qui permet de reprendre une génération interrompue.
+        :param classes: Classes (a, b) à résoudre.
+        :param repertoire: str - Répertoire de destination.
+        :param journal: Fonction d'affichage de la progression, ou None. """
+
+    os.makedirs(repertoire, exist_ok=True)
+    connues = {}
+    for groupe in groupesAResoudre(classes):
+        chemins = [cheminClasse(a, b, repertoire) for a, b in groupe]
+        if all(os.path.exists(chemin) for chemin in chemins):
+            for classe, chemin in zip(groupe, chemins):
+                with open(chemin, 'rb') as fichier:
+                    connues[classe] = fichier.read()
+            continue
+        debut = time.perf_counter()
+        valeurs = resoudreGroupe(list(groupe), connues, journal)
+        for classe, chemin in zip(groupe, chemins):
+            with open(chemin + '.tmp', 'wb') as fichier:
+                fichier.write(valeurs[classe])
+            os.replace(chemin + '.tmp', chemin)  # Un fichier présent est toujours complet
+            connues[classe] = bytes(valeurs[classe])
+            if journal:
+                gains = sum(1 for v in valeurs[classe] if NULLE < v < PERTE)
+                pertes = sum(1 for v in valeurs[classe] if v >= PERTE)
+                journal(f"classe {classe} : {gains} gains, {pertes} pertes, "
+                        f"{len(valeurs[classe]) - gains - pertes} nulles ({time.perf_counter() - debut:.0f} s)")
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    repertoireDonne = REPERTOIRE_FINALES
+    if "--repertoire" in arguments:
+        indiceOption = arguments.index("--repertoire")
+        repertoireDonne = arguments[indiceOption + 1]
+        del arguments[indiceOption:indiceOption + 2]
+    try:
+        classesDonnees = [tuple(int(n) for n in argument.split('-')) for argument in arguments] or CLASSES_DEFAUT
+        genererFinales(classesDonnees, repertoireDonne)
+    except ValueError as erreur:
+        print(f"\033[91mErreur : {erreur}.\033[0m")
+        print("Utilisation : python3 -m src.ia.finales [3-3 4-3 4-4] [--repertoire chemin]")
+        sys.exit(1)
@@ -1,6 +1,7 @@
 """ Regroupe différentes fonctions d'évaluation permettant à l'IA d'estimer la qualité d'un état du plateau. """
 
 from src.ia.utils import *
+from src.ia.bitboard import *
 
 
 def heuristiqueNaive(plateau, phase1):
@@ -18,9 +19,9 @@ def heuristiqueNaive(plateau, phase1):
     nombrePossibleMoulinsJoueur2 = nombrePiecesMoulinEnFormation(plateau, "2")
 
     if not phase1:  # Si pas en phase 1, détermine le nombre de pièces mobiles
-        piecesMobiles = len(mouvementsPossiblesEtape2ou3(plateau))
+        piecesMobiles = existeCoupPossible(plateau)
 
-        if nombrePion(plateau, '2') <= 2 or piecesMobiles == 0:  # Vérification des conditions de :
+        if nombrePion(plateau, '2') <= 2 or not piecesMobiles:  # Vérification des conditions de :
             return float('inf')                                         # Victoire du joueur 1
         elif nombrePion(plateau, '1') <= 2:
             return float('-inf')                                        # Victoire du joueur 2
@@ -85,8 +86,8 @@ def heuristiqueAvancee(plateau, phase1):
 
     # 4. Mobilité : Nombre de mouvements possibles (uniquement après la phase 1)
     if not phase1:
-        mouvementsJoueur1 = len(mouvementsPossiblesEtape2ou3(plateau, '1'))
-        mouvementsJoueur2 = len(mouvementsPossiblesEtape2ou3(plateau, '2'))
+        mouvementsJoueur1 = nombreCoupsPossibles(plateau, '1')
+        mouvementsJoueur2 = nombreCoupsPossibles(plateau, '2')
 
         evaluation += poidsMouvementsPossibles * (mouvementsJoueur1 - mouvementsJoueur2)
 
@@ -178,3 +179,150 @@ def heuristiqueExperte(plateau, phase1):
     evaluation += poidsConfigGagnante * (victoireJoueur - defaiteJoueur)
 
     return evaluation
+
+
+""" Versions des heuristiques sur bitboards, utilisées par le moteur de recherche. Elles renvoient exactement les
+    mêmes valeurs que les versions sur liste ci-dessus. """
+
+
+def heuristiqueNaiveBits(b1, b2, phase1):
+    """ Version sur bitboards de heuristiqueNaive.
+        :param b1: Bitboard du joueur '1'.
+        :param b2: Bitboard du joueur '2'.
+        :param phase1: Booléen indiquant si le jeu est en phase 1 (placement des pions) ou non.
+        :return: Un score numérique évaluant l'état du plateau en faveur d'un joueur ou de l'autre. """
+
+    vides = PLATEAU_PLEIN & ~(b1 | b2)
+    nombrePossibleMoulinsJoueur1 = nombrePossibleMoulinsBits(b1, vides)
+    nombrePossibleMoulinsJoueur2 = nombrePiecesMoulinEnFormationBits(b2, b1, False)
+    pionsJoueur1 = nombrePionBits(b1)
+
+    if not phase1:
+        piecesMobiles = existeCoupPossibleBits(b1, b2)
+
+        if nombrePionBits(b2) <= 2 or not piecesMobiles:
+            return float('inf')
+        elif pionsJoueur1 <= 2:
+            return float('-inf')
+
+    if pionsJoueur1 < 4:
+        return nombrePossibleMoulinsJoueur1 + 2 * nombrePossibleMoulinsJoueur2
+    else:
+        return 2 * nombrePossibleMoulinsJoueur1 + nombrePossibleMoulinsJoueur2
+
+
+def heuristiqueAvanceeBits(b1, b2, phase1):
+    """ Version sur bitboards de heuristiqueAvancee.
+        :param b1: Bitboard du joueur '1'.
+        :param b2: Bitboard du joueur '2'.
+        :param phase1: Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: Une valeur numérique représentant l'évaluation de l'état du plateau. """
+
+    pionsJoueur1 = nombrePionBits(b1)
+    pionsJoueur2 = nombrePionBits(b2)
+
+    if not phase1:
+        if pionsJoueur1 < 3:
+            return float('-inf')
+        if pionsJoueur2 < 3:
+            return float('inf')
+
+    vides = PLATEAU_PLEIN & ~(b1 | b2)
+    evaluation = 10 * (pionsJoueur1 - pionsJoueur2)
+    evaluation += 50 * (nombrePossibleMoulinsBits(b1, vides) - nombrePossibleMoulinsBits(b2, vides))
+    evaluation += 30 * (nombrePiecesMoulinEnFormationBits(b1, b2, True)
+                        - nombrePiecesMoulinEnFormationBits(b2, b1, False))
+
+    if not phase1:
+        mouvementsJoueur1 = nombreCoupsPossiblesBits(b1, b2)
+        mouvementsJoueur2 = nombreCoupsPossiblesBits(b2, b1)
+
+        evaluation += 5 * (mouvementsJoueur1 - mouvementsJoueur2)
+
+        if mouvementsJoueur2 == 0:
+            return float('inf')
+        if mouvementsJoueur1 == 0:
+            return float('-inf')
+
+    return evaluation + 30 * nombrePionsBloques(b2, vides)
+
+
+def heuristiqueExperteBits(b1, b2, phase1):
+    """ Version sur bitboards de heuristiqueExperte.
+        :param b1: Bitboard du joueur '1'.
+        :param b2: Bitboard du joueur '2'.
+        :param phase1: Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: Une valeur numérique représentant l'évaluation de l'état du plateau. """
+
+    poidsMoulinsFermes = 18 if phase1 else 14
+    poidsMoulins = 26 if phase1 else 43
+    poidsPionsBloques = 1 if phase1 else 10
+    poidsPions = 9 if phase1 else 11
+    poidsConfig2Pions = 10
+    poidsConfig3Pions = 7 if phase1 else 1086
+    poidsDoubleMoulins = 0 if phase1 else 8
+    poidsConfigGagnante = 0 if phase1 else 1190
+
+    vides = PLATEAU_PLEIN & ~(b1 | b2)
+
+    # Un pion appartient à un moulin si et seulement si moulinCree est vrai : les doubles moulins de la version
+    # sur liste (moulinCree et prochainMoulin) comptent donc les pions appartenant à un moulin
+    doubleMoulinJoueur = sum(1 for i in positions(b1) if prochainMoulinBits(i, b1))
+    doubleMoulinAdversaire = sum(1 for i in positions(b2) if prochainMoulinBits(i, b2))
+    evaluation = poidsMoulinsFermes * (int(doubleMoulinJoueur > 0) - int(doubleMoulinAdversaire > 0))
+
+    # Le nombre de moulins et les configurations à 3 pions comptent la même chose
+    nbMoulinsJoueur = nombrePossibleMoulinsBits(b1, vides)
+    nbMoulinsAdversaire = nombrePossibleMoulinsBits(b2, vides)
+    evaluation += (poidsMoulins + poidsConfig3Pions) * (nbMoulinsJoueur - nbMoulinsAdversaire)
+
+    pionsBloquesJoueur = nombrePionsBloques(b2, vides)
+    pionsBloquesAdversaire = nombrePionsBloques(b1, vides)
+    evaluation += poidsPionsBloques * (pionsBloquesAdversaire - pionsBloquesJoueur)
+
+    nbPionsJoueur = nombrePionBits(b1)
+    nbPionsAdversaire = nombrePionBits(b2)
+    evaluation += poidsPions * (nbPionsJoueur - nbPionsAdversaire)
+
+    evaluation += poidsConfig2Pions * (nombrePiecesMoulinEnFormationBits(b1, b2, True)
+                                       - nombrePiecesMoulinEnFormationBits(b2, b1, False))
+
+    evaluation += poidsDoubleMoulins * (doubleMoulinJoueur - doubleMoulinAdversaire)
+
+    victoireJoueur = int(nbPionsAdversaire < 3 or pionsBloquesAdversaire == nbPionsAdversaire)
+    defaiteJoueur = int(nbPionsJoueur < 3 or pionsBloquesJoueur == nbPionsJoueur)
+    evaluation += poidsConfigGagnante * (victoireJoueur - defaiteJoueur)
+
+    return evaluation
+
+
+# Correspondance entre les heuristiques sur liste et leur version sur bitboards
+HEURISTIQUES_BITBOARD = {heuristiqueNaive: heuristiqueNaiveBits,
+                         heuristiqueAvancee: heuristiqueAvanceeBits,
+                         heuristiqueExperte: heuristiqueExperteBits}
+
+
+def selonJoueur(heuristiqueBits):
+    """ Adapte une heuristique sur bitboards, qui évalue le plateau du point de vue du joueur '1', à la recherche
+    negamax : la fonction obtenue prend en plus le joueur au trait et renvoie le score de son point de vue.
+        :param heuristiqueBits: Fonction prenant (b1, b2, phase1).
+        :return: Fonction prenant (b1, b2, phase1, joueur), joueur valant 0 (joueur '1') ou 1 (joueur '2'). """
+
+    def evaluer(b1, b2, phase1, joueur):
+        valeur = heuristiqueBits(b1, b2, phase1)
+        return -valeur if joueur else valeur
+    return evaluer
+
+
+def versionBitboard(heuristique):
+    """ Donne la version sur bitboards d'une heuristique, prête pour negamax (voir selonJoueur). Une heuristique sans
+    version dédiée est appelée sur le plateau reconverti en liste, ce qui permet à minimax d'accepter n'importe quelle
+    fonction d'évaluation. Une heuristique mémorisée (voir cache.py) fournit elle-même sa version sur bitboards.
+        :param heuristique: Fonction heuristique prenant (plateau, phase1).
+        :return: Fonction prenant (b1, b2, phase1, joueur). """
+
+    if heuristique in HEURISTIQUES_BITBOARD:
+        return selonJoueur(HEURISTIQUES_BITBOARD[heuristique])
+    if hasattr(heuristique, 'evaluerBits'):
+        return selonJoueur(heuristique.evaluerBits)
+    return selonJoueur(lambda b1, b2, phase1: heuristique(versListe(b1, b2), phase1))
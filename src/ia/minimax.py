@@ -1,6 +1,39 @@
-""" Implémente précisément l'algorithme Minimax avec élagage alpha-bêta selon le cours. """
+""" Implémente l'algorithme Minimax avec élagage alpha-bêta, sous sa forme negamax : chaque nœud maximise le score du
+    point de vue du joueur au trait, et le score d'un enfant est l'opposé de celui de l'adversaire. La fonction minimax
+    conserve la signature d'origine (scores du point de vue du joueur '1', maximisant ou minimisant).
+    La recherche travaille sur des bitboards (voir bitboard.py) : la conversion depuis et vers la liste n'est faite
+    qu'une fois, à l'entrée et à la sortie de minimax. Les coups sont joués puis défaits sur un unique état (etat.py),
+    les positions déjà cherchées sont mémorisées dans une table de transposition (transposition.py) et les coups sont
+    explorés du plus prometteur au moins prometteur (ordonnancement.py). Avec heuristiqueExperte, l'état maintient
+    lui-même l'évaluation au fil des coups (evaluation.py). Si NumPy est installé, les enfants des nœuds de profondeur 1
+    sont évalués tous ensemble (vectorisation.py). Les finales résolues hors ligne (finales.py) sont lues plutôt que
+    cherchées. Aux feuilles, une recherche de quiescence prolonge les séquences de prises en cours ; à la profondeur 1,
+    l'évaluation groupée des enfants lui fournit leur stand-pat.
+    L'état tient le compte des pions en main et sur le plateau : lorsque les modes de jeu donnent les pions restant à
+    placer (paramètre enMain), la phase de déplacement commence dans l'arbre exactement après le dernier placement.
+    Par défaut, la recherche est une Principal Variation Search : seul le premier coup (le mieux ordonné) est cherché
+    avec la fenêtre complète, les suivants avec une fenêtre nulle, et un coup n'est recherché à nouveau que s'il
+    dépasse alpha. L'alpha-bêta simple reste disponible (pvs=False) pour comparer le nombre de nœuds.
+    minimaxIteratif approfondit la recherche tant que le budget de temps accordé au coup n'est pas épuisé ; à partir de
+    la deuxième itération, la racine est cherchée dans une fenêtre d'aspiration autour du score précédent. """
 
+import time
 from src.ia.utils import *
+from src.ia.bitboard import *
+from src.ia.heuristiques import versionBitboard, heuristiqueExperte
+from src.ia.etat import EtatJeu, mainsSelonPhase
+from src.ia.evaluation import EtatExperte
+from src.ia.transposition import TableTransposition, EXACTE, INFERIEURE, SUPERIEURE
+from src.ia.ordonnancement import OrdonnancementCoups
+from src.ia.vectorisation import versionGroupee, evaluationsEnfants
+from src.ia.finales import chargerFinales, versTable, depuisTable
+from src.ia.statistiques import StatistiquesRecherche, classeMesuree
+
+
+PROFONDEUR_MAX = 64  # Profondeur maximale de l'approfondissement itératif
+NOEUDS_QUIESCENCE = 64  # Nombre maximal de prises examinées par la quiescence depuis une même feuille
+FENETRE_ASPIRATION = 25  # Demi-largeur initiale de la fenêtre d'aspiration autour du score précédent
+FENETRE_ASPIRATION_MAX = 1600  # Au-delà, la fenêtre est ouverte entièrement du côté de l'échec
 
 
 class Evaluer:
@@ -8,9 +41,94 @@ class Evaluer:
     def __init__(self):
         self.evaluer = 0  # Valeur d'évaluation de la configuration
         self.plateau = []  # Plateau correspondant à cette évaluation
+        self.coup = None  # Coup (départ, arrivée, pion retiré) menant à ce plateau, ou None
+        self.profondeur = 0  # Profondeur de la recherche complète ayant produit cette évaluation
+        self.noeuds = 0  # Nombre de nœuds visités par la recherche
+        self.statistiques = None  # StatistiquesRecherche, si leur collecte a été demandée
+
+
+class TempsEcoule(Exception):
+    """ Levée pendant la recherche lorsque le budget de temps est épuisé (ou que l'arrêt est demandé), pour
+    interrompre l'itération en cours. """
+
+
+class ContexteRecherche:
+    """ Regroupe ce qui est commun à tous les nœuds d'une recherche : l'heuristique, la table de transposition,
+    l'ordonnancement des coups, l'éventuelle date limite et le nombre de nœuds visités. """
+    def __init__(self, heuristique, table=None, limite=None, ordonnancement=None, arret=None, groupee=None,
+                 finales=None, quiescence=None, pvs=False, statistiques=None):
+        self.heuristique = heuristique  # Fonction d'évaluation sur bitboards, prenant (b1, b2, phase1, joueur)
+        self.table = table  # TableTransposition, ou None pour chercher sans table
+        self.limite = limite  # Date limite (time.perf_counter()) au-delà de laquelle la recherche s'interrompt
+        self.ordonnancement = ordonnancement  # OrdonnancementCoups, ou None pour l'ordre de génération
+        self.noeuds = 0  # Nombre de nœuds visités
+        self.arret = arret  # Événement (multiprocessing.Event) demandant l'arrêt de la recherche, ou None
+        self.groupee = groupee  # (heuristique groupée, nombre minimal d'enfants) pour la profondeur 1, ou None
+        self.finales = finales  # BasesFinales sondées en phase 2 et 3, ou None
+        self.quiescence = quiescence  # Nombre maximal de prises examinées depuis chaque feuille, ou None (désactivée)
+        self.prisesRestantes = 0  # Prises encore autorisées à la quiescence de la feuille en cours
+        self.pvs = pvs  # Principal Variation Search et fenêtres d'aspiration (True) ou alpha-bêta simple (False)
+        self.statistiques = statistiques  # StatistiquesRecherche mises à jour par negamax, ou None
+
+
+def creerEtat(plateau, joueur, heuristique, enMain=(0, 0), statistiques=None):
+    """ Construit l'état mutable de la recherche : un état maintenant l'évaluation de façon incrémentale si
+    l'heuristique le permet, un EtatJeu sinon.
+        :param plateau: Liste représentant l'état du plateau.
+        :param joueur: Indice du joueur au trait.
+        :param heuristique: Fonction heuristique (sur liste) utilisée par la recherche.
+        :param enMain: Nombre de pions restant à placer à chaque joueur (voir mainsSelonPhase), qui détermine la
+        phase de chaque nœud.
+        :param statistiques: StatistiquesRecherche dans lesquelles les évaluations sont mesurées, ou None.
+        :return: L'état correspondant au plateau. """
+
+    classe = EtatExperte if heuristique is heuristiqueExperte else EtatJeu
+    if statistiques is None:
+        return classe.depuisListe(plateau, joueur, enMain)
+    etat = classeMesuree(classe).depuisListe(plateau, joueur, enMain)
+    etat.statistiques = statistiques
+    return etat
+
+
+def evaluationDuCoup(plateau, maximisant, valeur, coup, profondeur, noeuds=0, statistiques=None):
+    """ Construit l'objet Evaluer renvoyé aux modes de jeu : le coup choisi est joué sur le plateau reçu.
+        :param plateau: Liste représentant l'état du plateau avant le coup.
+        :param maximisant: Booléen indiquant si le joueur '1' est au trait.
+        :param valeur: Score de la recherche.
+        :param coup: Coup choisi, ou None si aucun coup n'a été trouvé.
+        :param profondeur: Profondeur de la recherche.
+        :param noeuds: Nombre de nœuds visités par la recherche.
+        :param statistiques: StatistiquesRecherche de la recherche, ou None.
+        :return: Un objet Evaluer contenant le plateau après le coup et son score. """
+
+    evaluationFinale = Evaluer()
+    evaluationFinale.evaluer = valeur
+    evaluationFinale.profondeur = profondeur
+    evaluationFinale.noeuds = noeuds
+    evaluationFinale.statistiques = statistiques
+    evaluationFinale.coup = coup
+    if statistiques is not None:
+        statistiques.profondeur = profondeur
+    etat = EtatJeu.depuisListe(plateau, enMain=mainsSelonPhase(True))  # Seul le plateau obtenu est utilisé
+    if coup is not None:
+        etat.appliquer(coup, 0 if maximisant else 1)
+    evaluationFinale.plateau = etat.versListe()
+    return evaluationFinale
+
+
+def ordonnancementRecherche(ordonner, session):
+    """ Donne l'ordonnancement des coups d'une recherche : celui de la session s'il y en a une, sinon un nouveau.
+        :param ordonner: Booléen indiquant si les coups sont ordonnés.
+        :param session: SessionRecherche ou None.
+        :return: OrdonnancementCoups, ou None si les coups ne sont pas ordonnés. """
+
+    if not ordonner:
+        return None
+    return session.ordonnancement if session is not None else OrdonnancementCoups()
 
 
-def minimax(plateau, profondeur, maximisant, alpha, beta, etape1, heuristique):
+def minimax(plateau, profondeur, maximisant, alpha, beta, etape1, heuristique, table=None, ordonner=True,
+            quiescence=NOEUDS_QUIESCENCE, pvs=True, statistiques=False, finales=True, session=None, enMain=None):
     """ Algorithme Minimax avec élagage alpha-bêta pour évaluer les meilleures configurations du jeu.
         :param plateau: Liste représentant l'état actuel du plateau.
         :param profondeur: Profondeur maximale de recherche dans l'arbre de jeu.
@@ -19,50 +137,342 @@ def minimax(plateau, profondeur, maximisant, alpha, beta, etape1, heuristique):
         :param beta: Meilleure valeur trouvée pour le joueur minimisant.
         :param etape1: Booléen indiquant si l'on est à l'étape 1 du jeu.
         :param heuristique: Fonction d'évaluation heuristique utilisée.
+        :param table: Table de transposition à utiliser ; par défaut, une nouvelle table de taille MEMOIRE_DEFAUT.
+        :param ordonner: Booléen indiquant si les coups sont ordonnés (False : ordre de génération, pour comparaison).
+        :param quiescence: Nombre maximal de prises examinées depuis chaque feuille, ou None pour arrêter la recherche
+        à la profondeur donnée.
+        :param pvs: Booléen indiquant si la recherche utilise PVS (et, avec l'approfondissement itératif, des fenêtres
+        d'aspiration) ; False : alpha-bêta simple, pour comparaison.
+        :param statistiques: Booléen indiquant si les statistiques de la recherche sont collectées
+        (Evaluer.statistiques).
+        :param finales: Booléen indiquant si les bases de finales présentes sont consultées (False : résultat
+        indépendant des fichiers générés, pour les comparaisons de référence).
+        :param session: SessionRecherche dont la table de transposition et l'ordonnancement sont utilisés (et conservés
+        pour les coups suivants), ou None.
+        :param enMain: Tuple (pions restant à placer au joueur '1', au joueur '2') : la recherche passe alors à la
+        phase de déplacement exactement quand ils sont tous placés (etape1 est ignoré). None : la phase de la racine,
+        donnée par etape1, est conservée dans tout l'arbre.
         :return: Un objet Evaluer contenant la meilleure configuration du plateau et son score d'évaluation. """
 
-    evaluationFinale = Evaluer()
-    evaluationFinale.plateau = plateau[:]
+    debut = time.perf_counter()
+    joueur = 0 if maximisant else 1
+    stats = StatistiquesRecherche() if statistiques else None
+    etat = creerEtat(plateau, joueur, heuristique, mainsSelonPhase(etape1, enMain), stats)
+    if session is not None:
+        table = session.table
+    contexte = ContexteRecherche(versionBitboard(heuristique), table if table is not None else TableTransposition(),
+                                 ordonnancement=ordonnancementRecherche(ordonner, session),
+                                 groupee=versionGroupee(heuristique), finales=chargerFinales() if finales else None,
+                                 quiescence=quiescence, pvs=pvs, statistiques=stats)
+    if maximisant:
+        valeur, meilleurCoup = negamax(etat, profondeur, joueur, alpha, beta, contexte)
+    else:  # Le score du joueur '2' est l'opposé de celui du joueur '1', et la fenêtre est inversée
+        valeur, meilleurCoup = negamax(etat, profondeur, joueur, -beta, -alpha, contexte)
+        valeur = -valeur
+    if stats is not None:
+        stats.duree = time.perf_counter() - debut
+    return evaluationDuCoup(plateau, maximisant, valeur, meilleurCoup, profondeur, contexte.noeuds, stats)
 
-    # Condition terminale : profondeur atteinte ou fin de partie
-    if profondeur == 0 or (not etape1 and (nombrePion(plateau, '1') < 3 or nombrePion(plateau, '2') < 3)):
-        evaluationFinale.evaluer = heuristique(plateau, etape1)
-        return evaluationFinale
 
-    if maximisant:  # Tour du joueur '1' (maximisant)
-        meilleureValeur = float('-inf')
-        mouvementsPossibles = mouvementsPossiblesEtape1(plateau) if etape1 \
-            else mouvementsPossiblesEtape2ou3(plateau, '1')
+def minimaxIteratif(plateau, maximisant, etape1, heuristique, temps, profondeurMax=PROFONDEUR_MAX, table=None,
+                    ordonner=True, quiescence=NOEUDS_QUIESCENCE, pvs=True, statistiques=False, finales=True,
+                    session=None, enMain=None):
+    """ Approfondissement itératif : cherche à la profondeur 1, puis 2, 3... jusqu'à épuisement du budget de temps.
+    L'itération en cours au moment où le temps est écoulé est abandonnée, et le coup renvoyé est celui de la dernière
+    profondeur entièrement cherchée. Les itérations partagent la même table de transposition.
+        :param plateau: Liste représentant l'état actuel du plateau.
+        :param maximisant: Booléen indiquant si l'on maximise (True) ou minimise (False) la valeur d'évaluation.
+        :param etape1: Booléen indiquant si l'on est à l'étape 1 du jeu.
+        :param heuristique: Fonction d'évaluation heuristique utilisée.
+        :param temps: Budget de temps accordé au coup, en secondes.
+        :param profondeurMax: Profondeur à laquelle l'approfondissement s'arrête même s'il reste du temps.
+        :param table: Table de transposition à utiliser ; par défaut, une nouvelle table de taille MEMOIRE_DEFAUT.
+        :param ordonner: Booléen indiquant si les coups sont ordonnés (False : ordre de génération, pour comparaison).
+        :param quiescence: Nombre maximal de prises examinées depuis chaque feuille, ou None pour arrêter la recherche
+        à la profondeur donnée.
+        :param pvs: Booléen indiquant si la recherche utilise PVS (et, avec l'approfondissement itératif, des fenêtres
+        d'aspiration) ; False : alpha-bêta simple, pour comparaison.
+        :param statistiques: Booléen indiquant si les statistiques de la recherche sont collectées
+        (Evaluer.statistiques).
+        :param finales: Booléen indiquant si les bases de finales présentes sont consultées (False : résultat
+        indépendant des fichiers générés, pour les comparaisons de référence).
+        :param session: SessionRecherche dont la table de transposition et l'ordonnancement sont utilisés (et conservés
+        pour les coups suivants), ou None.
+        :param enMain: Tuple (pions restant à placer au joueur '1', au joueur '2') : la recherche passe alors à la
+        phase de déplacement exactement quand ils sont tous placés (etape1 est ignoré). None : la phase de la racine,
+        donnée par etape1, est conservée dans tout l'arbre.
+        :return: Un objet Evaluer contenant la meilleure configuration du plateau et son score d'évaluation. """
 
-        for config in mouvementsPossibles:
-            evalCourante = minimax(config, profondeur - 1, False, alpha, beta, etape1, heuristique)
-            if evalCourante.evaluer > meilleureValeur:
-                meilleureValeur = evalCourante.evaluer
-                evaluationFinale.plateau = config[:]
+    debut = time.perf_counter()
+    limite = debut + temps
+    joueur = 0 if maximisant else 1
+    stats = StatistiquesRecherche() if statistiques else None
+    etat = creerEtat(plateau, joueur, heuristique, mainsSelonPhase(etape1, enMain), stats)
+    if session is not None:
+        table = session.table
+    contexte = ContexteRecherche(versionBitboard(heuristique), table if table is not None else TableTransposition(),
+                                 ordonnancement=ordonnancementRecherche(ordonner, session),
+                                 groupee=versionGroupee(heuristique), finales=chargerFinales() if finales else None,
+                                 quiescence=quiescence, pvs=pvs, statistiques=stats)
+    valeur, meilleurCoup, profondeurAtteinte = 0, None, 0
 
-            alpha = max(alpha, meilleureValeur)
-            if beta <= alpha:  # Vérification de l'élagage alpha-bêta
-                break
+    for profondeurAtteinte, valeur, meilleurCoup in approfondir(etat, joueur, contexte, range(1, profondeurMax + 1),
+                                                                limite):
+        pass  # Seul le résultat de la dernière profondeur complète est conservé
+    if not maximisant:
+        valeur = -valeur
+    if stats is not None:
+        stats.duree = time.perf_counter() - debut
 
-        # Attribution de la meilleure valeur à evaluer, ou si aucun coup possible la valeur de l'évaluation
-        evaluationFinale.evaluer = meilleureValeur if mouvementsPossibles else heuristique(plateau, etape1)
+    return evaluationDuCoup(plateau, maximisant, valeur, meilleurCoup, profondeurAtteinte, contexte.noeuds, stats)
 
-    else:  # Tour du joueur '2' (minimisant, IA)
-        meilleureValeur = float('inf')
-        mouvementsPossibles = mouvementsPossiblesEtape1(plateauInverse(plateau)) if etape1 \
-            else mouvementsPossiblesEtape2ou3(plateauInverse(plateau), '1')
-        mouvementsPossibles = genereListePlateauInverse(mouvementsPossibles)
 
-        for config in mouvementsPossibles:
-            evalCourante = minimax(config, profondeur - 1, True, alpha, beta, etape1, heuristique)
-            if evalCourante.evaluer < meilleureValeur:
-                meilleureValeur = evalCourante.evaluer
-                evaluationFinale.plateau = config[:]
-            beta = min(beta, meilleureValeur)
+def approfondir(etat, joueur, contexte, profondeurs, limite=None, premiereComplete=True):
+    """ Cœur de l'approfondissement itératif : cherche successivement à chacune des profondeurs et produit, après
+    chaque recherche complète, le triplet (profondeur, score du point de vue du joueur au trait, meilleur coup).
+    S'arrête quand le temps est écoulé ou l'arrêt demandé (l'itération en cours est alors abandonnée et l'état n'est
+    plus utilisable), s'il n'y a aucun coup ou si l'issue de la partie est déjà connue.
+        :param etat: EtatJeu - État du plateau à la racine.
+        :param joueur: Indice du joueur au trait.
+        :param contexte: ContexteRecherche - Contexte partagé par toutes les itérations.
+        :param profondeurs: Suite croissante des profondeurs à chercher.
+        :param limite: Date limite (time.perf_counter()), ou None.
+        :param premiereComplete: Booléen indiquant si la première profondeur est cherchée sans limite de temps, afin
+        de toujours disposer d'un coup. """
 
+    valeur = None
+    for i, profondeur in enumerate(profondeurs):
+        contexte.limite = None if i == 0 and premiereComplete else limite
+        try:
+            if contexte.pvs and valeur is not None:  # Fenêtre d'aspiration autour du score de l'itération précédente
+                valeur, meilleurCoup = rechercheAspiration(etat, profondeur, joueur, contexte, valeur)
+            else:
+                valeur, meilleurCoup = negamax(etat, profondeur, joueur, float('-inf'), float('inf'), contexte)
+        except TempsEcoule:
+            return
+        yield profondeur, valeur, meilleurCoup
+
+        # Inutile d'aller plus loin si le temps est écoulé, s'il n'y a aucun coup ou si l'issue est déjà connue
+        if (limite is not None and time.perf_counter() >= limite) or meilleurCoup is None \
+                or abs(valeur) == float('inf'):
+            return
+
+
+def rechercheAspiration(etat, profondeur, joueur, contexte, estimation):
+    """ Cherche la racine avec une fenêtre étroite centrée sur une estimation du score. Si le score sort de la fenêtre,
+    la recherche est relancée avec une fenêtre élargie du côté de l'échec, jusqu'à l'ouvrir entièrement.
+        :param etat: EtatJeu - État du plateau à la racine.
+        :param profondeur: Profondeur de recherche.
+        :param joueur: Indice du joueur au trait.
+        :param contexte: ContexteRecherche - Contexte de la recherche.
+        :param estimation: Score attendu (celui de l'itération précédente).
+        :return: Un couple (score du point de vue du joueur au trait, meilleur coup ou None). """
+
+    ecartBas = ecartHaut = FENETRE_ASPIRATION
+    while True:
+        alpha = estimation - ecartBas if ecartBas <= FENETRE_ASPIRATION_MAX else float('-inf')
+        beta = estimation + ecartHaut if ecartHaut <= FENETRE_ASPIRATION_MAX else float('inf')
+        valeur, meilleurCoup = negamax(etat, profondeur, joueur, alpha, beta, contexte)
+        if valeur <= alpha and alpha != float('-inf'):
+            ecartBas *= 4
+        elif valeur >= beta and beta != float('inf'):
+            ecartHaut *= 4
+        else:
+            return valeur, meilleurCoup
+
+
+def negamax(etat, profondeur, joueur, alpha, beta, contexte, ply=0):
+    """ Cœur de la recherche, sous forme negamax : les coups sont joués puis défaits sur un unique état mutable, et les
+    scores sont toujours exprimés du point de vue du joueur au trait. La phase du nœud est lue dans l'état : le joueur
+    au trait place tant qu'il lui reste des pions en main.
+        :param etat: EtatJeu - État du plateau, identique en sortie à celui reçu en entrée.
+        :param profondeur: Profondeur restante.
+        :param joueur: Indice du joueur au trait (0 pour le joueur '1', 1 pour le joueur '2').
+        :param alpha: Score minimal déjà garanti au joueur au trait.
+        :param beta: Score au-delà duquel l'adversaire évitera cette position.
+        :param contexte: ContexteRecherche - Heuristique, table de transposition et date limite de la recherche.
+        :param ply: Distance du nœud à la racine.
+        :return: Un couple (score du point de vue du joueur au trait, meilleur coup ou None). """
+
+    if contexte.limite is not None and time.perf_counter() > contexte.limite:
+        raise TempsEcoule()
+    contexte.noeuds += 1
+    if contexte.arret is not None and not contexte.noeuds & 1023 and contexte.arret.is_set():
+        raise TempsEcoule()  # Arrêt demandé par un autre processus (vérifié tous les 1024 nœuds)
+    stats = contexte.statistiques
+    if stats is not None:
+        stats.compterNoeud(ply)
+
+    etape1 = etat.enMain[joueur] > 0
+    heuristique = contexte.heuristique
+    table = contexte.table
+
+    # Finale résolue : la valeur exacte remplace la recherche (sauf à la racine, qui doit choisir un coup)
+    finales = contexte.finales
+    if finales is not None and ply > 0 and not etape1:
+        valeur = finales.sonder(etat.pions[joueur], etat.pions[1 - joueur], ply)
+        if valeur is not None:
+            return valeur, None
+
+    # Condition terminale : profondeur atteinte ou fin de partie
+    if not etape1 and (etat.nombres[0] < 3 or etat.nombres[1] < 3):
+        return etat.evaluer(heuristique, etape1, joueur), None
+    if profondeur == 0:
+        if contexte.quiescence:  # Les prises en cours sont prolongées au-delà de l'horizon
+            contexte.prisesRestantes = contexte.quiescence
+            return rechercheQuiescence(etat, joueur, alpha, beta, contexte, ply), None
+        return etat.evaluer(heuristique, etape1, joueur), None
+
+    coupTable = None
+    if table is not None:  # Consultation de la table : la position a-t-elle déjà été cherchée assez profondément ?
+        cle = etat.cle  # Inclut les pions en main, donc la phase
+        alphaInitial = alpha
+        entree = table.lire(cle)
+        if stats is not None:
+            stats.sondagesTable += 1
+            stats.succesTable += entree is not None
+        if entree is not None:
+            coupTable = entree[3]
+        if entree is not None and entree[0] >= profondeur:
+            _, borne, score, coup = entree
+            score = depuisTable(score, ply)  # Distance des finales comptée depuis ce nœud dans la table
+            if borne == EXACTE:
+                return score, coup
+            elif borne == INFERIEURE:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
             if beta <= alpha:
-                break
+                return score, coup
 
-        evaluationFinale.evaluer = meilleureValeur if mouvementsPossibles else heuristique(plateau, etape1)
+    ordonnancement = contexte.ordonnancement
+    if stats is None:
+        mouvementsPossibles = coupsPossibles(etat.pions, joueur, etape1)
+    else:
+        debut = time.perf_counter()
+        mouvementsPossibles = coupsPossibles(etat.pions, joueur, etape1)
+        stats.tempsGeneration += time.perf_counter() - debut
+    if ordonnancement is not None:
+        ordonnancement.ordonner(mouvementsPossibles, ply, coupTable)
 
-    return evaluationFinale
+    # À la profondeur 1, si le premier coup ne provoque pas de coupure, les suivants sont évalués tous ensemble (avec la
+    # quiescence, ces évaluations servent de stand-pat et seules les prises de chaque enfant sont encore cherchées)
+    groupee = contexte.groupee if profondeur == 1 and len(mouvementsPossibles) > 1 else None
+    etape1Enfants = etat.enMain[1 - joueur] > 0  # Phase des enfants (celle de l'adversaire, inchangée par le coup)
+    if groupee is not None and finales is not None and not etape1Enfants \
+            and finales.couvreEnfants(etat.pions[joueur], etat.pions[1 - joueur]):
+        groupee = None  # Les enfants doivent être sondés un par un
+    scoresEnfants = None
+
+    meilleureValeur = float('-inf')
+    meilleurCoup = None
+    for indice, coup in enumerate(mouvementsPossibles):
+        if scoresEnfants is None:
+            etat.appliquer(coup, joueur)
+            if indice == 0 or not contexte.pvs or alpha == float('-inf'):
+                evalCourante = -negamax(etat, profondeur - 1, 1 - joueur, -beta, -alpha, contexte, ply + 1)[0]
+            else:  # PVS : fenêtre nulle pour vérifier que le coup ne dépasse pas alpha
+                evalCourante = -negamax(etat, profondeur - 1, 1 - joueur, -alpha - 1, -alpha, contexte, ply + 1)[0]
+                if alpha < evalCourante < beta:  # Échec haut : nouvelle recherche pour obtenir le score exact
+                    evalCourante = -negamax(etat, profondeur - 1, 1 - joueur, -beta, -evalCourante, contexte,
+                                            ply + 1)[0]
+            etat.annuler(coup, joueur)
+        else:
+            contexte.noeuds += 1  # L'enfant compte comme un nœud visité, comme dans la recherche une à une
+            if stats is not None:
+                stats.compterNoeud(ply + 1)
+            if contexte.quiescence and scoresEnfants[indice] > alpha:  # Sinon, le stand-pat de l'enfant suffit
+                etat.appliquer(coup, joueur)
+                contexte.prisesRestantes = contexte.quiescence
+                evalCourante = -rechercheQuiescence(etat, 1 - joueur, -beta, -alpha, contexte, ply + 1,
+                                                    -scoresEnfants[indice])
+                etat.annuler(coup, joueur)
+            else:
+                evalCourante = scoresEnfants[indice]
+        if evalCourante > meilleureValeur:
+            meilleureValeur = evalCourante
+            meilleurCoup = coup
+
+        alpha = max(alpha, meilleureValeur)
+        if beta <= alpha:  # Vérification de l'élagage alpha-bêta
+            if ordonnancement is not None:
+                ordonnancement.enregistrerCoupure(coup, ply, profondeur)
+            if stats is not None:
+                stats.coupures += 1
+                stats.coupuresPremierCoup += indice == 0
+            break
+        if indice == 0 and groupee is not None and len(mouvementsPossibles) > groupee[1]:
+            debut = time.perf_counter() if stats is not None else 0
+            scoresEnfants = [None] + evaluationsEnfants(groupee[0], etat.pions, joueur, mouvementsPossibles[1:],
+                                                        etape1Enfants)
+            if stats is not None:  # Les enfants évalués ensemble sont comptés comme des nœuds et des évaluations
+                stats.tempsHeuristique += time.perf_counter() - debut
+                stats.evaluations += len(mouvementsPossibles) - 1
+                stats.evaluationsGroupees += len(mouvementsPossibles) - 1
+
+    # Attribution de la meilleure valeur, ou si aucun coup possible la valeur de l'évaluation
+    if not mouvementsPossibles:
+        meilleureValeur = etat.evaluer(heuristique, etape1, joueur)
+
+    if table is not None:  # Enregistrement du résultat et du type de borne qu'il représente
+        if meilleureValeur <= alphaInitial:
+            borne = SUPERIEURE
+        elif meilleureValeur >= beta:
+            borne = INFERIEURE
+        else:
+            borne = EXACTE
+        table.ecrire(cle, profondeur, borne, versTable(meilleureValeur, ply), meilleurCoup)
+
+    return meilleureValeur, meilleurCoup
+
+
+def rechercheQuiescence(etat, joueur, alpha, beta, contexte, ply, standPat=None):
+    """ Recherche de quiescence, lancée aux feuilles de negamax : le joueur au trait peut s'en tenir à l'évaluation de
+    la position (stand-pat) ou jouer un coup formant un moulin, et seules ces prises sont prolongées. Le nombre total de
+    prises examinées depuis une même feuille est borné par contexte.prisesRestantes.
+        :param etat: EtatJeu - État du plateau, identique en sortie à celui reçu en entrée.
+        :param joueur: Indice du joueur au trait.
+        :param alpha: Score minimal déjà garanti au joueur au trait.
+        :param beta: Score au-delà duquel l'adversaire évitera cette position.
+        :param contexte: ContexteRecherche - Contexte de la recherche.
+        :param ply: Distance du nœud à la racine.
+        :param standPat: Évaluation de la position déjà calculée (par l'évaluation groupée des enfants), ou None.
+        :return: Score du point de vue du joueur au trait. """
+
+    etape1 = etat.enMain[joueur] > 0
+    if ply > 0 and not etape1:
+        if contexte.finales is not None:
+            valeur = contexte.finales.sonder(etat.pions[joueur], etat.pions[1 - joueur], ply)
+            if valeur is not None:
+                return valeur
+        if etat.nombres[0] < 3 or etat.nombres[1] < 3:
+            return etat.evaluer(contexte.heuristique, etape1, joueur)
+
+    meilleureValeur = etat.evaluer(contexte.heuristique, etape1, joueur) if standPat is None else standPat  # Stand-pat
+    if meilleureValeur >= beta or contexte.prisesRestantes <= 0:
+        return meilleureValeur
+    alpha = max(alpha, meilleureValeur)
+
+    stats = contexte.statistiques
+    if stats is None:
+        prises = coupsPrises(etat.pions, joueur, etape1)
+    else:
+        debut = time.perf_counter()
+        prises = coupsPrises(etat.pions, joueur, etape1)
+        stats.tempsGeneration += time.perf_counter() - debut
+    for coup in prises:
+        if contexte.prisesRestantes <= 0:
+            break
+        contexte.prisesRestantes -= 1
+        contexte.noeuds += 1
+        if stats is not None:
+            stats.noeudsQuiescence += 1
+        etat.appliquer(coup, joueur)
+        evalCourante = -rechercheQuiescence(etat, 1 - joueur, -beta, -alpha, contexte, ply + 1)
+        etat.annuler(coup, joueur)
+        if evalCourante > meilleureValeur:
+            meilleureValeur = evalCourante
+            alpha = max(alpha, meilleureValeur)
+            if alpha >= beta:
+                break
+    return meilleureValeur
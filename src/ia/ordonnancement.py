@@ -0,0 +1,83 @@
+""" Ordonnancement des coups pour minimax. L'élagage alpha-bêta coupe d'autant plus tôt que les meilleurs coups sont
+    explorés en premier ; les coups d'un nœud sont donc triés par priorité décroissante :
+        - le meilleur coup mémorisé dans la table de transposition (ou trouvé à l'itération précédente) ;
+        - les coups formant un moulin, c'est-à-dire ceux qui retirent un pion adverse ;
+        - les deux coups « killer » du niveau, qui ont provoqué une coupure dans un nœud frère ;
+        - les autres coups, selon l'historique des coupures du déplacement (départ, arrivée).
+    Une graine permet de bruiter l'historique initial, pour que les processus de la recherche parallèle explorent
+    l'arbre dans des ordres différents. """
+
+import random
+
+PLY_MAX = 128  # Nombre maximal de niveaux suivis pour les coups killer
+
+PRIORITE_TABLE = 1 << 40
+PRIORITE_CAPTURE = 1 << 38
+PRIORITE_KILLER = 1 << 36
+
+
+def indiceHistorique(coup):
+    """ Donne l'indice d'un coup dans la table d'historique, qui ne dépend que du départ et de l'arrivée.
+        :param coup: Coup - Le coup considéré.
+        :return: int - Indice compris entre 0 et 25 * 24 - 1 (un départ None compte comme la position 24). """
+
+    return (24 if coup.depart is None else coup.depart) * 24 + coup.arrivee
+
+
+class OrdonnancementCoups:
+    """ Mémorise les coups killer par niveau et l'historique des coupures, et trie les coups d'un nœud. """
+
+    def __init__(self, graine=None):
+        """ :param graine: int ou None - Si fournie, l'historique initial reçoit de petites valeurs aléatoires. """
+
+        self.killers = [[None, None] for _ in range(PLY_MAX)]  # Deux coups killer par niveau
+        self.historique = [0] * (25 * 24)  # Score de coupure de chaque déplacement (départ, arrivée)
+        if graine is not None:
+            generateur = random.Random(graine)
+            self.historique = [generateur.randint(0, 8) for _ in range(25 * 24)]
+
+    def ordonner(self, coups, ply, coupTable=None):
+        """ Trie sur place les coups d'un nœud, du plus prometteur au moins prometteur. Le tri est stable : à priorité
+        égale, l'ordre de génération est conservé.
+            :param coups: list - Coups du nœud.
+            :param ply: int - Niveau du nœud (0 pour la racine).
+            :param coupTable: Coup ou None - Meilleur coup connu pour cette position. """
+
+        killer1, killer2 = self.killers[ply] if ply < PLY_MAX else (None, None)
+        historique = self.historique
+
+        def priorite(coup):
+            if coup == coupTable:
+                return PRIORITE_TABLE
+            valeur = historique[indiceHistorique(coup)]
+            if coup.capture is not None:
+                return PRIORITE_CAPTURE + valeur
+            if coup == killer1:
+                return PRIORITE_KILLER + 1
+            if coup == killer2:
+                return PRIORITE_KILLER
+            return valeur
+
+        coups.sort(key=priorite, reverse=True)
+
+    def enregistrerCoupure(self, coup, ply, profondeur):
+        """ Enregistre un coup ayant provoqué une coupure bêta.
+            :param coup: Coup - Le coup responsable de la coupure.
+            :param ply: int - Niveau du nœud.
+            :param profondeur: int - Profondeur restante du nœud (les coupures proches de la racine pèsent plus). """
+
+        self.historique[indiceHistorique(coup)] += profondeur * profondeur
+        if coup.capture is None and ply < PLY_MAX:  # Les captures sont déjà explorées en priorité
+            killers = self.killers[ply]
+            if killers[0] != coup:
+                killers[1] = killers[0]
+                killers[0] = coup
+
+    def vieillir(self, decalage=2):
+        """ Prépare l'ordonnancement à la recherche suivante d'une même partie : l'historique est divisé par deux, pour
+        que les coupures récentes pèsent davantage, et les coups killer sont décalés, la racine de la nouvelle
+        recherche se trouvant « decalage » niveaux plus bas que celle de la précédente.
+            :param decalage: int - Nombre de demi-coups joués depuis la recherche précédente. """
+
+        self.historique = [valeur >> 1 for valeur in self.historique]
+        self.killers = self.killers[decalage:] + [[None, None] for _ in range(min(decalage, PLY_MAX))]
@@ -0,0 +1,228 @@
+""" Livre d'ouvertures pour la phase de placement : les positions des premiers placements reviennent à chaque partie,
+    et chacune déclenchait une nouvelle recherche. Ces positions sont cherchées une fois pour toutes hors ligne, en
+    profondeur, et le livre associe à chacune son score et ses meilleurs coups. Tant que la position est dans le livre,
+    l'IA y lit son coup au lieu de chercher.
+
+    Deux positions symétriques (symetries.py) ont le même score et des meilleurs coups symétriques : le livre ne
+    contient qu'une position par classe de symétrie, sa forme canonique.
+
+    Format du fichier : un en-tête (heuristique, profondeur de recherche, nombre de demi-coups couverts), puis un
+    enregistrement de 14 octets par meilleur coup (clé canonique de la position, score, arrivée, pion retiré).
+    Le livre est construit par :
+        python3 -m src.ia.ouvertures [--niveau 3] [--profondeur 6] [--plies 4] [--fichier chemin] """
+
+import os
+import random
+import struct
+import sys
+import time
+
+from src.ia.bitboard import *
+from src.ia.etat import mainsPlacement
+from src.ia.heuristiques import heuristiqueNaive, heuristiqueAvancee, heuristiqueExperte, versionBitboard
+from src.ia.minimax import ContexteRecherche, creerEtat, evaluationDuCoup, negamax, NOEUDS_QUIESCENCE
+from src.ia.ordonnancement import OrdonnancementCoups
+from src.ia.symetries import cleCanonique, coupOriginal, formeCanonique
+from src.ia.transposition import TableTransposition
+from src.ia.utils import extraireOption
+from src.ia.vectorisation import versionGroupee
+
+FICHIER_LIVRE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ouvertures.bin')
+HEURISTIQUES = {'1': heuristiqueNaive, '2': heuristiqueAvancee, '3': heuristiqueExperte}
+
+FORMAT_ENTETE = struct.Struct('<4sBBB32s')  # Signature, version, profondeur, demi-coups, nom de l'heuristique
+FORMAT_ENTREE = struct.Struct('<QiBB')      # Clé canonique, score, arrivée, pion retiré
+SIGNATURE = b'LIVR'
+VERSION = 1
+AUCUNE_POSITION = 255  # Valeur du pion retiré quand le coup ne forme pas de moulin
+
+
+class LivreOuvertures:
+    """ Livre chargé en mémoire : clé canonique -> (score, meilleurs coups dans le repère canonique). """
+
+    def __init__(self, heuristique, profondeur, plies, entrees):
+        """ :param heuristique: str - Nom de l'heuristique avec laquelle le livre a été cherché.
+            :param profondeur: int - Profondeur de recherche de chaque position.
+            :param plies: int - Nombre de demi-coups de placement couverts.
+            :param entrees: dict - Clé canonique -> (score du point de vue du joueur au trait, liste de Coup). """
+
+        self.heuristique = heuristique
+        self.profondeur = profondeur
+        self.plies = plies
+        self.entrees = entrees
+
+    def consulter(self, b1, b2, joueur):
+        """ Cherche une position dans le livre. Entre plusieurs meilleurs coups de même score, le coup est tiré au
+        hasard, ce qui varie les parties entre IA sans les affaiblir.
+            :param b1: int - Bitboard du joueur '1'.
+            :param b2: int - Bitboard du joueur '2'.
+            :param joueur: int - Indice du joueur au trait.
+            :return: tuple - (score du point de vue du joueur au trait, Coup sur le plateau donné), ou None. """
+
+        cle, indice = cleCanonique(b1, b2, joueur)
+        entree = self.entrees.get(cle)
+        if entree is None:
+            return None
+        score, coups = entree
+        return score, coupOriginal(random.choice(coups), indice)
+
+    def enregistrer(self, chemin):
+        """ Écrit le livre dans un fichier (remplacé d'un seul coup, pour qu'un fichier présent soit toujours complet).
+            :param chemin: str - Chemin du fichier. """
+
+        with open(chemin + '.tmp', 'wb') as fichier:
+            fichier.write(FORMAT_ENTETE.pack(SIGNATURE, VERSION, self.profondeur, self.plies,
+                                             self.heuristique.encode()))
+            for cle in sorted(self.entrees):
+                score, coups = self.entrees[cle]
+                for coup in coups:
+                    capture = AUCUNE_POSITION if coup.capture is None else coup.capture
+                    fichier.write(FORMAT_ENTREE.pack(cle, score, coup.arrivee, capture))
+        os.replace(chemin + '.tmp', chemin)
+
+    @classmethod
+    def lire(cls, chemin):
+        """ Lit un livre écrit par enregistrer.
+            :param chemin: str - Chemin du fichier.
+            :return: LivreOuvertures - Le livre. """
+
+        with open(chemin, 'rb') as fichier:
+            donnees = fichier.read()
+        signature, version, profondeur, plies, nom = FORMAT_ENTETE.unpack_from(donnees)
+        if signature != SIGNATURE or version != VERSION:
+            raise ValueError(f"{chemin} n'est pas un livre d'ouvertures")
+        entrees = {}
+        for cle, score, arrivee, capture in FORMAT_ENTREE.iter_unpack(donnees[FORMAT_ENTETE.size:]):
+            coup = Coup(None, arrivee, None if capture == AUCUNE_POSITION else capture)
+            entrees.setdefault(cle, (score, []))[1].append(coup)
+        return cls(nom.rstrip(b'\0').decode(), profondeur, plies, entrees)
+
+
+_livres = {}
+
+
+def chargerLivre(chemin=FICHIER_LIVRE):
+    """ Donne le livre d'ouvertures du fichier, lu une seule fois par processus.
+        :param chemin: str - Chemin du fichier.
+        :return: LivreOuvertures, ou None si le fichier n'existe pas. """
+
+    if chemin not in _livres:
+        _livres[chemin] = LivreOuvertures.lire(chemin) if os.path.exists(chemin) else None
+    return _livres[chemin]
+
+
+def coupOuverture(plateau, maximisant, phase1, heuristique):
+    """ Joue le coup du livre si la position y figure, à la place d'une recherche. Le livre n'est utilisé que par une
+    IA ayant la même heuristique que celle avec laquelle il a été construit.
+        :param plateau: Liste représentant l'état actuel du plateau.
+        :param maximisant: Booléen indiquant si le joueur '1' est au trait.
+        :param phase1: Booléen indiquant si l'on est en phase de placement.
+        :param heuristique: Fonction heuristique de l'IA.
+        :return: Un objet Evaluer (comme minimax), ou None si la position n'est pas dans le livre. """
+
+    livre = chargerLivre() if phase1 else None
+    if livre is None or livre.heuristique != heuristique.__name__:
+        return None
+    b1, b2 = versBitboard(plateau)
+    trouve = livre.consulter(b1, b2, 0 if maximisant else 1)
+    if trouve is None:
+        return None
+    score, coup = trouve
+    return evaluationDuCoup(plateau, maximisant, score if maximisant else -score, coup, livre.profondeur)
+
+
+def positionsDuLivre(plies):
+    """ Énumère les positions canoniques des premiers demi-coups de placement, le joueur '1' plaçant le premier comme
+    dans tous les modes de jeu. Une position atteinte à plusieurs demi-coups (des prises ayant retiré des pions) est
+    retenue au premier d'entre eux.
+        :param plies: int - Nombre de demi-coups couverts.
+        :return: dict - Clé canonique -> (b1, b2, joueur au trait, demi-coup) de la forme canonique. """
+
+    positionsConnues = {}
+    niveau = {0: (0, 0, 0, 0)}
+    for ply in range(plies):
+        positionsConnues.update(niveau)
+        suivant = {}
+        for b1, b2, joueur, _ in niveau.values():
+            pions = [b1, b2]
+            for coup in coupsPossibles(pions, joueur, True):
+                enfant = pions[:]
+                enfant[joueur] |= BITS[coup.arrivee]
+                if coup.capture is not None:
+                    enfant[1 - joueur] ^= BITS[coup.capture]
+                c1, c2, _ = formeCanonique(enfant[0], enfant[1])
+                cle = c1 | c2 << 24 | (1 - joueur) << 48
+                if cle not in positionsConnues and cle not in suivant:
+                    suivant[cle] = (c1, c2, 1 - joueur, ply + 1)
+        niveau = suivant
+    return positionsConnues
+
+
+def meilleursCoups(b1, b2, joueur, heuristique, profondeur, ply):
+    """ Cherche une position et donne tous ses coups de score maximal : le meilleur score est d'abord établi, puis
+    chaque autre coup est vérifié par une recherche à fenêtre nulle autour de ce score. Comme en partie, la recherche
+    passe à la phase de déplacement après le dernier placement.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :param joueur: int - Indice du joueur au trait.
+        :param heuristique: Fonction heuristique (sur liste).
+        :param profondeur: int - Profondeur de recherche.
+        :param ply: int - Nombre de pions déjà placés par les deux joueurs (voir mainsPlacement).
+        :return: tuple - (score du point de vue du joueur au trait, liste des meilleurs coups). """
+
+    etat = creerEtat(versListe(b1, b2), joueur, heuristique, mainsPlacement(ply))
+    contexte = ContexteRecherche(versionBitboard(heuristique), TableTransposition(),
+                                 ordonnancement=OrdonnancementCoups(), groupee=versionGroupee(heuristique),
+                                 quiescence=NOEUDS_QUIESCENCE, pvs=True)
+    valeur, meilleurCoup = negamax(etat, profondeur, joueur, float('-inf'), float('inf'), contexte)
+    valeur = int(valeur)
+    coups = [meilleurCoup]
+    for coup in coupsPossibles(etat.pions, joueur, True):
+        if coup == meilleurCoup:
+            continue
+        etat.appliquer(coup, joueur)
+        scoreEnfant, _ = negamax(etat, profondeur - 1, 1 - joueur, -valeur, -valeur + 1, contexte, 1)
+        etat.annuler(coup, joueur)
+        if scoreEnfant <= -valeur:  # Le coup atteint lui aussi le meilleur score
+            coups.append(coup)
+    return valeur, coups
+
+
+def construireLivre(heuristique=heuristiqueExperte, profondeur=6, plies=4, chemin=FICHIER_LIVRE, journal=print):
+    """ Construit le livre : chaque position canonique des premiers demi-coups est cherchée à la profondeur donnée.
+        :param heuristique: Fonction heuristique (sur liste) de l'IA qui utilisera le livre.
+        :param profondeur: int - Profondeur de recherche de chaque position.
+        :param plies: int - Nombre de demi-coups de placement couverts (au plus 18).
+        :param chemin: str - Chemin du fichier écrit.
+        :param journal: Fonction d'affichage de la progression, ou None.
+        :return: LivreOuvertures - Le livre construit. """
+
+    if not 1 <= plies <= 18 or profondeur < 1:
+        raise ValueError("le livre couvre de 1 à 18 demi-coups, cherchés à une profondeur positive")
+    positionsLivre = positionsDuLivre(plies)
+    debut = time.perf_counter()
+    entrees = {}
+    for numero, (cle, (b1, b2, joueur, ply)) in enumerate(sorted(positionsLivre.items()), 1):
+        entrees[cle] = meilleursCoups(b1, b2, joueur, heuristique, profondeur, ply)
+        if journal and (numero % 50 == 0 or numero == len(positionsLivre)):
+            journal(f"{numero}/{len(positionsLivre)} positions cherchées ({time.perf_counter() - debut:.0f} s)")
+    livre = LivreOuvertures(heuristique.__name__, profondeur, plies, entrees)
+    livre.enregistrer(chemin)
+    _livres.pop(chemin, None)
+    return livre
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    try:
+        niveauDonne = extraireOption(arguments, "niveau", str) or '3'
+        profondeurDonnee = extraireOption(arguments, "profondeur", int) or 6
+        pliesDonnes = extraireOption(arguments, "plies", int) or 4
+        fichierDonne = extraireOption(arguments, "fichier", str) or FICHIER_LIVRE
+        if arguments or niveauDonne not in HEURISTIQUES:
+            raise ValueError("arguments invalides")
+        construireLivre(HEURISTIQUES[niveauDonne], profondeurDonnee, pliesDonnes, fichierDonne)
+    except ValueError as erreur:
+        print(f"\033[91mErreur : {erreur}.\033[0m")
+        print("Utilisation : python3 -m src.ia.ouvertures [--niveau 3] [--profondeur 6] [--plies 4] [--fichier chemin]")
+        sys.exit(1)
@@ -0,0 +1,134 @@
+""" Recherche parallèle de type « Lazy SMP ». Le verrou global de Python empêche plusieurs threads de chercher en même
+    temps : la recherche est donc répartie sur plusieurs processus, qui cherchent tous la même position racine.
+    Ils ne se partagent pas l'arbre ; ils partagent la table de transposition, placée dans un segment de mémoire
+    partagée (multiprocessing.shared_memory), de sorte que chacun profite des sous-arbres déjà explorés par les autres.
+
+    Pour que les processus ne refassent pas exactement le même travail, chaque processus auxiliaire bruite son
+    ordonnancement des coups, et un sur deux cherche avec une profondeur de plus. Chaque profondeur terminée est
+    transmise au processus principal, qui retient le résultat le plus profond. """
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+from src.ia.finales import chargerFinales
+from src.ia.etat import mainsSelonPhase
+from src.ia.heuristiques import versionBitboard
+from src.ia.minimax import ContexteRecherche, approfondir, creerEtat, evaluationDuCoup, PROFONDEUR_MAX, \
+    NOEUDS_QUIESCENCE
+from src.ia.ordonnancement import OrdonnancementCoups
+from src.ia.transposition import TableTransposition, MEMOIRE_DEFAUT, FORMAT_ENTREE
+from src.ia.vectorisation import versionGroupee
+
+
+def travailleur(indice, nomMemoire, plateau, joueur, enMain, heuristique, profondeurs, temps, arret, resultats):
+    """ Corps d'un processus de la recherche parallèle : approfondissement itératif sur la table partagée.
+        :param indice: Numéro du processus (0 pour le processus de référence, qui n'est pas bruité).
+        :param nomMemoire: Nom du segment de mémoire partagée contenant la table de transposition.
+        :param plateau: Liste représentant l'état du plateau à la racine.
+        :param joueur: Indice du joueur au trait (0 ou 1).
+        :param enMain: Tuple des pions restant à placer à chaque joueur (voir mainsSelonPhase).
+        :param heuristique: Fonction heuristique (sur liste) utilisée.
+        :param profondeurs: Profondeurs à chercher successivement.
+        :param temps: Budget de temps en secondes, ou None.
+        :param arret: multiprocessing.Event signalant la fin de la recherche.
+        :param resultats: multiprocessing.Queue recevant (indice, profondeur, score, coup, nœuds) pour chaque
+        profondeur terminée, puis (indice, None, None, None, nœuds) à la fin. """
+
+    memoire = shared_memory.SharedMemory(name=nomMemoire)
+    noeuds = 0
+    try:
+        contexte = ContexteRecherche(versionBitboard(heuristique), TableTransposition(tampon=memoire.buf),
+                                     ordonnancement=OrdonnancementCoups(graine=indice if indice else None),
+                                     arret=arret, groupee=versionGroupee(heuristique), finales=chargerFinales(),
+                                     quiescence=NOEUDS_QUIESCENCE, pvs=True)
+        limite = None if temps is None else time.perf_counter() + temps
+        etat = creerEtat(plateau, joueur, heuristique, enMain)
+        for profondeur, valeur, coup in approfondir(etat, joueur, contexte, profondeurs, limite,
+                                                    premiereComplete=(indice == 0)):
+            resultats.put((indice, profondeur, valeur, coup, contexte.noeuds))
+        noeuds = contexte.noeuds
+        del contexte  # Libère la vue sur la mémoire partagée avant de la fermer
+    finally:
+        resultats.put((indice, None, None, None, noeuds))
+        memoire.close()
+
+
+def minimaxParallele(plateau, maximisant, etape1, heuristique, workers, profondeur=None, temps=None,
+                     profondeurMax=PROFONDEUR_MAX, memoire=MEMOIRE_DEFAUT, enMain=None):
+    """ Cherche le meilleur coup avec plusieurs processus partageant une table de transposition. Avec une profondeur
+    fixe, la recherche s'arrête dès que le processus de référence l'a atteinte ; avec un budget de temps, elle
+    s'arrête à l'échéance. Dans les deux cas, le résultat retenu est celui de la plus grande profondeur terminée.
+        :param plateau: Liste représentant l'état actuel du plateau.
+        :param maximisant: Booléen indiquant si l'on maximise (True) ou minimise (False) la valeur d'évaluation.
+        :param etape1: Booléen indiquant si l'on est à l'étape 1 du jeu.
+        :param heuristique: Fonction heuristique utilisée (doit pouvoir être transmise à un autre processus).
+        :param workers: Nombre de processus de recherche.
+        :param profondeur: Profondeur de recherche fixe, ou None si un budget de temps est donné.
+        :param temps: Budget de temps en secondes, ou None pour une profondeur fixe.
+        :param profondeurMax: Profondeur maximale lorsque la recherche est limitée par le temps.
+        :param memoire: Taille de la table de transposition partagée, en octets.
+        :param enMain: Tuple des pions restant à placer à chaque joueur, ou None (voir minimax).
+        :return: Un objet Evaluer contenant la meilleure configuration du plateau et son score d'évaluation. """
+
+    joueur = 0 if maximisant else 1
+    contexteMp = multiprocessing.get_context()
+    taille = max(1, memoire // FORMAT_ENTREE.size) * FORMAT_ENTREE.size
+    memoirePartagee = shared_memory.SharedMemory(create=True, size=taille)
+    TableTransposition(tampon=memoirePartagee.buf).vider()
+    arret = contexteMp.Event()
+    resultats = contexteMp.Queue()
+    processus = []
+    meilleur = None  # (profondeur, score, coup)
+    noeuds = {}
+
+    try:
+        for indice in range(workers):
+            decalage = indice % 2  # Un processus auxiliaire sur deux cherche une profondeur plus loin
+            if temps is None:
+                profondeurs = range(1 + decalage, profondeur + 1 + decalage)
+            else:
+                profondeurs = range(1 + decalage, profondeurMax + 1)
+            p = contexteMp.Process(target=travailleur, daemon=True,
+                                   args=(indice, memoirePartagee.name, plateau, joueur, mainsSelonPhase(etape1, enMain),
+                                         heuristique,
+                                         profondeurs, temps, arret, resultats))
+            p.start()
+            processus.append(p)
+
+        limite = None if temps is None else time.perf_counter() + temps
+        actifs = workers
+        while actifs:
+            # On attend sans limite tant qu'aucun coup n'est connu, sinon jusqu'à l'échéance
+            attente = None if limite is None or meilleur is None else max(0.0, limite - time.perf_counter())
+            try:
+                indice, profondeurTerminee, valeur, coup, noeuds[indice] = resultats.get(timeout=attente)
+            except queue.Empty:
+                break
+            if profondeurTerminee is None:  # Fin d'un processus
+                actifs -= 1
+                if indice == 0 and temps is None:
+                    break
+            elif meilleur is None or profondeurTerminee > meilleur[0]:
+                meilleur = (profondeurTerminee, valeur, coup)
+
+    finally:
+        arret.set()
+        fin = time.perf_counter() + 2.0
+        while any(p.is_alive() for p in processus) and time.perf_counter() < fin:
+            try:  # La file est vidée pour que les processus puissent se terminer
+                message = resultats.get(timeout=0.05)
+                noeuds[message[0]] = message[4]
+            except queue.Empty:
+                pass
+        for p in processus:
+            if p.is_alive():
+                p.terminate()
+            p.join()
+        memoirePartagee.close()
+        memoirePartagee.unlink()
+
+    profondeurAtteinte, valeur, coup = meilleur if meilleur is not None else (0, 0, None)
+    return evaluationDuCoup(plateau, maximisant, valeur if maximisant else -valeur, coup, profondeurAtteinte,
+                            sum(noeuds.values()))
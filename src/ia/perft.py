@@ -0,0 +1,217 @@
+""" Compteur perft et référence de non-régression du moteur. perft(position, profondeur) compte les positions atteintes
+    après exactement « profondeur » demi-coups, ainsi que, parmi les coups du dernier demi-coup, les prises et les
+    moulins formés (un moulin comptant une fois, quel que soit le nombre de pions qu'il permet de retirer). Le
+    comptage est fait deux fois, avec les deux générateurs du projet : celui de utils.py sur des listes
+    (mouvementsPossiblesEtape1/2/3 et retirerPiece) et celui de bitboard.py, joué et défait sur un EtatJeu comme
+    pendant la recherche. Les deux doivent donner les mêmes nombres, et le second sert aussi de mesure brute de la
+    vitesse de génération.
+
+    Comme pendant la recherche, la phase de la position ne change pas au cours du comptage, et une position de
+    déplacement où un joueur a moins de 3 pions est une fin de partie, sans coup.
+
+    Le fichier de référence (perft.json) enregistre les comptages des positions du banc d'essai (benchmark.py), et le
+    score et le coup choisis par minimax pour chaque heuristique. Toute nouvelle version du moteur (générateur,
+    représentation, ordonnancement) doit le retrouver à l'identique :
+        python3 -m src.ia.perft [--profondeur 4] [--liste]   : comptages et vitesse
+        python3 -m src.ia.perft --verifier [--fichier chemin] : comparaison au fichier de référence (code 1 si écart)
+        python3 -m src.ia.perft --generer [--fichier chemin]  : réécriture du fichier de référence """
+
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+
+from src.ia.benchmark import HEURISTIQUES, POSITIONS
+from src.ia.bitboard import coupsPossibles
+from src.ia.etat import EtatJeu, mainsSelonPhase
+from src.ia.minimax import minimax
+from src.ia.utils import mouvementsPossiblesEtape1, mouvementsPossiblesEtape2ou3, nombrePion, extraireOption, \
+    extraireDrapeau
+
+FICHIER_REFERENCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perft.json')
+PROFONDEUR_PERFT = 4  # Profondeur maximale des comptages de référence
+PROFONDEUR_RECHERCHE = 3  # Profondeur des recherches de référence
+
+ResultatPerft = namedtuple('ResultatPerft', ['feuilles', 'prises', 'moulins'])
+
+
+def perft(etat, joueur, etape1, profondeur):
+    """ Compte les positions atteintes avec le générateur sur bitboards (coups joués puis défaits sur l'état).
+        :param etat: EtatJeu - État de la position, identique en sortie à celui reçu en entrée.
+        :param joueur: int - Indice du joueur au trait (0 ou 1).
+        :param etape1: bool - True pendant la phase de placement.
+        :param profondeur: int - Nombre de demi-coups.
+        :return: ResultatPerft - Positions atteintes, prises et moulins formés au dernier demi-coup. """
+
+    if profondeur == 0:
+        return ResultatPerft(1, 0, 0)
+    if not etape1 and (etat.nombres[0] < 3 or etat.nombres[1] < 3):
+        return ResultatPerft(0, 0, 0)
+    coups = coupsPossibles(etat.pions, joueur, etape1)
+    if profondeur == 1:  # Les feuilles sont comptées sans être jouées
+        prises = [coup for coup in coups if coup.capture is not None]
+        return ResultatPerft(len(coups), len(prises), len({(coup.depart, coup.arrivee) for coup in prises}))
+    feuilles = prises = moulins = 0
+    for coup in coups:
+        etat.appliquer(coup, joueur)
+        resultat = perft(etat, 1 - joueur, etape1, profondeur - 1)
+        etat.annuler(coup, joueur)
+        feuilles += resultat.feuilles
+        prises += resultat.prises
+        moulins += resultat.moulins
+    return ResultatPerft(feuilles, prises, moulins)
+
+
+def inverser(plateau):
+    """ Échange les pions des deux joueurs, pour faire placer le joueur '2' par mouvementsPossiblesEtape1.
+        :param plateau: list - Liste représentant l'état du plateau.
+        :return: list - Le plateau inversé. """
+
+    return ['2' if case == '1' else '1' if case == '2' else case for case in plateau]
+
+
+def perftListe(plateau, joueur, etape1, profondeur):
+    """ Compte les positions atteintes avec le générateur sur listes de utils.py. Ce générateur ne donnant que les
+    plateaux obtenus, une prise se reconnaît au pion adverse disparu, et deux prises issues du même moulin au fait
+    qu'elles laissent les pions du joueur aux mêmes positions.
+        :param plateau: list - Liste représentant l'état du plateau.
+        :param joueur: str - Joueur au trait ('1' ou '2').
+        :param etape1: bool - True pendant la phase de placement.
+        :param profondeur: int - Nombre de demi-coups.
+        :return: ResultatPerft - Positions atteintes, prises et moulins formés au dernier demi-coup. """
+
+    if profondeur == 0:
+        return ResultatPerft(1, 0, 0)
+    if not etape1 and (nombrePion(plateau, '1') < 3 or nombrePion(plateau, '2') < 3):
+        return ResultatPerft(0, 0, 0)
+    adversaire = '2' if joueur == '1' else '1'
+    if not etape1:
+        plateaux = mouvementsPossiblesEtape2ou3(plateau, joueur)
+    elif joueur == '1':
+        plateaux = mouvementsPossiblesEtape1(plateau)
+    else:
+        plateaux = [inverser(enfant) for enfant in mouvementsPossiblesEtape1(inverser(plateau))]
+    if profondeur == 1:
+        pionsAdverses = nombrePion(plateau, adversaire)
+        prises = [enfant for enfant in plateaux if nombrePion(enfant, adversaire) < pionsAdverses]
+        moulins = {tuple(i for i, case in enumerate(enfant) if case == joueur) for enfant in prises}
+        return ResultatPerft(len(plateaux), len(prises), len(moulins))
+    feuilles = prises = moulins = 0
+    for enfant in plateaux:
+        resultat = perftListe(enfant, adversaire, etape1, profondeur - 1)
+        feuilles += resultat.feuilles
+        prises += resultat.prises
+        moulins += resultat.moulins
+    return ResultatPerft(feuilles, prises, moulins)
+
+
+def perftPosition(plateau, joueur, etape1, profondeur, liste=False):
+    """ Compte les positions atteintes depuis un plateau, avec l'un ou l'autre des générateurs.
+        :param plateau: str ou list - Plateau de 24 cases ('x', '1' ou '2').
+        :param joueur: str - Joueur au trait ('1' ou '2').
+        :param etape1: bool - True pendant la phase de placement.
+        :param profondeur: int - Nombre de demi-coups.
+        :param liste: bool - True pour le générateur sur listes de utils.py, False pour celui sur bitboards.
+        :return: ResultatPerft - Le comptage. """
+
+    if liste:
+        return perftListe(list(plateau), joueur, etape1, profondeur)
+    indice = 0 if joueur == '1' else 1
+    return perft(EtatJeu.depuisListe(list(plateau), indice, mainsSelonPhase(etape1)), indice, etape1, profondeur)
+
+
+def rechercheReference(plateau, joueur, etape1, heuristique, profondeur=PROFONDEUR_RECHERCHE):
+    """ Recherche de référence : minimax à profondeur fixe, sans quiescence (dont le résultat dépend de l'ordre des
+    coups) ni bases de finales (dont le résultat dépend des fichiers générés).
+        :param plateau: str - Plateau de 24 cases.
+        :param joueur: str - Joueur au trait ('1' ou '2').
+        :param etape1: bool - True pendant la phase de placement.
+        :param heuristique: Fonction heuristique (sur liste).
+        :param profondeur: int - Profondeur de recherche.
+        :return: dict - Score et plateau obtenu après le coup choisi. """
+
+    evaluation = minimax(list(plateau), profondeur, joueur == '1', float('-inf'), float('inf'), etape1, heuristique,
+                         quiescence=None, finales=False)
+    return {'score': evaluation.evaluer, 'plateau': "".join(evaluation.plateau)}
+
+
+def genererReference():
+    """ Calcule le contenu du fichier de référence avec le moteur actuel.
+        :return: dict - Comptages perft (position -> profondeur -> [feuilles, prises, moulins]) et recherches de
+        référence (position -> heuristique -> score et plateau). """
+
+    reference = {'perft': {}, 'recherche': {}, 'profondeurRecherche': PROFONDEUR_RECHERCHE}
+    for nom, plateau, etape1, joueur in POSITIONS:
+        reference['perft'][nom] = {str(profondeur): list(perftPosition(plateau, joueur, etape1, profondeur))
+                                   for profondeur in range(1, PROFONDEUR_PERFT + 1)}
+        reference['recherche'][nom] = {heuristique.__name__: rechercheReference(plateau, joueur, etape1, heuristique)
+                                       for heuristique in HEURISTIQUES.values()}
+    return reference
+
+
+def verifierReference(reference, liste=True):
+    """ Compare le moteur actuel au fichier de référence.
+        :param reference: dict - Contenu du fichier de référence.
+        :param liste: bool - Vérifie aussi les comptages du générateur sur listes (plus lent).
+        :return: list - Écarts trouvés, sous forme de textes (vide si le moteur est conforme). """
+
+    positions = {nom: (plateau, etape1, joueur) for nom, plateau, etape1, joueur in POSITIONS}
+    ecarts = []
+    for nom, comptages in reference['perft'].items():
+        plateau, etape1, joueur = positions[nom]
+        for profondeur, attendu in comptages.items():
+            for generateur in (False, True) if liste else (False,):
+                obtenu = list(perftPosition(plateau, joueur, etape1, int(profondeur), generateur))
+                if obtenu != attendu:
+                    ecarts.append(f"perft {nom} profondeur {profondeur} ({'listes' if generateur else 'bitboards'}) "
+                                  f": {attendu} attendu, {obtenu} obtenu")
+    for nom, recherches in reference['recherche'].items():
+        plateau, etape1, joueur = positions[nom]
+        for heuristique in HEURISTIQUES.values():
+            attendu = recherches[heuristique.__name__]
+            obtenu = rechercheReference(plateau, joueur, etape1, heuristique, reference['profondeurRecherche'])
+            if obtenu != attendu:
+                ecarts.append(f"recherche {nom} ({heuristique.__name__}) : {attendu} attendu, {obtenu} obtenu")
+    return ecarts
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    try:
+        fichierDonne = extraireOption(arguments, "fichier", str) or FICHIER_REFERENCE
+        profondeurDonnee = extraireOption(arguments, "profondeur", int)
+        generer = extraireDrapeau(arguments, "generer")
+        verifier = extraireDrapeau(arguments, "verifier")
+        avecListes = extraireDrapeau(arguments, "liste")
+        if arguments or (generer and verifier) or (profondeurDonnee is not None and profondeurDonnee < 0):
+            raise ValueError("arguments invalides")
+        if verifier:
+            with open(fichierDonne) as fichierReference:
+                referenceLue = json.load(fichierReference)
+    except (ValueError, OSError) as erreur:
+        print(f"\033[91mErreur : {erreur}.\033[0m")
+        print("Utilisation : python3 -m src.ia.perft [--profondeur 4] [--liste] | --verifier [--fichier chemin] "
+              "| --generer [--fichier chemin]")
+        sys.exit(1)
+
+    if generer:
+        with open(fichierDonne, 'w') as fichierReference:
+            json.dump(genererReference(), fichierReference, indent=2)
+        print(f"Référence écrite dans {fichierDonne}.")
+    elif verifier:
+        ecartsTrouves = verifierReference(referenceLue)
+        for ecart in ecartsTrouves:
+            print(f"\033[91mÉcart : {ecart}\033[0m")
+        if ecartsTrouves:
+            sys.exit(1)
+        print("Le moteur est conforme à la référence.")
+    else:
+        for nomPosition, plateauPosition, etape1Position, joueurPosition in POSITIONS:
+            profondeurPerft = PROFONDEUR_PERFT if profondeurDonnee is None else profondeurDonnee
+            debut = time.perf_counter()
+            resultatPerft = perftPosition(plateauPosition, joueurPosition, etape1Position, profondeurPerft, avecListes)
+            duree = time.perf_counter() - debut
+            print(f"{nomPosition:<20} profondeur {profondeurPerft} : {resultatPerft.feuilles} positions, "
+                  f"{resultatPerft.prises} prises, {resultatPerft.moulins} moulins "
+                  f"({duree:.3f} s, {resultatPerft.feuilles / duree if duree else 0:.0f} positions/s)")
@@ -0,0 +1,67 @@
+""" Session de recherche : ce qu'une IA conserve d'un coup à l'autre, et d'une partie à l'autre. Sans session, chaque
+    coup démarre minimax avec une table de transposition et un ordonnancement vides, alors que la position après la
+    réponse de l'adversaire est le plus souvent un sous-arbre déjà exploré au coup précédent.
+
+    La session possède la table de transposition et l'ordonnancement (historique et coups killer) d'une IA. Avant
+    chaque coup, nouveauCoup les fait vieillir au lieu de les effacer : la table passe à une nouvelle génération (ses
+    anciennes entrées restent lisibles mais peuvent être remplacées) et l'historique est atténué. La table peut être
+    enregistrée sur disque et rechargée, pour qu'un long tournoi ou une session d'analyse démarre avec le travail des
+    précédents.
+
+    Une session n'est valable que pour une heuristique : les scores de la table en dépendent. """
+
+import os
+
+from src.ia.ordonnancement import OrdonnancementCoups
+from src.ia.transposition import TableTransposition, MEMOIRE_DEFAUT
+
+
+def fichierSession(repertoire, heuristique):
+    """ Chemin du fichier où est enregistrée la table des sessions d'une heuristique.
+        :param repertoire: str - Répertoire des tables enregistrées.
+        :param heuristique: Fonction heuristique des sessions.
+        :return: str - Chemin du fichier. """
+
+    return os.path.join(repertoire, f"{heuristique.__name__}.tt")
+
+
+class SessionRecherche:
+    """ Table de transposition et ordonnancement des coups d'une IA, conservés entre ses recherches. """
+
+    def __init__(self, heuristique, memoire=MEMOIRE_DEFAUT, table=None, tablePartagee=False):
+        """ :param heuristique: Fonction heuristique de l'IA propriétaire de la session.
+            :param memoire: int - Taille de la table de transposition, en octets.
+            :param table: TableTransposition existante à conserver (par exemple celle de l'anticipation), ou None.
+            :param tablePartagee: Booléen indiquant si la table est celle d'une autre session, qui la fait vieillir
+            (par exemple celle de l'adversaire de même heuristique) : seul l'ordonnancement vieillit alors ici. """
+
+        self.heuristique = heuristique
+        self.table = table if table is not None else TableTransposition(memoire)
+        self.tablePartagee = tablePartagee
+        self.ordonnancement = OrdonnancementCoups()
+        self.recherches = 0  # Nombre de coups cherchés avec cette session
+
+    def nouveauCoup(self):
+        """ Fait vieillir la table et l'ordonnancement avant la recherche d'un nouveau coup. """
+
+        if self.recherches:
+            if not self.tablePartagee:
+                self.table.nouvelleGeneration()
+            self.ordonnancement.vieillir()
+        self.recherches += 1
+
+    def enregistrer(self, chemin):
+        """ Écrit la table de transposition de la session dans un fichier.
+            :param chemin: str - Chemin du fichier. """
+
+        self.table.enregistrer(chemin, self.heuristique.__name__)
+
+    def charger(self, chemin):
+        """ Recharge une table enregistrée par une session de même heuristique, si le fichier existe.
+            :param chemin: str - Chemin du fichier.
+            :return: bool - True si une table a été chargée. """
+
+        if not os.path.exists(chemin):
+            return False
+        self.table.charger(chemin, self.heuristique.__name__)
+        return True
@@ -0,0 +1,91 @@
+""" Statistiques d'une recherche, pour comprendre où passe le temps d'un coup : nœuds par profondeur, évaluations,
+    coupures, consultations de la table de transposition, facteur de branchement effectif, temps de génération des
+    coups et temps passé dans l'heuristique.
+
+    La collecte est facultative. Lorsqu'elle est demandée, l'état de la recherche est construit à partir d'une
+    sous-classe mesurant chaque évaluation (classeMesuree), et negamax met à jour les compteurs. Lorsqu'elle ne l'est
+    pas, l'état n'est pas mesuré et chaque compteur se réduit, dans negamax, à un test « stats is not None ». """
+
+import time
+
+
+class StatistiquesRecherche:
+    """ Compteurs d'une recherche, cumulés sur toutes les itérations de l'approfondissement itératif. """
+    __slots__ = ('noeudsParProfondeur', 'noeudsQuiescence', 'evaluations', 'evaluationsGroupees', 'coupures',
+                 'coupuresPremierCoup', 'sondagesTable', 'succesTable', 'tempsGeneration', 'tempsHeuristique',
+                 'profondeur', 'duree')
+
+    def __init__(self):
+        self.noeudsParProfondeur = []  # Nœuds de negamax visités à chaque distance de la racine
+        self.noeudsQuiescence = 0      # Prises examinées par la recherche de quiescence
+        self.evaluations = 0           # Appels à l'heuristique (feuilles, stand-pat, positions sans coup)
+        self.evaluationsGroupees = 0   # Évaluations faites par l'évaluation groupée des enfants (vectorisation.py)
+        self.coupures = 0              # Coupures bêta
+        self.coupuresPremierCoup = 0   # Coupures bêta provoquées par le premier coup essayé
+        self.sondagesTable = 0         # Consultations de la table de transposition
+        self.succesTable = 0           # Consultations ayant trouvé la position
+        self.tempsGeneration = 0.0     # Secondes passées à générer les coups
+        self.tempsHeuristique = 0.0    # Secondes passées dans l'heuristique
+        self.profondeur = 0            # Profondeur de la dernière recherche complète
+        self.duree = 0.0               # Durée totale de la recherche, en secondes
+
+    def compterNoeud(self, ply):
+        """ Compte un nœud de negamax.
+            :param ply: int - Distance du nœud à la racine. """
+
+        if ply == len(self.noeudsParProfondeur):
+            self.noeudsParProfondeur.append(0)
+        self.noeudsParProfondeur[ply] += 1
+
+    def facteurBranchement(self):
+        """ Facteur de branchement effectif : le nombre b tel qu'un arbre uniforme de profondeur égale à celle de la
+        recherche et de facteur b ait autant de nœuds que ceux visités par negamax.
+            :return: float - Facteur de branchement effectif (0 si aucune recherche n'a abouti). """
+
+        noeuds = sum(self.noeudsParProfondeur)
+        if self.profondeur <= 0 or noeuds <= 1:
+            return 0.0
+        return noeuds ** (1 / self.profondeur)
+
+    def resume(self):
+        """ Résumé lisible des statistiques, affiché après chaque coup avec l'option --stats.
+            :return: str - Résumé sur plusieurs lignes. """
+
+        noeuds = sum(self.noeudsParProfondeur)
+        tauxPremierCoup = 100 * self.coupuresPremierCoup / self.coupures if self.coupures else 0
+        tauxTable = 100 * self.succesTable / self.sondagesTable if self.sondagesTable else 0
+        parProfondeur = " ".join(str(n) for n in self.noeudsParProfondeur)
+        return (f"Recherche : profondeur {self.profondeur}, {self.duree:.3f} s, {noeuds} nœuds "
+                f"(+ {self.noeudsQuiescence} en quiescence), facteur de branchement effectif "
+                f"{self.facteurBranchement():.2f}\n"
+                f"  Nœuds par profondeur : {parProfondeur}\n"
+                f"  Évaluations : {self.evaluations} dont {self.evaluationsGroupees} groupées "
+                f"({self.tempsHeuristique:.3f} s dans l'heuristique)\n"
+                f"  Génération des coups : {self.tempsGeneration:.3f} s\n"
+                f"  Coupures bêta : {self.coupures} ({tauxPremierCoup:.1f} % au premier coup)\n"
+                f"  Table de transposition : {self.sondagesTable} consultations, {tauxTable:.1f} % trouvées")
+
+
+_classesMesurees = {}
+
+
+def classeMesuree(classe):
+    """ Donne une sous-classe d'un état de recherche (EtatJeu ou EtatExperte) dont chaque évaluation est comptée et
+    chronométrée dans l'attribut statistiques.
+        :param classe: type - Classe de l'état.
+        :return: type - Sous-classe mesurant les évaluations. """
+
+    if classe not in _classesMesurees:
+        class EtatMesure(classe):
+            __slots__ = ('statistiques',)
+
+            def evaluer(self, heuristique, phase1, joueur):
+                debut = time.perf_counter()
+                valeur = super().evaluer(heuristique, phase1, joueur)
+                self.statistiques.tempsHeuristique += time.perf_counter() - debut
+                self.statistiques.evaluations += 1
+                return valeur
+
+        EtatMesure.__name__ = classe.__name__ + 'Mesure'
+        _classesMesurees[classe] = EtatMesure
+    return _classesMesurees[classe]
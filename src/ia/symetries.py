@@ -0,0 +1,104 @@
+""" Symétries du plateau. Le plateau en possède 16 : 4 rotations, une réflexion, et l'échange du carré intérieur et du
+    carré extérieur. Toutes conservent les lignes et les adjacences, donc deux positions symétriques ont la même valeur
+    et des coups symétriques. Une table indexée par position peut ne conserver qu'une position par classe de symétrie,
+    sa forme canonique (la plus petite image), et ramener ensuite les coups dans le repère du plateau réel.
+
+    Les images des bitboards sont précalculées octet par octet : appliquer une symétrie coûte 3 lectures de table par
+    bitboard, au lieu d'un parcours des pions. """
+
+from src.ia.bitboard import BITS, Coup, versBitboard, versListe
+
+# Positions de chaque carré (extérieur, milieu, intérieur), dans le sens horaire à partir du coin supérieur gauche
+CARRES = ((0, 1, 2, 14, 23, 22, 21, 9), (3, 4, 5, 13, 20, 19, 18, 10), (6, 7, 8, 12, 17, 16, 15, 11))
+
+
+def permutation(rotation, reflexion, echange):
+    """ Construit la permutation des positions correspondant à une symétrie du plateau.
+        :param rotation: int - Nombre de quarts de tour (0 à 3).
+        :param reflexion: bool - Réflexion par rapport à l'axe vertical.
+        :param echange: bool - Échange du carré intérieur et du carré extérieur.
+        :return: tuple - Image de chaque position. """
+
+    image = [0] * 24
+    for carre, positionsCarre in enumerate(CARRES):
+        for rang, position in enumerate(positionsCarre):
+            nouveauRang = ((2 - rang) if reflexion else rang) + 2 * rotation
+            image[position] = CARRES[2 - carre if echange else carre][nouveauRang % 8]
+    return tuple(image)
+
+
+# Les 16 permutations (la première est l'identité) et leurs inverses
+SYMETRIES = tuple(permutation(r, s, e) for r in range(4) for s in (False, True) for e in (False, True))
+INVERSES = tuple(tuple(sorted(range(24), key=lambda p: symetrie[p])) for symetrie in SYMETRIES)
+
+# Pour chaque symétrie et chacun des 3 octets d'un bitboard, l'image de chacune des 256 valeurs de l'octet
+IMAGES_OCTETS = tuple(tuple(tuple(sum(BITS[symetrie[8 * octet + i]] for i in range(8) if valeur >> i & 1)
+                                  for valeur in range(256)) for octet in range(3)) for symetrie in SYMETRIES)
+
+
+def transformerBits(b, indice):
+    """ Applique une symétrie à un bitboard.
+        :param b: int - Bitboard.
+        :param indice: int - Indice de la symétrie dans SYMETRIES.
+        :return: int - Bitboard image. """
+
+    t0, t1, t2 = IMAGES_OCTETS[indice]
+    return t0[b & 0xFF] | t1[b >> 8 & 0xFF] | t2[b >> 16]
+
+
+def formeCanonique(b1, b2):
+    """ Donne la forme canonique d'une position : parmi ses 16 images, celle dont la clé b1 | b2 << 24 est la plus
+    petite.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :return: tuple - (bitboard '1' canonique, bitboard '2' canonique, indice de la symétrie appliquée). """
+
+    meilleure, indice = None, 0
+    for i, (t0, t1, t2) in enumerate(IMAGES_OCTETS):
+        cle = (t0[b1 & 0xFF] | t1[b1 >> 8 & 0xFF] | t2[b1 >> 16]
+               | (t0[b2 & 0xFF] | t1[b2 >> 8 & 0xFF] | t2[b2 >> 16]) << 24)
+        if meilleure is None or cle < meilleure:
+            meilleure, indice = cle, i
+    return meilleure & 0xFFFFFF, meilleure >> 24, indice
+
+
+def cleCanonique(b1, b2, joueur=0):
+    """ Clé entière identique pour toutes les positions d'une même classe de symétrie.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :param joueur: int - Indice du joueur au trait, inclus dans la clé.
+        :return: tuple - (clé canonique, indice de la symétrie menant à la forme canonique). """
+
+    c1, c2, indice = formeCanonique(b1, b2)
+    return c1 | c2 << 24 | joueur << 48, indice
+
+
+def plateauCanonique(plateau):
+    """ Forme canonique d'un plateau sous forme de liste, utilisable comme clé de dictionnaire ou d'ensemble.
+        :param plateau: list - Liste représentant l'état du plateau.
+        :return: tuple - (tuple des 24 cases de la forme canonique, indice de la symétrie appliquée). """
+
+    c1, c2, indice = formeCanonique(*versBitboard(plateau))
+    return tuple(versListe(c1, c2)), indice
+
+
+def transformerCoup(coup, indice):
+    """ Image d'un coup par une symétrie : d'un coup du plateau réel vers le coup correspondant de sa forme canonique.
+        :param coup: Coup - Le coup (départ, arrivée, pion retiré).
+        :param indice: int - Indice de la symétrie.
+        :return: Coup - Le coup image. """
+
+    symetrie = SYMETRIES[indice]
+    return Coup(None if coup.depart is None else symetrie[coup.depart], symetrie[coup.arrivee],
+                None if coup.capture is None else symetrie[coup.capture])
+
+
+def coupOriginal(coup, indice):
+    """ Ramène un coup de la forme canonique dans le repère du plateau réel (inverse de transformerCoup).
+        :param coup: Coup - Coup sur la forme canonique.
+        :param indice: int - Indice de la symétrie ayant mené à la forme canonique.
+        :return: Coup - Le coup sur le plateau réel. """
+
+    inverse = INVERSES[indice]
+    return Coup(None if coup.depart is None else inverse[coup.depart], inverse[coup.arrivee],
+                None if coup.capture is None else inverse[coup.capture])
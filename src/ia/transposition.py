@@ -0,0 +1,147 @@
+""" Table de transposition de taille fixe pour minimax. Une même position est atteinte par de nombreux ordres de
+    coups ; la table mémorise, pour chaque clé de Zobrist, la profondeur de recherche, le type de borne, le score et le
+    meilleur coup, afin de ne pas explorer deux fois le même sous-arbre.
+
+    Les entrées sont stockées dans un tampon d'octets de taille bornée (24 octets par entrée) et la position d'une
+    entrée est donnée par la clé modulo le nombre d'entrées. En cas de collision, la politique de remplacement
+    privilégie la profondeur : une entrée n'est écrasée que par une recherche au moins aussi profonde, sauf si elle
+    date d'une génération précédente. Une table conservée d'un coup à l'autre (voir session.py) passe à une nouvelle
+    génération à chaque coup : ses anciennes entrées restent lisibles, mais cèdent leur place au lieu d'encombrer la
+    table, qui n'a jamais besoin d'être vidée. La table peut être enregistrée dans un fichier puis rechargée.
+    Le tampon peut être fourni de l'extérieur (mémoire partagée entre processus, voir parallele.py) ; la clé est alors
+    stockée combinée au reste de l'entrée, de sorte qu'une entrée à moitié écrite par un autre processus soit ignorée. """
+
+import os
+import struct
+from src.ia.bitboard import Coup
+
+# Types de borne (0 indique une case vide)
+EXACTE = 1      # Le score est la valeur exacte de la position
+INFERIEURE = 2  # Le score est une borne inférieure (coupure bêta)
+SUPERIEURE = 3  # Le score est une borne supérieure (aucun coup n'a amélioré alpha)
+
+MEMOIRE_DEFAUT = 8 * 1024 * 1024  # Taille par défaut de la table, en octets
+
+# Clé, score, profondeur, borne, départ, arrivée, pion retiré (255 pour None), génération, puis 2 octets de bourrage
+FORMAT_ENTREE = struct.Struct('<QdbBBBBBxx')
+AUCUNE_POSITION = 255
+MASQUE_64 = (1 << 64) - 1
+
+FORMAT_ENTETE = struct.Struct('<4sBI32s')  # Signature, version, nombre d'entrées, description du contenu
+SIGNATURE = b'TRAN'
+VERSION = 1
+
+
+def verification(score, profondeur, borne, depart, arrivee, capture):
+    """ Calcule le mot de contrôle d'une entrée, combiné par ou exclusif à la clé stockée. Le hachage des nombres étant
+    déterministe en Python, le mot est identique dans tous les processus.
+        :return: int - Entier de 64 bits dépendant de tous les champs de l'entrée. """
+
+    return hash((score, profondeur, borne, depart, arrivee, capture)) & MASQUE_64
+
+
+class TableTransposition:
+    """ Table de transposition bornée en mémoire, avec remplacement privilégiant la profondeur. """
+
+    def __init__(self, memoireMax=MEMOIRE_DEFAUT, tampon=None):
+        """ :param memoireMax: int - Mémoire maximale occupée par les entrées, en octets.
+            :param tampon: Tampon d'octets modifiable à utiliser (par exemple SharedMemory.buf), ou None pour en
+            allouer un ; s'il est fourni, sa taille remplace memoireMax. """
+
+        if tampon is None:
+            self.nbEntrees = max(1, memoireMax // FORMAT_ENTREE.size)
+            self.donnees = bytearray(self.nbEntrees * FORMAT_ENTREE.size)
+        else:
+            self.nbEntrees = len(tampon) // FORMAT_ENTREE.size
+            self.donnees = tampon
+        self.generation = 0  # Génération des entrées écrites, de 0 à 255
+
+    def nouvelleGeneration(self):
+        """ Passe à la génération suivante : les entrées déjà présentes pourront être remplacées par des recherches
+        moins profondes. """
+
+        self.generation = (self.generation + 1) & 0xFF
+
+    def lire(self, cle):
+        """ Cherche une position dans la table.
+            :param cle: int - Clé de Zobrist de la position.
+            :return: tuple ou None - (profondeur, borne, score, meilleur coup ou None), ou None si absente. """
+
+        cleLue, score, profondeur, borne, depart, arrivee, capture, _ = FORMAT_ENTREE.unpack_from(
+            self.donnees, (cle % self.nbEntrees) * FORMAT_ENTREE.size)
+        if borne == 0 or cleLue ^ verification(score, profondeur, borne, depart, arrivee, capture) != cle:
+            return None
+        coup = None
+        if arrivee != AUCUNE_POSITION:
+            coup = Coup(None if depart == AUCUNE_POSITION else depart, arrivee,
+                        None if capture == AUCUNE_POSITION else capture)
+        return profondeur, borne, score, coup
+
+    def ecrire(self, cle, profondeur, borne, score, coup):
+        """ Enregistre le résultat d'une recherche, sauf si la case contient une autre position cherchée plus
+        profondément pendant la génération en cours.
+            :param cle: int - Clé de Zobrist de la position.
+            :param profondeur: int - Profondeur de la recherche ayant produit le score.
+            :param borne: int - EXACTE, INFERIEURE ou SUPERIEURE.
+            :param score: float - Score de la position.
+            :param coup: Coup ou None - Meilleur coup trouvé. """
+
+        decalage = (cle % self.nbEntrees) * FORMAT_ENTREE.size
+        entree = FORMAT_ENTREE.unpack_from(self.donnees, decalage)
+        if entree[3] != 0 and entree[2] > profondeur and entree[7] == self.generation \
+                and entree[0] ^ verification(*entree[1:7]) != cle:
+            return  # On conserve l'entrée la plus profonde
+
+        if coup is None:
+            depart = arrivee = capture = AUCUNE_POSITION
+        else:
+            depart = AUCUNE_POSITION if coup.depart is None else coup.depart
+            arrivee = coup.arrivee
+            capture = AUCUNE_POSITION if coup.capture is None else coup.capture
+        FORMAT_ENTREE.pack_into(self.donnees, decalage,
+                                cle ^ verification(score, profondeur, borne, depart, arrivee, capture),
+                                score, profondeur, borne, depart, arrivee, capture, self.generation)
+
+    def vider(self):
+        """ Efface toutes les entrées de la table. """
+
+        self.donnees[:] = bytes(len(self.donnees))
+
+    def enregistrer(self, chemin, description=""):
+        """ Écrit la table dans un fichier (remplacé d'un seul coup, pour qu'un fichier présent soit toujours complet).
+            :param chemin: str - Chemin du fichier.
+            :param description: str - Description du contenu (par exemple l'heuristique), vérifiée au chargement. """
+
+        temporaire = f"{chemin}.{os.getpid()}.tmp"  # Propre au processus : plusieurs processus peuvent enregistrer
+        with open(temporaire, 'wb') as fichier:
+            fichier.write(FORMAT_ENTETE.pack(SIGNATURE, VERSION, self.nbEntrees, description.encode()))
+            fichier.write(self.donnees)
+        os.replace(temporaire, chemin)
+
+    def charger(self, chemin, description=""):
+        """ Recharge une table écrite par enregistrer, en y réinsérant chacune de ses entrées : le fichier peut donc
+        provenir d'une table d'une autre taille, les collisions étant résolues par la politique de remplacement. Les
+        entrées chargées appartiennent à la génération en cours.
+            :param chemin: str - Chemin du fichier.
+            :param description: str - Description attendue du contenu. """
+
+        with open(chemin, 'rb') as fichier:
+            donnees = fichier.read()
+        if len(donnees) < FORMAT_ENTETE.size:
+            raise ValueError(f"{chemin} n'est pas une table de transposition")
+        signature, version, nbEntrees, descriptionLue = FORMAT_ENTETE.unpack_from(donnees)
+        if signature != SIGNATURE or version != VERSION \
+                or len(donnees) != FORMAT_ENTETE.size + nbEntrees * FORMAT_ENTREE.size:
+            raise ValueError(f"{chemin} n'est pas une table de transposition")
+        if descriptionLue.rstrip(b'\0').decode() != description:
+            raise ValueError(f"{chemin} contient une table de transposition d'une autre recherche")
+        for cleLue, score, profondeur, borne, depart, arrivee, capture, _ in \
+                FORMAT_ENTREE.iter_unpack(donnees[FORMAT_ENTETE.size:]):
+            if borne == 0:
+                continue
+            coup = None
+            if arrivee != AUCUNE_POSITION:
+                coup = Coup(None if depart == AUCUNE_POSITION else depart, arrivee,
+                            None if capture == AUCUNE_POSITION else capture)
+            self.ecrire(cleLue ^ verification(score, profondeur, borne, depart, arrivee, capture), profondeur, borne,
+                        score, coup)
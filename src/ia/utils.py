@@ -2,7 +2,6 @@
     Composé de deux parties : des fonctions générales pour les fonctions heuristiques et l'algorithme Minimax,
     et des fonctions de gestion du plateau, utilisées dans les fichiers de jeu. """
 
-from copy import deepcopy
 import sys
 
 """ Partie 1 : Fonctions liées aux heuristiques et a l'algorithme Minimax """
@@ -148,7 +147,7 @@ def retirerPiece(copiePlateau, listePlateau, joueur1):
     for i in range(len(copiePlateau)):              # Parcours de toutes les positions du plateau
         if copiePlateau[i] == joueur2:              # Vérifie si la position appartient à l'adversaire
             if not moulinCree(i, copiePlateau):     # Vérifie que le pion ne fait pas partie d'un moulin
-                new_board = deepcopy(copiePlateau)
+                new_board = copiePlateau[:]
                 new_board[i] = 'x'                  # Suppression du pion en remplaçant par 'x'
                 listePlateau.append(new_board)      # Ajoute la nouvelle configuration à la liste
 
@@ -164,7 +163,7 @@ def mouvementsPossiblesEtape1(plateau):
     listePlateau = []
     for i in range(len(plateau)):
         if plateau[i] == 'x':                 # Vérifie si la position est vide
-            copiePlateau = deepcopy(plateau)  # Copie du plateau actuel
+            copiePlateau = plateau[:]         # Copie du plateau actuel
             copiePlateau[i] = '1'             # Placement d'un pion du joueur 1
 
             if moulinCree(i, copiePlateau):   # Vérifie si un moulin est formé
@@ -191,7 +190,7 @@ def mouvementsPossiblesEtape2(plateau, joueur):
 
             for pos in listePlacesAdjacentes:
                 if plateau[pos] == 'x':                     # Vérifie si la case adjacente est libre
-                    copiePlateau = deepcopy(plateau)
+                    copiePlateau = plateau[:]
                     copiePlateau[i] = 'x'                   # Vide la position actuelle
                     copiePlateau[pos] = joueur              # Déplace le pion vers la nouvelle position
 
@@ -213,7 +212,7 @@ def mouvementsPossiblesEtape3(plateau, joueur):
         if plateau[i] == joueur:                     # Vérifie si la position contient un pion du joueur
             for j in range(len(plateau)):
                 if plateau[j] == 'x':                # Vérifie si la case cible est libre
-                    copiePlateau = deepcopy(plateau)
+                    copiePlateau = plateau[:]
                     copiePlateau[i] = 'x'            # Vide la position actuelle
                     copiePlateau[j] = joueur         # Déplace le pion vers la nouvelle position
 
@@ -236,34 +235,59 @@ def mouvementsPossiblesEtape2ou3(plateau, joueur='1'):
         return mouvementsPossiblesEtape2(plateau, joueur)
 
 
-def plateauInverse(plateau):
-    """ Inverse le plateau de jeu en échangeant les pions des joueurs. Utilisée dans minimax pour obtenir les mouvements
-    possibles de l'adversaire.
-        :param plateau: Liste représentant l'état actuel du plateau.
-        :return: Liste représentant le plateau inversé. """
-
-    plateauInv = []
-    for i in plateau:
-        if i == "1":
-            plateauInv.append("2")  # Remplace les pions du joueur 1 par ceux du joueur 2
-        elif i == "2":
-            plateauInv.append("1")  # Remplace les pions du joueur 2 par ceux du joueur 1
-        else:
-            plateauInv.append("x")  # Conserve les positions vides
-    return plateauInv
+def nombreCoupsPossibles(plateau, joueur='1'):
+    """ Compte les mouvements possibles en phase 2 ou 3, avec le même résultat que
+    len(mouvementsPossiblesEtape2ou3(plateau, joueur)) mais sans construire les plateaux : un déplacement formant un
+    moulin compte pour autant de coups que de pions adverses retirables. Utilisée dans les heuristiques.
+        :param plateau: Liste représentant l'état actuel du plateau (modifiée puis rétablie pendant le calcul).
+        :param joueur: Caractère représentant le joueur ('1' ou '2').
+        :return: Nombre de mouvements possibles. """
 
+    adversaire = '2' if joueur == '1' else '1'
+    retirables = None  # Nombre de pions adverses hors moulin, calculé au premier moulin rencontré
+    vol = nombrePion(plateau, joueur) == 3  # Phase 3 : le joueur peut voler vers toute case libre
+    nombre = 0
+    for i in range(len(plateau)):
+        if plateau[i] == joueur:
+            plateau[i] = 'x'  # Le pion quitte sa position le temps de tester ses déplacements
+            for pos in (range(len(plateau)) if vol else positionsAdjacentes(i)):
+                if pos != i and plateau[pos] == 'x':
+                    if prochainMoulin(pos, plateau, joueur):  # Le déplacement forme un moulin
+                        if retirables is None:
+                            retirables = sum(1 for j in range(len(plateau))
+                                             if plateau[j] == adversaire and not moulinCree(j, plateau))
+                        nombre += retirables
+                    else:
+                        nombre += 1
+            plateau[i] = joueur
+    return nombre
 
-def genereListePlateauInverse(listePositions):
-    """ Génère une liste de plateaux inversés à partir d'une liste de positions. Utilisée dans minimax pour obtenir les
-    mouvements possibles de l'adversaire.
-        :param listePositions: Liste de plateaux représentant différentes configurations de jeu.
-        :return: Liste de plateaux inversés. """
 
-    resultat = []
-    for i in listePositions:
-        resultat.append(plateauInverse(i))  # Applique l'inversion à chaque plateau de la liste
-    return resultat
+def existeCoupPossible(plateau, joueur='1'):
+    """ Vérifie qu'il existe au moins un mouvement possible en phase 2 ou 3, avec le même résultat que
+    len(mouvementsPossiblesEtape2ou3(plateau, joueur)) > 0 mais sans construire les plateaux, et en s'arrêtant au
+    premier coup trouvé. Utilisée dans les heuristiques et les vérifications de victoire.
+        :param plateau: Liste représentant l'état actuel du plateau (modifiée puis rétablie pendant le calcul).
+        :param joueur: Caractère représentant le joueur ('1' ou '2').
+        :return: True si le joueur peut jouer, sinon False. """
 
+    adversaire = '2' if joueur == '1' else '1'
+    retirable = None  # Existence d'un pion adverse hors moulin, calculée au premier moulin rencontré
+    vol = nombrePion(plateau, joueur) == 3
+    for i in range(len(plateau)):
+        if plateau[i] == joueur:
+            plateau[i] = 'x'
+            for pos in (range(len(plateau)) if vol else positionsAdjacentes(i)):
+                if pos != i and plateau[pos] == 'x':
+                    if prochainMoulin(pos, plateau, joueur) and retirable is None:
+                        retirable = any(plateau[j] == adversaire and not moulinCree(j, plateau)
+                                        for j in range(len(plateau)))
+                    # Un déplacement formant un moulin n'est un coup que s'il reste un pion adverse à retirer
+                    if retirable or not prochainMoulin(pos, plateau, joueur):
+                        plateau[i] = joueur
+                        return True
+            plateau[i] = joueur
+    return False
 
 
 """ Partie 2 : Fonctions liées aux interactions utilisateur """
@@ -316,6 +340,38 @@ def printTableau(plateau):
     print("\n")
 
 
+def extraireOption(arguments, nom, conversion):
+    """ Retire une option de la forme '--nom valeur' d'une liste d'arguments de la ligne de commande. Utilisée dans
+    HumainVsIA et IAVsIA, avant la lecture des arguments positionnels.
+        :param arguments: Liste des arguments (modifiée sur place).
+        :param nom: Nom de l'option, sans les tirets.
+        :param conversion: Fonction convertissant la valeur (par exemple float) et levant ValueError si invalide.
+        :return: La valeur convertie, ou None si l'option est absente. """
+
+    option = "--" + nom
+    if option not in arguments:
+        return None
+    indice = arguments.index(option)
+    if indice + 1 >= len(arguments):
+        raise ValueError(f"l'option {option} attend une valeur")
+    valeur = conversion(arguments[indice + 1])
+    del arguments[indice:indice + 2]
+    return valeur
+
+
+def extraireDrapeau(arguments, nom):
+    """ Retire une option sans valeur de la forme '--nom' d'une liste d'arguments de la ligne de commande.
+        :param arguments: Liste des arguments (modifiée sur place).
+        :param nom: Nom de l'option, sans les tirets.
+        :return: True si l'option était présente, False sinon. """
+
+    option = "--" + nom
+    if option not in arguments:
+        return False
+    arguments.remove(option)
+    return True
+
+
 def demanderPosition(message):
     """ Demande une position valide à l'utilisateur et la retourne. Utilisée dans HumainVsHumain et HumainVsIA.
         :param message: Message affiché pour demander une position.
@@ -407,11 +463,11 @@ def verifierVictoire(plateau):
         :param plateau: Liste représentant l'état du plateau. """
 
     # Vérifie si le joueur 1 a perdu (moins de 3 pions ou aucun déplacement possible)
-    if nombrePion(plateau, '1') < 3 or len(mouvementsPossiblesEtape2ou3(plateau, '1')) == 0:
+    if nombrePion(plateau, '1') < 3 or not existeCoupPossible(plateau, '1'):
         print("\033[1m\nLe \033[95mJoueur 2\033[0m\033[1m a gagné !\n")
         sys.exit()  # Termine le programme immédiatement
 
     # Vérifie si le joueur 2 a perdu
-    elif nombrePion(plateau, '2') < 3 or len(mouvementsPossiblesEtape2ou3(plateau, '2')) == 0:
+    elif nombrePion(plateau, '2') < 3 or not existeCoupPossible(plateau, '2'):
         print("\033[1m\nLe \033[94mJoueur 1\033[0m\033[1m a gagné !\n")
         sys.exit()
@@ -0,0 +1,213 @@
+""" Évaluation groupée des feuilles avec NumPy. À la profondeur 1, negamax évalue chaque enfant d'un nœud l'un après
+    l'autre ; ici, tous les enfants sont empilés dans un tableau (N, 24) et les caractéristiques des heuristiques
+    (moulins, configurations à 2 pions, pions bloqués, nombre de pions, mobilité) sont calculées pour les N plateaux à
+    la fois, à partir de matrices précalculées des lignes et des adjacences. Les scores sont exactement ceux de
+    heuristiqueAvancee et heuristiqueExperte.
+
+    NumPy est facultatif : s'il n'est pas installé, versionGroupee renvoie None et la recherche évalue les feuilles une
+    à une, comme auparavant. """
+
+try:
+    import numpy as np
+except ImportError:  # Le reste du moteur n'utilise que la bibliothèque standard
+    np = None
+
+from src.ia.bitboard import BITS, PAIRES_MOULINS, positions
+from src.ia.utils import positionsAdjacentes
+from src.ia.heuristiques import heuristiqueAvancee, heuristiqueExperte
+
+if np is not None:
+    INDICES = np.arange(24, dtype=np.int64)
+
+    # Pour chaque position, les deux autres positions de chacune des deux lignes qui la traversent : (24, 2)
+    PAIRES_A = np.array([[positions(m)[0] for m in PAIRES_MOULINS[q]] for q in range(24)])
+    PAIRES_B = np.array([[positions(m)[1] for m in PAIRES_MOULINS[q]] for q in range(24)])
+
+    # Matrice d'adjacence : (plateaux (N, 24) @ ADJACENCES)[n, q] compte les pions adjacents à q
+    ADJACENCES = np.zeros((24, 24), dtype=np.int16)
+    for _q in range(24):
+        ADJACENCES[positionsAdjacentes(_q), _q] = 1
+
+    # Déplacements vers une position adjacente : départ, arrivée et les deux lignes passant par l'arrivée. Les lignes
+    # contenant la position de départ sont écartées : libérée par le déplacement, elle ne complète pas le moulin
+    DEPARTS = np.array([i for i in range(24) for _ in positionsAdjacentes(i)])
+    ARRIVEES = np.array([j for i in range(24) for j in positionsAdjacentes(i)])
+    LIGNES_A = PAIRES_A[ARRIVEES]
+    LIGNES_B = PAIRES_B[ARRIVEES]
+    LIGNES_VALIDES = (LIGNES_A != DEPARTS[:, None]) & (LIGNES_B != DEPARTS[:, None])
+
+
+def plateauxEnfants(pions, joueur, coups):
+    """ Empile les plateaux obtenus en jouant chacun des coups, sans modifier l'état.
+        :param pions: list - Bitboards des deux joueurs ([joueur '1', joueur '2']).
+        :param joueur: int - Indice du joueur qui joue les coups (0 ou 1).
+        :param coups: list - Les coups (départ, arrivée, pion retiré).
+        :return: np.ndarray - Tableau (N, 24) d'entiers int8 : 0 pour une case vide, 1 ou 2 pour un pion. """
+
+    b, bAdverse = pions[joueur], pions[1 - joueur]
+    joues = []
+    adverses = []
+    for coup in coups:
+        if coup.depart is None:
+            joues.append(b | BITS[coup.arrivee])
+        else:
+            joues.append(b ^ BITS[coup.depart] ^ BITS[coup.arrivee])
+        adverses.append(bAdverse if coup.capture is None else bAdverse ^ BITS[coup.capture])
+    bitsJoues = (np.array(joues, dtype=np.int64)[:, None] >> INDICES) & 1
+    bitsAdverses = (np.array(adverses, dtype=np.int64)[:, None] >> INDICES) & 1
+    if joueur == 0:
+        return (bitsJoues + 2 * bitsAdverses).astype(np.int8)
+    return (2 * bitsJoues + bitsAdverses).astype(np.int8)
+
+
+def prochainsMoulins(pions):
+    """ Équivalent groupé de prochainMoulin pour toutes les positions.
+        :param pions: np.ndarray - Tableau booléen (N, 24) des pions du joueur.
+        :return: np.ndarray - Tableau booléen (N, 24). """
+
+    return (pions[:, PAIRES_A] & pions[:, PAIRES_B]).any(axis=2)
+
+
+def nombresCoups(pions, vides, nombrePions, possibles, retirables):
+    """ Équivalent groupé de nombreCoupsPossibles.
+        :param pions: np.ndarray - Tableau booléen (N, 24) des pions du joueur.
+        :param vides: np.ndarray - Tableau booléen (N, 24) des cases vides.
+        :param nombrePions: np.ndarray - Nombre de pions du joueur sur chaque plateau.
+        :param possibles: np.ndarray - Nombre de cases vides complétant une ligne du joueur sur chaque plateau.
+        :param retirables: np.ndarray - Nombre de pions adverses hors moulin sur chaque plateau.
+        :return: np.ndarray - Nombre de coups sur chaque plateau. """
+
+    possiblesAdjacents = pions[:, DEPARTS] & vides[:, ARRIVEES]
+    moulins = (pions[:, LIGNES_A] & pions[:, LIGNES_B] & LIGNES_VALIDES).any(axis=2)
+    nombres = (possiblesAdjacents * np.where(moulins, retirables[:, None], 1)).sum(axis=1)
+    if (nombrePions == 3).any():
+        # Avec trois pions, le joueur vole : chacun des 3 pions peut aller sur chaque case vide. Une case vide complétant
+        # une ligne du joueur forme un moulin pour un seul de ses pions, le troisième (les deux autres, en quittant la
+        # ligne, la défont) ; tous les autres déplacements comptent pour un coup
+        vol = 3 * vides.sum(axis=1) - possibles + possibles * retirables
+        nombres = np.where(nombrePions == 3, vol, nombres)
+    return nombres
+
+
+def caracteristiques(plateaux, mobilite):
+    """ Calcule pour chaque plateau les caractéristiques communes aux heuristiques.
+        :param plateaux: np.ndarray - Tableau (N, 24) produit par plateauxEnfants.
+        :param mobilite: bool - True pour calculer aussi le nombre de coups de chaque joueur.
+        :return: dict - Tableaux de taille N indexés par le nom de la caractéristique. """
+
+    pions1 = plateaux == 1
+    pions2 = plateaux == 2
+    vides = plateaux == 0
+    moulins1 = prochainsMoulins(pions1)
+    moulins2 = prochainsMoulins(pions2)
+    adjacents1 = pions1.astype(np.int16) @ ADJACENCES
+    adjacents2 = pions2.astype(np.int16) @ ADJACENCES
+    bloques = (vides.astype(np.int16) @ ADJACENCES) == 0
+
+    c = {'pions1': pions1.sum(axis=1), 'pions2': pions2.sum(axis=1),
+         'enMoulin1': (pions1 & moulins1).sum(axis=1), 'enMoulin2': (pions2 & moulins2).sum(axis=1),
+         'possibles1': (vides & moulins1).sum(axis=1), 'possibles2': (vides & moulins2).sum(axis=1),
+         'bloques1': (pions1 & bloques).sum(axis=1), 'bloques2': (pions2 & bloques).sum(axis=1),
+         # Termes de nombrePiecesMoulinEnFormation, avec son asymétrie entre les joueurs
+         'formation1': (adjacents2 * (pions1 & moulins2)).sum(axis=1),
+         'formation2': (adjacents2 * (pions1 & (adjacents1 > 0) & ~moulins1)).sum(axis=1)}
+
+    if mobilite:
+        retirables1 = (pions1 & ~moulins1).sum(axis=1)  # Pions '1' que le joueur '2' peut retirer
+        retirables2 = (pions2 & ~moulins2).sum(axis=1)
+        c['mouvements1'] = nombresCoups(pions1, vides, c['pions1'], c['possibles1'], retirables2)
+        c['mouvements2'] = nombresCoups(pions2, vides, c['pions2'], c['possibles2'], retirables1)
+    return c
+
+
+def versScores(evaluation, victoires, defaites):
+    """ Convertit les évaluations en liste Python, les plateaux gagnants ou perdants valant ±inf comme dans les
+    heuristiques sur liste.
+        :param evaluation: np.ndarray - Évaluations entières.
+        :param victoires: np.ndarray - Tableau booléen des plateaux valant float('inf').
+        :param defaites: np.ndarray - Tableau booléen des plateaux valant float('-inf') (prioritaire).
+        :return: list - Scores (int ou float) du point de vue du joueur '1'. """
+
+    scores = evaluation.tolist()
+    for n in np.flatnonzero(victoires | defaites).tolist():
+        scores[n] = float('-inf') if defaites[n] else float('inf')
+    return scores
+
+
+def heuristiqueAvanceeGroupee(plateaux, phase1):
+    """ Version groupée de heuristiqueAvancee.
+        :param plateaux: np.ndarray - Tableau (N, 24) produit par plateauxEnfants.
+        :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: list - Les N scores du point de vue du joueur '1'. """
+
+    c = caracteristiques(plateaux, not phase1)
+    evaluation = 10 * (c['pions1'] - c['pions2'])
+    evaluation += 50 * (c['possibles1'] - c['possibles2'])
+    evaluation += 30 * (c['formation1'] - c['formation2'])
+    evaluation += 30 * c['bloques2']
+    if phase1:
+        return evaluation.tolist()
+
+    evaluation += 5 * (c['mouvements1'] - c['mouvements2'])
+    # Mêmes priorités que les retours anticipés de heuristiqueAvancee
+    defaites = (c['pions1'] < 3) | ((c['pions2'] >= 3) & (c['mouvements2'] != 0) & (c['mouvements1'] == 0))
+    victoires = (c['pions2'] < 3) | (c['mouvements2'] == 0)
+    return versScores(evaluation, victoires, defaites)
+
+
+def heuristiqueExperteGroupee(plateaux, phase1):
+    """ Version groupée de heuristiqueExperte (mêmes regroupements de termes que heuristiqueExperteBits).
+        :param plateaux: np.ndarray - Tableau (N, 24) produit par plateauxEnfants.
+        :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: list - Les N scores du point de vue du joueur '1'. """
+
+    poidsMoulinsFermes = 18 if phase1 else 14
+    poidsMoulins = 26 if phase1 else 43
+    poidsPionsBloques = 1 if phase1 else 10
+    poidsPions = 9 if phase1 else 11
+    poidsConfig2Pions = 10
+    poidsConfig3Pions = 7 if phase1 else 1086
+    poidsDoubleMoulins = 0 if phase1 else 8
+    poidsConfigGagnante = 0 if phase1 else 1190
+
+    c = caracteristiques(plateaux, False)
+    evaluation = poidsMoulinsFermes * ((c['enMoulin1'] > 0).astype(np.int64) - (c['enMoulin2'] > 0))
+    evaluation += (poidsMoulins + poidsConfig3Pions) * (c['possibles1'] - c['possibles2'])
+    evaluation += poidsPionsBloques * (c['bloques1'] - c['bloques2'])
+    evaluation += poidsPions * (c['pions1'] - c['pions2'])
+    evaluation += poidsConfig2Pions * (c['formation1'] - c['formation2'])
+    evaluation += poidsDoubleMoulins * (c['enMoulin1'] - c['enMoulin2'])
+
+    victoire = (c['pions2'] < 3) | (c['bloques1'] == c['pions2'])
+    defaite = (c['pions1'] < 3) | (c['bloques2'] == c['pions1'])
+    evaluation += poidsConfigGagnante * (victoire.astype(np.int64) - defaite)
+    return evaluation.tolist()
+
+
+# Correspondance entre les heuristiques sur liste et leur version groupée, avec le nombre d'enfants à partir duquel
+# l'évaluation groupée est plus rapide que l'évaluation une à une
+HEURISTIQUES_GROUPEES = {heuristiqueAvancee: (heuristiqueAvanceeGroupee, 16),
+                         heuristiqueExperte: (heuristiqueExperteGroupee, 32)}
+
+
+def versionGroupee(heuristique):
+    """ Donne la version groupée d'une heuristique, si NumPy est disponible et qu'elle en possède une.
+        :param heuristique: Fonction heuristique prenant (plateau, phase1).
+        :return: Couple (fonction prenant (plateaux, phase1), nombre minimal d'enfants), ou None. """
+
+    if np is None:
+        return None
+    return HEURISTIQUES_GROUPEES.get(heuristique)
+
+
+def evaluationsEnfants(groupee, pions, joueur, coups, phase1):
+    """ Évalue d'un coup tous les enfants d'un nœud de profondeur 1, comme le ferait negamax à la profondeur 0.
+        :param groupee: Fonction groupée (voir versionGroupee).
+        :param pions: list - Bitboards des deux joueurs.
+        :param joueur: int - Indice du joueur au trait au nœud parent.
+        :param coups: list - Les coups du nœud parent.
+        :param phase1: bool - Booléen indiquant si on est à la phase 1 (placement des pions).
+        :return: list - Score de chaque enfant du point de vue du joueur au trait au nœud parent. """
+
+    scores = groupee(plateauxEnfants(pions, joueur, coups), phase1)
+    return scores if joueur == 0 else [-score for score in scores]
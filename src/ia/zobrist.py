@@ -0,0 +1,35 @@
+""" Clés de Zobrist : chaque (joueur, position) reçoit un entier aléatoire de 64 bits, et la clé d'un plateau est le
+    ou exclusif des clés de ses pions. Jouer un coup ne modifie que quelques termes, ce qui permet à EtatJeu de mettre
+    sa clé à jour de façon incrémentale. Le nombre de pions restant à placer par chaque joueur fait partie de la
+    position (il détermine la phase de jeu) et a aussi ses clés. Le générateur est initialisé avec une graine fixe pour
+    que les clés soient identiques d'une exécution à l'autre (et donc d'un processus à l'autre). """
+
+import random
+
+_generateur = random.Random(20240101)
+
+ZOBRIST_PIONS = tuple(tuple(_generateur.getrandbits(64) for _ in range(24)) for _ in range(2))  # [joueur][position]
+ZOBRIST_TRAIT = _generateur.getrandbits(64)   # Ajoutée quand le joueur '2' est au trait
+# Pions restant à placer : [joueur][nombre], nulle pour 0 (les clés de la phase de déplacement n'en dépendent pas)
+EN_MAIN_MAX = 24
+ZOBRIST_EN_MAIN = tuple((0,) + tuple(_generateur.getrandbits(64) for _ in range(EN_MAIN_MAX)) for _ in range(2))
+# Terme modifié par un placement : [joueur][nombre de pions en main avant le placement]
+ZOBRIST_PLACEMENT = tuple((0,) + tuple(cles[n] ^ cles[n - 1] for n in range(1, EN_MAIN_MAX + 1))
+                          for cles in ZOBRIST_EN_MAIN)
+
+
+def cleZobrist(b1, b2, joueur, enMain=(0, 0)):
+    """ Calcule entièrement la clé de Zobrist d'une position.
+        :param b1: int - Bitboard du joueur '1'.
+        :param b2: int - Bitboard du joueur '2'.
+        :param joueur: int - Indice du joueur au trait (0 ou 1).
+        :param enMain: tuple - Nombre de pions restant à placer à chaque joueur.
+        :return: int - Clé de 64 bits. """
+
+    cle = ZOBRIST_TRAIT if joueur else 0
+    cle ^= ZOBRIST_EN_MAIN[0][enMain[0]] ^ ZOBRIST_EN_MAIN[1][enMain[1]]
+    for j, b in ((0, b1), (1, b2)):
+        for i in range(24):
+            if b >> i & 1:
+                cle ^= ZOBRIST_PIONS[j][i]
+    return cle
@@ -2,23 +2,51 @@
     Note : jouerTourIA() ne se trouve pas dans utils.py pour mieux la différencier avec jouerTourIA() de IAVsIA.py. """
 
 
-from src.ia.minimax import minimax
+from src.ia.minimax import minimax, minimaxIteratif, PROFONDEUR_MAX
+from src.ia.parallele import minimaxParallele
+from src.ia.ouvertures import coupOuverture
+from src.ia.anticipation import Anticipation
+from src.ia.session import SessionRecherche
+from src.ia.etat import mainsPlacement
 from src.ia.heuristiques import *
 import sys
 
 
-def jouerTourIA(plateau, phase1, heuristiqueUtilisee, profondeurUtilisee):
+def jouerTourIA(plateau, phase1, heuristiqueUtilisee, profondeurUtilisee, tempsUtilise=None, workers=1,
+                statistiques=False, session=None, enMain=None):
     """ Gère le tour de l'IA en utilisant l'algorithme Minimax.
         L'IA réfléchit à son meilleur coup et l'exécute en fonction de la phase du jeu.
         Affiche les actions réalisées par l'IA, notamment les placements, déplacements et suppressions de pions.
         :param plateau: Liste représentant l'état actuel du plateau de jeu.
         :param phase1: Booléen indiquant si l'on est en phase de placement (True) ou de déplacement (False).
         :param heuristiqueUtilisee: Fonction heuristique utilisée pour évaluer les coups.
-        :param profondeurUtilisee: Profondeur maximale de l'arbre de recherche du coup de l'IA. """
+        :param profondeurUtilisee: Profondeur maximale de l'arbre de recherche du coup de l'IA.
+        :param tempsUtilise: Budget de temps par coup en secondes ; si fourni, la recherche s'approfondit
+        itérativement jusqu'à épuisement du budget (sans dépasser profondeurUtilisee si elle est fournie).
+        :param workers: Nombre de processus de recherche ; au-delà de 1, la recherche parallèle est utilisée.
+        :param statistiques: Booléen indiquant si les statistiques de la recherche sont affichées après le coup.
+        :param session: SessionRecherche de l'IA, conservée d'un coup à l'autre (et remplie par l'anticipation), ou
+        None.
+        :param enMain: Tuple des pions restant à placer à chaque joueur (voir mainsPlacement), pour que la recherche
+        passe à la phase de déplacement au bon moment, ou None. """
 
     print("\n\033[95mL'IA réfléchit...\033[0m")
-    evalPlateau = minimax(plateau, profondeur=profondeurUtilisee, maximisant=False, alpha=float('-inf'), beta=float('inf'),
-                          etape1=phase1, heuristique=heuristiqueUtilisee)  # Appel de Minimax avec une profondeur de 4
+    evalPlateau = coupOuverture(plateau, maximisant=False, phase1=phase1, heuristique=heuristiqueUtilisee)
+    if evalPlateau is not None:
+        pass  # Position du livre d'ouvertures : aucune recherche
+    elif workers > 1:  # Recherche parallèle sur plusieurs processus partageant la table de transposition
+        evalPlateau = minimaxParallele(plateau, maximisant=False, etape1=phase1, heuristique=heuristiqueUtilisee,
+                                       workers=workers, profondeur=profondeurUtilisee if tempsUtilise is None else None,
+                                       temps=tempsUtilise, profondeurMax=profondeurUtilisee or PROFONDEUR_MAX,
+                                       enMain=enMain)
+    elif tempsUtilise is not None:  # Approfondissement itératif limité par le temps
+        evalPlateau = minimaxIteratif(plateau, maximisant=False, etape1=phase1, heuristique=heuristiqueUtilisee,
+                                      temps=tempsUtilise, profondeurMax=profondeurUtilisee or PROFONDEUR_MAX,
+                                      statistiques=statistiques, session=session, enMain=enMain)
+    else:
+        evalPlateau = minimax(plateau, profondeur=profondeurUtilisee, maximisant=False, alpha=float('-inf'),
+                              beta=float('inf'), etape1=phase1, heuristique=heuristiqueUtilisee,
+                              statistiques=statistiques, session=session, enMain=enMain)
 
     ancienPlateau = plateau[:]  # Sauvegarde de l'ancien état du plateau
     nouveauPlateau = evalPlateau.plateau
@@ -52,41 +80,107 @@ def jouerTourIA(plateau, phase1, heuristiqueUtilisee, profondeurUtilisee):
         if piece_retiree is not None:
             print(f"\033[95mVotre pion en position {piece_retiree} a été retiré.\033[0m")
 
+    # Statistiques de la recherche (absentes pour un coup du livre ou une recherche parallèle)
+    if statistiques and evalPlateau.statistiques is not None:
+        print(evalPlateau.statistiques.resume())
+
 
-def HumainVsIA(heuristiqueChoisie, profondeurChoisie):
+def HumainVsIA(heuristiqueChoisie, profondeurChoisie, tempsChoisi=None, workersChoisis=1, statistiquesChoisies=False,
+               anticipationChoisie=False):
     """ Lance une partie en mode Humain contre IA (phase 1 : placement des pions - phase 2/3 : déplacement des pions).
-        :param heuristiqueChoisie: Fonction heuristique utilisée pour l'IA. """
+        :param heuristiqueChoisie: Fonction heuristique utilisée pour l'IA.
+        :param profondeurChoisie: Profondeur de recherche (profondeur maximale si un budget de temps est donné).
+        :param tempsChoisi: Budget de temps par coup de l'IA en secondes, ou None pour une profondeur fixe.
+        :param workersChoisis: Nombre de processus utilisés par la recherche de l'IA.
+        :param statistiquesChoisies: Booléen indiquant si les statistiques de chaque recherche sont affichées.
+        :param anticipationChoisie: Booléen indiquant si l'IA réfléchit pendant le tour du joueur humain (recherche
+        sur un seul processus uniquement). """
 
     tableau = ['x'] * 24  # Initialisation du plateau de jeu vide
-
-    print("\033[1mPremière phase : placement des pions.\033[0;0m")  # Phase 1 : Placement des pions
-    for i in range(9):
-        print(f"\n\033[1mIl vous reste chacun {9 - i} pions à placer.\033[0;0m\n")
-        printTableau(tableau)
-        jouerTourHumain('1', tableau)
-        jouerTourIA(tableau, phase1=True, heuristiqueUtilisee=heuristiqueChoisie, profondeurUtilisee=profondeurChoisie)
-
-    print("\n\033[1mDeuxième phase : déplacement des pions.\033[0;0m\n")  # Phase 2 et 3 : Déplacement des pions
-    while True:
-        printTableau(tableau)
-        jouerTourHumain('1', tableau, phase1=False)
-        verifierVictoire(tableau)  # Vérifie si la partie est terminée
-        jouerTourIA(tableau, phase1=False, heuristiqueUtilisee=heuristiqueChoisie, profondeurUtilisee=profondeurChoisie)
-        verifierVictoire(tableau)  # Vérifie à nouveau après le tour de l'IA
+    anticipation = Anticipation(heuristiqueChoisie) if anticipationChoisie else None
+    # L'IA conserve sa table d'un coup à l'autre (la table partagée avec l'anticipation, si elle est activée)
+    session = SessionRecherche(heuristiqueChoisie, table=anticipation.table if anticipation is not None else None)
+
+    def jouerTourHumainAnticipe(phase1, enMain=None):
+        """ Tour du joueur humain, pendant lequel l'IA réfléchit si l'anticipation est activée. La session passe au
+        coup suivant dès le début du tour, pour que l'anticipation et la recherche qui suit partagent la même
+        génération de la table.
+            :param phase1: Booléen indiquant si l'on est en phase de placement.
+            :param enMain: Tuple des pions restant à placer à chaque joueur, ou None. """
+
+        session.nouveauCoup()
+        if anticipation is not None:
+            anticipation.demarrer(tableau, 0, phase1, enMain)
+        jouerTourHumain('1', tableau, phase1=phase1)
+        if anticipation is not None:
+            anticipation.arreter()
+
+    try:
+        print("\033[1mPremière phase : placement des pions.\033[0;0m")  # Phase 1 : Placement des pions
+        for i in range(9):
+            print(f"\n\033[1mIl vous reste chacun {9 - i} pions à placer.\033[0;0m\n")
+            printTableau(tableau)
+            jouerTourHumainAnticipe(phase1=True, enMain=mainsPlacement(2 * i))
+            jouerTourIA(tableau, phase1=True, heuristiqueUtilisee=heuristiqueChoisie,
+                        profondeurUtilisee=profondeurChoisie, tempsUtilise=tempsChoisi, workers=workersChoisis,
+                        statistiques=statistiquesChoisies, session=session, enMain=mainsPlacement(2 * i + 1))
+
+        print("\n\033[1mDeuxième phase : déplacement des pions.\033[0;0m\n")  # Phase 2 et 3 : Déplacement des pions
+        while True:
+            printTableau(tableau)
+            jouerTourHumainAnticipe(phase1=False)
+            verifierVictoire(tableau)  # Vérifie si la partie est terminée
+            jouerTourIA(tableau, phase1=False, heuristiqueUtilisee=heuristiqueChoisie,
+                        profondeurUtilisee=profondeurChoisie, tempsUtilise=tempsChoisi, workers=workersChoisis,
+                        statistiques=statistiquesChoisies, session=session)
+            verifierVictoire(tableau)  # Vérifie à nouveau après le tour de l'IA
+    finally:
+        if anticipation is not None:
+            session.table = None
+            anticipation.fermer()
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:  # Vérification du nombre d'arguments
+    arguments = sys.argv[1:]
+    statistiquesDonnees = extraireDrapeau(arguments, "stats")  # Option --stats : statistiques de chaque recherche
+    anticipationDonnee = extraireDrapeau(arguments, "anticipation")  # Option --anticipation : réflexion continue
+    try:  # Option --temps : budget de temps par coup de l'IA (en secondes), avec approfondissement itératif
+        tempsDonne = extraireOption(arguments, "temps", float)
+        if tempsDonne is not None and tempsDonne <= 0:
+            raise ValueError
+    except ValueError:
+        print("\033[91mErreur : Le temps (--temps) doit être un nombre de secondes positif.\033[0m")
+        sys.exit(1)
+    try:  # Option --workers : nombre de processus de recherche (recherche parallèle au-delà de 1)
+        workersDonnes = extraireOption(arguments, "workers", int)
+        if workersDonnes is None:
+            workersDonnes = 1
+        elif workersDonnes <= 0:
+            raise ValueError
+    except ValueError:
+        print("\033[91mErreur : Le nombre de processus (--workers) doit être un entier positif.\033[0m")
+        sys.exit(1)
+    if anticipationDonnee and workersDonnes > 1:
+        print("\033[91mErreur : L'anticipation (--anticipation) n'est possible qu'avec un seul processus de "
+              "recherche.\033[0m")
+        sys.exit(1)
+    descriptionRecherche = "" if tempsDonne is None else f" et un budget de {tempsDonne} s par coup"
+
+    if len(arguments) != 2:  # Vérification du nombre d'arguments
         print("\033[1mBienvenue dans le Jeu du Neuf Hommes de Morris - Mode \033[94mHumain\033[0m \033[1mcontre "
               "\033[95mIA\033[0m \033[1m!\033[0;0m")
-        print(
-            f"\033[1mL'IA utilise une heurisitique de niveau 3/3 et une profondeur de recherche de 4\033[0;0m\n")
-        HumainVsIA(heuristiqueExperte, 5)
+        if tempsDonne is None:
+            print(f"\033[1mL'IA utilise une heurisitique de niveau 3/3 et une profondeur de recherche de 4\033[0;0m\n")
+            HumainVsIA(heuristiqueExperte, 5, workersChoisis=workersDonnes, statistiquesChoisies=statistiquesDonnees,
+                       anticipationChoisie=anticipationDonnee)
+        else:
+            print(f"\033[1mL'IA utilise une heurisitique de niveau 3/3{descriptionRecherche}\033[0;0m\n")
+            HumainVsIA(heuristiqueExperte, None, tempsDonne, workersDonnes, statistiquesDonnees, anticipationDonnee)
     else:
         # Mapping des niveaux de difficulté (1 -> naive, 2 -> avancée, 3 -> experte)
         niveauxDifficulte = {'1': heuristiqueNaive, '2': heuristiqueAvancee, '3': heuristiqueExperte}
-        arg1 = sys.argv[1]
-        arg2 = sys.argv[2]
+        arg1 = arguments[0]
+        arg2 = arguments[1]
 
         if arg1 not in niveauxDifficulte:  # Validation de l'argument 1 (doit être compris entre 1 et 3)
             print("\033[91mErreur : Niveau de difficulté (arg1) doit être 1 (naive), 2 (avancée) ou 3 (experte).\033[0m")
@@ -102,5 +196,8 @@ if __name__ == "__main__":
 
         print("\033[1mBienvenue dans le Jeu du Neuf Hommes de Morris - Mode \033[94mHumain\033[0m \033[1mcontre "
               "\033[95mIA\033[0m \033[1m!\033[0;0m")
-        print(f"\033[1mL'IA utilise une heurisitique de niveau {arg1}/3 et une profondeur de recherche de {arg2}\033[0;0m\n")
-        HumainVsIA(niveauxDifficulte[arg1], profondeurDonnee)  # Lancement avec les arguments fournis
+        print(f"\033[1mL'IA utilise une heurisitique de niveau {arg1}/3 et une profondeur de recherche de {arg2}"
+              f"{descriptionRecherche}\033[0;0m\n")
+        # Lancement avec les arguments fournis
+        HumainVsIA(niveauxDifficulte[arg1], profondeurDonnee, tempsDonne, workersDonnes, statistiquesDonnees,
+                   anticipationDonnee)
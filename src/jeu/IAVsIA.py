@@ -8,25 +8,83 @@
         - jouerTourIA : différente de la fonction de même nom utilisée dans le mode HumainVsIA, celle-ci prend en
         compte le joueur et la profondeur (différente selon l'heuristique).
         - tournoiIA : lance un tournoi entre deux IA (50 parties). Les résultats sont affichés à la fin de
-        l'exécution. """
+        l'exécution.
 
-from src.ia.minimax import *
-from src.ia.heuristiques import *
+    L'affichage a trois niveaux (option --verbosite) : le plateau complet à chaque tour (par défaut), une ligne par
+    coup, ou aucun affichage. Les coups de chaque partie sont conservés dans un enregistrement compact (notationCoup),
+    écrit d'un bloc à la fin de la partie sous forme d'une ligne JSON : dans le fichier donné par --sortie, ou sur la
+    sortie standard en mode silencieux.
 
+    Utilisation : python3 -m src.jeu.IAVsIA [--temps T] [--workers N] [--stats] [--cache N] [--verbosite 2]
+                  [--sortie parties.jsonl] [--parties N] """
 
-def detecterCycle(etatsPrecedents, plateau, compteurCycles):
-    """ Détecte les cycles dans les états du plateau et compte leur occurrence.
+from src.ia.minimax import *
+from src.ia.heuristiques import *
+from src.ia.parallele import minimaxParallele
+from src.ia.ouvertures import coupOuverture
+from src.ia.symetries import plateauCanonique
+from src.ia.session import SessionRecherche
+from src.ia.cache import CacheEvaluations
+from src.ia.etat import mainsPlacement
+from src.ia.bitboard import Coup
+import json
+
+# Niveaux d'affichage (option --verbosite)
+SILENCE = 0  # Aucun affichage : seuls les enregistrements des parties sont écrits
+COUPS = 1    # Une ligne par coup joué
+PLATEAU = 2  # Plateau complet à chaque tour, avec le détail de chaque coup
+
+
+def notationCoup(coup):
+    """ Notation compacte d'un coup : la position d'arrivée pour un placement (« 8 »), le départ et l'arrivée pour un
+    déplacement (« 7-6 »), suivis le cas échéant du pion retiré (« 7-6x12 »).
+        :param coup: Coup - Le coup joué.
+        :return: str - Sa notation. """
+
+    texte = str(coup.arrivee) if coup.depart is None else f"{coup.depart}-{coup.arrivee}"
+    return texte if coup.capture is None else f"{texte}x{coup.capture}"
+
+
+def lireNotation(texte):
+    """ Relit un coup écrit par notationCoup.
+        :param texte: str - Notation du coup.
+        :return: Coup - Le coup correspondant (lève ValueError si la notation est invalide). """
+
+    deplacement, prise, capture = texte.partition('x')
+    depart, tiret, arrivee = deplacement.rpartition('-')
+    return Coup(int(depart) if tiret else None, int(arrivee), int(capture) if prise else None)
+
+
+def ecrirePartie(fichier, numero, heuristique1, heuristique2, coups, gagnant):
+    """ Écrit l'enregistrement d'une partie, en une ligne JSON.
+        :param fichier: Fichier ouvert en écriture (ou sys.stdout).
+        :param numero: Numéro de la partie.
+        :param heuristique1: Heuristique de l'IA 1 (pions '1').
+        :param heuristique2: Heuristique de l'IA 2 (pions '2').
+        :param coups: Liste des coups joués (Coup), dans l'ordre, l'IA 1 jouant le premier.
+        :param gagnant: '1', '2' ou None (égalité). """
+
+    fichier.write(json.dumps({'partie': numero, 'ia1': heuristique1.__name__, 'ia2': heuristique2.__name__,
+                              'gagnant': gagnant, 'coups': " ".join(notationCoup(coup) for coup in coups)}) + "\n")
+    fichier.flush()
+
+
+def detecterCycle(etatsPrecedents, plateau, compteurCycles, afficher=True):
+    """ Détecte les cycles dans les états du plateau et compte leur occurrence. Les positions symétriques l'une de
+    l'autre (symetries.py) sont considérées comme un même état.
     Si le nombre de cycles dépasse 5, arrête la partie et déclare qu'il n'y a aucun vainqueur.
         :param etatsPrecedents: Ensemble des états précédents du plateau.
         :param plateau: Liste représentant l'état actuel du plateau.
         :param compteurCycles: Entier représentant le nombre de cycles détectés.
+        :param afficher: Booléen indiquant si l'arrêt de la partie est annoncé.
         :return: Booléen indiquant si un cycle est détecté, et le compteur mis à jour. """
 
-    plateauHash = tuple(plateau)  # Tuple pour rendre le plateau hachable
+    plateauHash, _ = plateauCanonique(plateau)  # Forme canonique, sous forme de tuple hachable
     if plateauHash in etatsPrecedents:
         compteurCycles += 1
         if compteurCycles > 5:
-            print("\033[91mLa partie est arrêtée en raison de cycles répétés. Aucun vainqueur.\033[0m")
+            if afficher:
+                print("\033[91mLa partie est arrêtée en raison de cycles répétés. Aucun vainqueur.\033[0m")
             return True, compteurCycles  # Arrête la partie
     else:
         etatsPrecedents.add(plateauHash)
@@ -40,16 +98,17 @@ def verifierVictoireAvecRetour(plateau):
         :param plateau: Liste représentant l'état du plateau.
         :return: '1' si le joueur 1 gagne, '2' si le joueur 2 gagne ou None sinon. """
 
-    if nombrePion(plateau, '1') < 3 or len(mouvementsPossiblesEtape2ou3(plateau, '1')) == 0:
+    if nombrePion(plateau, '1') < 3 or not existeCoupPossible(plateau, '1'):
         return '2'  # Joueur 2 gagne
 
-    elif nombrePion(plateau, '2') < 3 or len(mouvementsPossiblesEtape2ou3(plateau, '2')) == 0:
+    elif nombrePion(plateau, '2') < 3 or not existeCoupPossible(plateau, '2'):
         return '1'  # Joueur 1 gagne
 
     return None
 
 
-def jouerTourIA(plateau, joueur, phase1, heuristiqueUtilisee, profondeurUtilisee):
+def jouerTourIA(plateau, joueur, phase1, heuristiqueUtilisee, profondeurUtilisee, tempsUtilise=None, workers=1,
+                statistiques=False, session=None, enMain=None, verbosite=PLATEAU, partie=None):
     """ Gère le tour d'une IA en utilisant l'algorithme Minimax. Différent de la fonction définie dans HumainVsIA.py.
     L'IA réfléchit à son meilleur coup et l'exécute en fonction de la phase du jeu.
     Affiche les actions réalisées par l'IA, notamment les placements, déplacements et suppressions de pions.
@@ -57,10 +116,48 @@ def jouerTourIA(plateau, joueur, phase1, heuristiqueUtilisee, profondeurUtilisee
         :param joueur: 1 ou 2 en fonction de l'ordre des joueurs.
         :param phase1: Booléen indiquant si l'on est en phase de placement (True) ou de déplacement (False).
         :param heuristiqueUtilisee: Fonction heuristique utilisée pour évaluer les coups.
-        :param profondeurUtilisee: Profondeur maximale de l'arbre de recherche du coup de l'IA. """
-
-    evalPlateau = minimax(plateau, profondeur=profondeurUtilisee, maximisant=(joueur == '2'), alpha=float('-inf'),
-                          beta=float('inf'), etape1=phase1, heuristique=heuristiqueUtilisee)
+        :param profondeurUtilisee: Profondeur maximale de l'arbre de recherche du coup de l'IA.
+        :param tempsUtilise: Budget de temps par coup en secondes ; si fourni, la recherche s'approfondit
+        itérativement jusqu'à épuisement du budget, sans dépasser profondeurUtilisee.
+        :param workers: Nombre de processus de recherche ; au-delà de 1, la recherche parallèle est utilisée.
+        :param statistiques: Booléen indiquant si les statistiques de la recherche sont affichées après le coup.
+        :param session: SessionRecherche de l'IA, conservée d'un coup à l'autre, ou None (ignorée par la recherche
+        parallèle, qui utilise sa propre table partagée).
+        :param enMain: Tuple des pions restant à placer à chaque joueur (voir mainsPlacement), pour que la recherche
+        passe à la phase de déplacement au bon moment, ou None.
+        :param verbosite: Niveau d'affichage (SILENCE, COUPS ou PLATEAU).
+        :param partie: Liste des coups de la partie, complétée par le coup joué, ou None. """
+
+    if session is not None:
+        session.nouveauCoup()
+    maximisant = joueur == '1'  # Le joueur '1' maximise l'évaluation
+    evalPlateau = coupOuverture(plateau, maximisant=maximisant, phase1=phase1, heuristique=heuristiqueUtilisee)
+    if evalPlateau is not None:
+        pass  # Position du livre d'ouvertures : aucune recherche
+    elif workers > 1:
+        evalPlateau = minimaxParallele(plateau, maximisant=maximisant, etape1=phase1,
+                                       heuristique=heuristiqueUtilisee, workers=workers,
+                                       profondeur=profondeurUtilisee if tempsUtilise is None else None,
+                                       temps=tempsUtilise, profondeurMax=profondeurUtilisee, enMain=enMain)
+    elif tempsUtilise is not None:
+        evalPlateau = minimaxIteratif(plateau, maximisant=maximisant, etape1=phase1,
+                                      heuristique=heuristiqueUtilisee, temps=tempsUtilise,
+                                      profondeurMax=profondeurUtilisee, statistiques=statistiques, session=session,
+                                      enMain=enMain)
+    else:
+        evalPlateau = minimax(plateau, profondeur=profondeurUtilisee, maximisant=maximisant, alpha=float('-inf'),
+                              beta=float('inf'), etape1=phase1, heuristique=heuristiqueUtilisee,
+                              statistiques=statistiques, session=session, enMain=enMain)
+
+    if partie is not None and evalPlateau.coup is not None:
+        partie.append(evalPlateau.coup)
+    if verbosite < PLATEAU:
+        plateau[:] = evalPlateau.plateau
+        if verbosite == COUPS:
+            if evalPlateau.coup is not None:
+                print(f"IA {joueur} : {notationCoup(evalPlateau.coup)}")
+            afficherStatistiques(evalPlateau, heuristiqueUtilisee, statistiques)
+        return
 
     # Identifier les changements effectués par l'IA
     ancienPlateau = plateau[:]
@@ -103,92 +200,210 @@ def jouerTourIA(plateau, joueur, phase1, heuristiqueUtilisee, profondeurUtilisee
         if piece_retiree is not None:
             print(f"{couleur}L'IA {joueur} a retiré un pion adverse en position {piece_retiree}.\033[0m")
 
+    afficherStatistiques(evalPlateau, heuristiqueUtilisee, statistiques)
+
+
+def afficherStatistiques(evalPlateau, heuristiqueUtilisee, statistiques):
+    """ Affiche les statistiques de la recherche (absentes pour un coup du livre ou une recherche parallèle) et celles
+    du cache des évaluations, si elles sont demandées.
+        :param evalPlateau: Evaluer - Résultat de la recherche.
+        :param heuristiqueUtilisee: Heuristique utilisée par la recherche.
+        :param statistiques: Booléen indiquant si les statistiques sont affichées. """
 
-def tournoiIA(heuristiqueChoisie1, heuristiqueChoisie2, nb_parties=50):
-    """ Organise un tournoi entre deux IA.
+    if statistiques and evalPlateau.statistiques is not None:
+        print(evalPlateau.statistiques.resume())
+    if statistiques and isinstance(heuristiqueUtilisee, CacheEvaluations):
+        print(heuristiqueUtilisee.resume())
+
+
+def tournoiIA(heuristiqueChoisie1, heuristiqueChoisie2, nb_parties=50, temps=None, workers=1, statistiques=False,
+              verbosite=PLATEAU, sortie=None):
+    """ Organise un tournoi entre deux IA. Chaque IA conserve sa session de recherche (table de transposition et
+    ordonnancement) d'un coup à l'autre et d'une partie à l'autre.
         :param heuristiqueChoisie1: Heuristique utilisée par l'IA 1.
         :param heuristiqueChoisie2: Heuristique utilisée par l'IA 2.
         :param nb_parties: Nombre total de parties à jouer (par défaut 50).
+        :param temps: Budget de temps par coup en secondes (les profondeurs deviennent des maxima), ou None.
+        :param workers: Nombre de processus utilisés par chaque recherche.
+        :param statistiques: Booléen indiquant si les statistiques de chaque recherche sont affichées.
+        :param verbosite: Niveau d'affichage (SILENCE, COUPS ou PLATEAU).
+        :param sortie: Fichier ouvert en écriture recevant l'enregistrement de chaque partie, ou None (sur la sortie
+        standard en mode silencieux, nulle part sinon).
         :return: Résultats du tournoi sous forme d'un dictionnaire. """
 
     resultats = {'IA1': 0, 'IA2': 0, 'Egalite': 0}  # Initialisation des résultats
+    session1 = SessionRecherche(heuristiqueChoisie1)
+    session2 = SessionRecherche(heuristiqueChoisie2)
+    if sortie is None and verbosite == SILENCE:
+        sortie = sys.stdout
+    options = {'tempsUtilise': temps, 'workers': workers, 'statistiques': statistiques, 'verbosite': verbosite}
 
     for partie in range(nb_parties):
         tableau = ['x'] * 24     # Plateau initial
         etatsPrecedents = set()  # Ensemble pour détecter les cycles
         compteurCycles = 0       # Compteur pour suivre les cycles
+        coups = []               # Enregistrement de la partie
+        gagnant = None
 
-        print(f"\n--- Partie {partie + 1} ---\n")
+        if verbosite > SILENCE:
+            print(f"\n--- Partie {partie + 1} ---\n")
 
         # Phase 1 : Placement des pions
-        for _ in range(9):
-            jouerTourIA(tableau, joueur='1', phase1=True, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=4)
-            jouerTourIA(tableau, joueur='2', phase1=True, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=6)
+        for tour in range(9):
+            jouerTourIA(tableau, joueur='1', phase1=True, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=4,
+                        session=session1, enMain=mainsPlacement(2 * tour), partie=coups, **options)
+            jouerTourIA(tableau, joueur='2', phase1=True, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=6,
+                        session=session2, enMain=mainsPlacement(2 * tour + 1), partie=coups, **options)
 
         # Phase 2 et 3 : Déplacement des pions
-        while True:
-            jouerTourIA(tableau, joueur='1', phase1=False, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=4)
-            cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles)
-            if cycleDetecte:
-                print("\033[91mÉgalité détectée en raison de cycles répétitifs.\033[0m")
-                resultats['Egalite'] += 1
-                break
-            gagnant = verifierVictoireAvecRetour(tableau)
-            if gagnant:
-                resultats['IA1' if gagnant == '1' else 'IA2'] += 1
-                break
-
-            jouerTourIA(tableau, joueur='2', phase1=False, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=6)
-            cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles)
-            if cycleDetecte:
-                print("\033[91mÉgalité détectée en raison de cycles répétitifs.\033[0m")
-                resultats['Egalite'] += 1
-                break
-            gagnant = verifierVictoireAvecRetour(tableau)
-            if gagnant:
-                resultats['IA1' if gagnant == '1' else 'IA2'] += 1
-                break
+        while gagnant is None:
+            for joueur, heuristique, profondeur, session in (('1', heuristiqueChoisie1, 4, session1),
+                                                               ('2', heuristiqueChoisie2, 6, session2)):
+                jouerTourIA(tableau, joueur=joueur, phase1=False, heuristiqueUtilisee=heuristique,
+                            profondeurUtilisee=profondeur, session=session, partie=coups, **options)
+                cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles,
+                                                             verbosite > SILENCE)
+                if cycleDetecte:
+                    if verbosite > SILENCE:
+                        print("\033[91mÉgalité détectée en raison de cycles répétitifs.\033[0m")
+                    gagnant = 'Egalite'
+                    break
+                gagnant = verifierVictoireAvecRetour(tableau)
+                if gagnant:
+                    break
+
+        resultats['Egalite' if gagnant == 'Egalite' else 'IA1' if gagnant == '1' else 'IA2'] += 1
+        if sortie is not None:
+            ecrirePartie(sortie, partie + 1, heuristiqueChoisie1, heuristiqueChoisie2, coups,
+                         None if gagnant == 'Egalite' else gagnant)
 
     # Affichage des résultats du tournoi
-    print("\n--- Résultats du tournoi ---")
-    print(f"IA 1 : {resultats['IA1']} victoires")
-    print(f"IA 2 : {resultats['IA2']} victoires")
-    print(f"Égalités : {resultats['Egalite']}")
+    if verbosite > SILENCE:
+        print("\n--- Résultats du tournoi ---")
+        print(f"IA 1 : {resultats['IA1']} victoires")
+        print(f"IA 2 : {resultats['IA2']} victoires")
+        print(f"Égalités : {resultats['Egalite']}")
 
     return resultats
 
 
-def AIVsAI(heuristiqueChoisie1, heuristiqueChoisie2):
-    """Lance une partie en mode IA contre IA."""
+def AIVsAI(heuristiqueChoisie1, heuristiqueChoisie2, temps=None, workers=1, statistiques=False, verbosite=PLATEAU,
+           sortie=None):
+    """Lance une partie en mode IA contre IA.
+        :param temps: Budget de temps par coup en secondes (les profondeurs deviennent des maxima), ou None.
+        :param workers: Nombre de processus utilisés par chaque recherche.
+        :param statistiques: Booléen indiquant si les statistiques de chaque recherche sont affichées.
+        :param verbosite: Niveau d'affichage (SILENCE, COUPS ou PLATEAU).
+        :param sortie: Fichier ouvert en écriture recevant l'enregistrement de la partie, ou None (sur la sortie
+        standard en mode silencieux, nulle part sinon).
+        :return: '1' ou '2' selon le gagnant, None en cas de cycles répétés. """
 
     tableau = ['x'] * 24
-    print("\033[1mBienvenue dans le Jeu du Neuf Hommes de Morris - Mode \033[94mIA\033[0m \033[1mcontre "
-          "\033[95mIA\033[0m \033[1m!\033[0;0m\n")
+    session1 = SessionRecherche(heuristiqueChoisie1)  # Chaque IA conserve sa table d'un coup à l'autre
+    session2 = SessionRecherche(heuristiqueChoisie2)
+    coups = []  # Enregistrement de la partie
+    options = {'tempsUtilise': temps, 'workers': workers, 'statistiques': statistiques, 'verbosite': verbosite,
+               'partie': coups}
+    if verbosite == PLATEAU:
+        print("\033[1mBienvenue dans le Jeu du Neuf Hommes de Morris - Mode \033[94mIA\033[0m \033[1mcontre "
+              "\033[95mIA\033[0m \033[1m!\033[0;0m\n")
 
     # Phase 1 : Placement des pions
-    for _ in range(9):
-        printTableau(tableau)
-        jouerTourIA(tableau, joueur='1', phase1=True, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=5)
-        jouerTourIA(tableau, joueur='2', phase1=True, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=3)
+    for tour in range(9):
+        if verbosite == PLATEAU:
+            printTableau(tableau)
+        jouerTourIA(tableau, joueur='1', phase1=True, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=5,
+                    session=session1, enMain=mainsPlacement(2 * tour), **options)
+        jouerTourIA(tableau, joueur='2', phase1=True, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=3,
+                    session=session2, enMain=mainsPlacement(2 * tour + 1), **options)
 
     etatsPrecedents = set()  # Ensemble pour stocker les états précédents du plateau
     compteurCycles = 0  # Compteur pour suivre le nombre de cycles détectés
 
     # Phase 2 et 3 : Déplacement des pions
     while True:
-        printTableau(tableau)
-        jouerTourIA(tableau, joueur='1', phase1=False, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=7)
-        cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles)
+        if verbosite == PLATEAU:
+            printTableau(tableau)
+        jouerTourIA(tableau, joueur='1', phase1=False, heuristiqueUtilisee=heuristiqueChoisie1, profondeurUtilisee=7,
+                    session=session1, **options)
+        cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles, verbosite > SILENCE)
         if cycleDetecte:
-            return
-        verifierVictoire(tableau)
-        cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles)
+            gagnant = None
+            break
+        gagnant = verifierVictoireAvecRetour(tableau)
+        if gagnant:
+            break
+        cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles, verbosite > SILENCE)
         if cycleDetecte:
-            return
-        jouerTourIA(tableau, joueur='2', phase1=False, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=5)
-        verifierVictoire(tableau)
+            gagnant = None
+            break
+        jouerTourIA(tableau, joueur='2', phase1=False, heuristiqueUtilisee=heuristiqueChoisie2, profondeurUtilisee=5,
+                    session=session2, **options)
+        gagnant = verifierVictoireAvecRetour(tableau)
+        if gagnant:
+            break
+
+    if sortie is None and verbosite == SILENCE:
+        sortie = sys.stdout
+    if sortie is not None:
+        ecrirePartie(sortie, 1, heuristiqueChoisie1, heuristiqueChoisie2, coups, gagnant)
+    if gagnant and verbosite > SILENCE:
+        verifierVictoire(tableau)  # Annonce le gagnant et termine le programme
+    return gagnant
 
 
 if __name__ == "__main__":
-    AIVsAI(heuristiqueAvancee, heuristiqueExperte)
-    #tournoiIA(heuristiqueExperte, heuristiqueAvancee)
+    arguments = sys.argv[1:]
+    statistiquesDonnees = extraireDrapeau(arguments, "stats")  # Option --stats : statistiques de chaque recherche
+    try:  # Option --temps : budget de temps par coup (en secondes), avec approfondissement itératif
+        tempsDonne = extraireOption(arguments, "temps", float)
+        if tempsDonne is not None and tempsDonne <= 0:
+            raise ValueError
+    except ValueError:
+        print("\033[91mErreur : Le temps (--temps) doit être un nombre de secondes positif.\033[0m")
+        sys.exit(1)
+    try:  # Option --workers : nombre de processus de recherche (recherche parallèle au-delà de 1)
+        workersDonnes = extraireOption(arguments, "workers", int)
+        if workersDonnes is None:
+            workersDonnes = 1
+        elif workersDonnes <= 0:
+            raise ValueError
+    except ValueError:
+        print("\033[91mErreur : Le nombre de processus (--workers) doit être un entier positif.\033[0m")
+        sys.exit(1)
+    heuristique1, heuristique2 = heuristiqueAvancee, heuristiqueExperte
+    try:  # Option --cache : nombre de positions mémorisées par le cache des évaluations de chaque IA
+        cacheDonne = extraireOption(arguments, "cache", int)
+        if cacheDonne is not None:
+            heuristique1 = CacheEvaluations(heuristique1, cacheDonne)
+            heuristique2 = CacheEvaluations(heuristique2, cacheDonne)
+    except ValueError:
+        print("\033[91mErreur : La taille du cache (--cache) doit être un entier positif.\033[0m")
+        sys.exit(1)
+
+    try:  # Options --verbosite (0 : aucun affichage, 1 : une ligne par coup, 2 : plateau) et --parties (tournoi)
+        verbositeDonnee = extraireOption(arguments, "verbosite", int)
+        if verbositeDonnee is None:
+            verbositeDonnee = PLATEAU
+        elif verbositeDonnee not in (SILENCE, COUPS, PLATEAU):
+            raise ValueError
+        partiesDonnees = extraireOption(arguments, "parties", int)
+        if partiesDonnees is not None and partiesDonnees <= 0:
+            raise ValueError
+    except ValueError:
+        print("\033[91mErreur : La verbosité (--verbosite) doit valoir 0, 1 ou 2 et le nombre de parties (--parties) "
+              "doit être un entier positif.\033[0m")
+        sys.exit(1)
+    try:  # Option --sortie : fichier complété par l'enregistrement de chaque partie (une ligne JSON par partie)
+        sortieDonnee = extraireOption(arguments, "sortie", str)
+        fichierSortie = None if sortieDonnee is None else open(sortieDonnee, 'a')
+    except (ValueError, OSError):
+        print("\033[91mErreur : Le fichier des parties (--sortie) ne peut pas être ouvert.\033[0m")
+        sys.exit(1)
+
+    if partiesDonnees is None:
+        AIVsAI(heuristique1, heuristique2, temps=tempsDonne, workers=workersDonnes,
+               statistiques=statistiquesDonnees, verbosite=verbositeDonnee, sortie=fichierSortie)
+    else:
+        tournoiIA(heuristique1, heuristique2, nb_parties=partiesDonnees, temps=tempsDonne, workers=workersDonnes,
+                  statistiques=statistiquesDonnees, verbosite=verbositeDonnee, sortie=fichierSortie)
@@ -0,0 +1,260 @@
+"""  L'éxecution de ce fichier lance un tournoi entre deux IA réparti sur plusieurs processus.
+    Contrairement à tournoiIA (IAVsIA.py), qui joue ses parties l'une après l'autre en affichant chaque coup :
+
+        - les parties sont distribuées sur un ensemble de processus (multiprocessing.Pool) et jouées sans affichage ;
+        - les couleurs sont alternées : l'IA 1 joue les pions '1' (et commence) dans les parties paires, les pions '2'
+        dans les parties impaires ;
+        - les parties peuvent démarrer depuis des ouvertures variées, lues dans un fichier (une ouverture par ligne :
+        les positions des premiers placements, joués alternativement par '1' et '2') ;
+        - le résultat de chaque partie (vainqueur, nombre de coups, durée, nœuds cherchés) est écrit dans un fichier
+        JSONL dès que la partie se termine ;
+        - un tournoi interrompu reprend là où il s'était arrêté : les parties déjà présentes dans le fichier ne sont
+        pas rejouées ;
+        - chaque processus conserve, pour chaque IA, sa session de recherche (table de transposition et
+        ordonnancement) d'un coup à l'autre et d'une partie à l'autre. Avec --tables, les tables sont chargées depuis
+        un répertoire au démarrage et y sont enregistrées après chaque partie, pour que les tournois suivants en
+        profitent.
+
+    Utilisation : python3 -m src.jeu.Tournoi <niveauIA1> <niveauIA2> [--parties 50] [--processus N]
+                  [--sortie tournoi.jsonl] [--ouvertures fichier] [--profondeurs 4,6] [--temps T]
+                  [--tables répertoire] """
+
+import contextlib
+import json
+import multiprocessing
+import os
+import sys
+import time
+
+from src.ia.minimax import minimax, minimaxIteratif
+from src.ia.heuristiques import heuristiqueNaive, heuristiqueAvancee, heuristiqueExperte
+from src.ia.ouvertures import coupOuverture
+from src.ia.session import SessionRecherche, fichierSession
+from src.ia.etat import mainsPlacement
+from src.ia.utils import moulinCree, extraireOption
+from src.jeu.IAVsIA import detecterCycle, verifierVictoireAvecRetour
+
+HEURISTIQUES = {'1': heuristiqueNaive, '2': heuristiqueAvancee, '3': heuristiqueExperte}
+COUPS_MAX = 400  # Au-delà, la partie est déclarée nulle
+
+_sessions = {}  # Sessions de recherche du processus, par niveau et numéro d'IA
+
+
+def lireOuvertures(chemin):
+    """ Lit un fichier d'ouvertures : une ouverture par ligne, sous la forme des positions des premiers placements
+    séparées par des espaces (joués alternativement par '1' puis '2'). Les lignes vides et celles commençant par '#'
+    sont ignorées.
+        :param chemin: Chemin du fichier.
+        :return: Liste d'ouvertures, chacune étant une liste de positions. """
+
+    ouvertures = []
+    with open(chemin) as fichier:
+        for ligne in fichier:
+            ligne = ligne.strip()
+            if not ligne or ligne.startswith('#'):
+                continue
+            ouverture = [int(position) for position in ligne.split()]
+            plateau = ['x'] * 24
+            for ply, position in enumerate(ouverture):  # Validation : placements distincts et sans moulin
+                if not 0 <= position < 24 or plateau[position] != 'x' or ply >= 18:
+                    raise ValueError(f"ouverture invalide : {ligne}")
+                plateau[position] = '1' if ply % 2 == 0 else '2'
+                if moulinCree(position, plateau):
+                    raise ValueError(f"ouverture formant un moulin : {ligne}")
+            ouvertures.append(ouverture)
+    return ouvertures
+
+
+def sessionIA(niveau, ia, tables=None):
+    """ Donne la session de recherche du processus pour une IA, créée à la première demande (et chargée depuis le
+    répertoire des tables s'il en contient une). Chaque IA a sa propre session, qui vieillit à chacun de ses coups.
+    Deux IA de même niveau partagent cependant la même table de transposition, ce qui est sans danger (les scores de
+    la table sont exprimés du point de vue du joueur au trait) : seule la session créée la première la fait vieillir.
+        :param niveau: Niveau de l'IA ('1' naïve, '2' avancée, '3' experte).
+        :param ia: Numéro de l'IA dans le tournoi (1 ou 2).
+        :param tables: Répertoire des tables enregistrées, ou None.
+        :return: SessionRecherche - La session. """
+
+    if (niveau, ia) not in _sessions:
+        autre = _sessions.get((niveau, 3 - ia))
+        if autre is not None:
+            session = SessionRecherche(HEURISTIQUES[niveau], table=autre.table, tablePartagee=True)
+        else:
+            session = SessionRecherche(HEURISTIQUES[niveau])
+            if tables is not None:
+                session.charger(fichierSession(tables, HEURISTIQUES[niveau]))
+        _sessions[(niveau, ia)] = session
+    return _sessions[(niveau, ia)]
+
+
+def jouerCoupIA(plateau, couleur, phase1, heuristique, profondeur, temps, session=None, enMain=None):
+    """ Joue le coup de l'IA possédant les pions de la couleur donnée, sans affichage.
+        :param plateau: Liste représentant l'état du plateau (modifiée sur place).
+        :param couleur: '1' ou '2', la couleur des pions joués.
+        :param phase1: Booléen indiquant si l'on est en phase de placement.
+        :param heuristique: Fonction heuristique de l'IA.
+        :param profondeur: Profondeur de recherche (profondeur maximale si un budget de temps est donné).
+        :param temps: Budget de temps par coup en secondes, ou None.
+        :param session: SessionRecherche de l'IA, ou None.
+        :param enMain: Tuple des pions restant à placer à chaque joueur (voir mainsPlacement), ou None.
+        :return: Nombre de nœuds cherchés. """
+
+    maximisant = couleur == '1'  # Le joueur '1' maximise l'évaluation
+    if session is not None:
+        session.nouveauCoup()
+    evalPlateau = coupOuverture(plateau, maximisant, phase1, heuristique)
+    if evalPlateau is not None:
+        pass  # Position du livre d'ouvertures : aucune recherche
+    elif temps is None:
+        evalPlateau = minimax(plateau, profondeur, maximisant, float('-inf'), float('inf'), phase1, heuristique,
+                              session=session, enMain=enMain)
+    else:
+        evalPlateau = minimaxIteratif(plateau, maximisant, phase1, heuristique, temps, profondeurMax=profondeur,
+                                      session=session, enMain=enMain)
+    plateau[:] = evalPlateau.plateau
+    return evalPlateau.noeuds
+
+
+def jouerPartie(parametres):
+    """ Joue une partie complète du tournoi, sans affichage. Exécutée dans un processus du pool.
+        :param parametres: Tuple (numéro de la partie, niveau IA 1, niveau IA 2, profondeurs, temps, ouverture ou
+        None, indice de l'ouverture ou None, répertoire des tables ou None).
+        :return: Dictionnaire décrivant le résultat de la partie. """
+
+    partie, niveau1, niveau2, profondeurs, temps, ouverture, indiceOuverture, tables = parametres
+    couleurIA1 = '1' if partie % 2 == 0 else '2'  # Alternance des couleurs
+    ias = {couleurIA1: (HEURISTIQUES[niveau1], profondeurs[0]),
+           '2' if couleurIA1 == '1' else '1': (HEURISTIQUES[niveau2], profondeurs[1])}
+    sessions = {couleurIA1: sessionIA(niveau1, 1, tables),
+                '2' if couleurIA1 == '1' else '1': sessionIA(niveau2, 2, tables)}
+
+    debut = time.perf_counter()
+    tableau = ['x'] * 24
+    for ply, position in enumerate(ouverture or []):
+        tableau[position] = '1' if ply % 2 == 0 else '2'
+    coups = len(ouverture or [])
+    noeuds = 0
+    gagnant = None
+
+    with open(os.devnull, 'w') as silence, contextlib.redirect_stdout(silence):
+        # Phase 1 : Placement des pions (les placements de l'ouverture sont déjà joués)
+        for ply in range(coups, 18):
+            couleur = '1' if ply % 2 == 0 else '2'
+            noeuds += jouerCoupIA(tableau, couleur, True, *ias[couleur], temps, sessions[couleur], mainsPlacement(ply))
+            coups += 1
+
+        # Phase 2 et 3 : Déplacement des pions
+        etatsPrecedents = set()
+        compteurCycles = 0
+        couleur = '1'
+        while coups < COUPS_MAX:
+            noeuds += jouerCoupIA(tableau, couleur, False, *ias[couleur], temps, sessions[couleur])
+            coups += 1
+            cycleDetecte, compteurCycles = detecterCycle(etatsPrecedents, tableau, compteurCycles)
+            if cycleDetecte:
+                break
+            gagnant = verifierVictoireAvecRetour(tableau)
+            if gagnant:
+                break
+            couleur = '2' if couleur == '1' else '1'
+
+    if tables is not None:  # Les tables enrichies par la partie sont conservées pour les tournois suivants
+        for niveau, ia in {niveau1: 1, niveau2: 2}.items():  # Une table par niveau, même partagée
+            sessionIA(niveau, ia).enregistrer(fichierSession(tables, HEURISTIQUES[niveau]))
+
+    if gagnant is None:
+        resultat = 'Egalite'
+    else:
+        resultat = 'IA1' if gagnant == couleurIA1 else 'IA2'
+    return {'partie': partie, 'couleurIA1': couleurIA1, 'ouverture': indiceOuverture, 'gagnant': resultat,
+            'coups': coups, 'temps': round(time.perf_counter() - debut, 3), 'noeuds': noeuds}
+
+
+def lireResultats(chemin):
+    """ Lit les résultats déjà enregistrés d'un tournoi (reprise après interruption).
+        :param chemin: Chemin du fichier JSONL.
+        :return: Dictionnaire associant le numéro de chaque partie terminée à son résultat. """
+
+    resultats = {}
+    if os.path.exists(chemin):
+        with open(chemin) as fichier:
+            for ligne in fichier:
+                try:
+                    resultat = json.loads(ligne)
+                except ValueError:
+                    continue  # Ligne tronquée par une interruption
+                resultats[resultat['partie']] = resultat
+    return resultats
+
+
+def tournoiParallele(niveau1, niveau2, nbParties=50, processus=None, sortie='tournoi.jsonl', ouvertures=None,
+                     profondeurs=(4, 6), temps=None, tables=None):
+    """ Organise un tournoi entre deux IA sur plusieurs processus, en enregistrant chaque partie dès sa fin.
+        :param niveau1: Niveau de l'IA 1 ('1' naïve, '2' avancée, '3' experte).
+        :param niveau2: Niveau de l'IA 2.
+        :param nbParties: Nombre total de parties du tournoi.
+        :param processus: Nombre de processus du pool (par défaut, le nombre de cœurs).
+        :param sortie: Chemin du fichier JSONL des résultats, complété si le tournoi reprend.
+        :param ouvertures: Liste d'ouvertures (listes de positions) utilisées à tour de rôle, ou None.
+        :param profondeurs: Profondeurs de recherche de l'IA 1 et de l'IA 2.
+        :param temps: Budget de temps par coup en secondes (les profondeurs deviennent des maxima), ou None.
+        :param tables: Répertoire où les tables de transposition sont chargées puis enregistrées, ou None.
+        :return: Résultats du tournoi sous forme d'un dictionnaire. """
+
+    resultats = lireResultats(sortie)
+    if tables is not None:
+        os.makedirs(tables, exist_ok=True)
+    taches = []
+    for partie in range(nbParties):
+        if partie in resultats:
+            continue  # Partie déjà jouée lors d'une exécution précédente
+        # Chaque ouverture est jouée deux fois de suite, une fois avec chaque couleur
+        indiceOuverture = (partie // 2) % len(ouvertures) if ouvertures else None
+        ouverture = ouvertures[indiceOuverture] if ouvertures else None
+        taches.append((partie, niveau1, niveau2, tuple(profondeurs), temps, ouverture, indiceOuverture, tables))
+
+    if taches:
+        print(f"{len(resultats)} parties déjà jouées, {len(taches)} restantes.")
+        with multiprocessing.Pool(processus) as pool, open(sortie, 'a') as fichier:
+            for resultat in pool.imap_unordered(jouerPartie, taches):
+                fichier.write(json.dumps(resultat) + "\n")
+                fichier.flush()  # Le résultat est conservé même si le tournoi est interrompu ensuite
+                resultats[resultat['partie']] = resultat
+                print(f"Partie {resultat['partie'] + 1} : {resultat['gagnant']} ({resultat['coups']} coups, "
+                      f"{resultat['temps']} s)")
+
+    bilan = {'IA1': 0, 'IA2': 0, 'Egalite': 0}
+    for partie in range(nbParties):
+        if partie in resultats:
+            bilan[resultats[partie]['gagnant']] += 1
+
+    print("\n--- Résultats du tournoi ---")
+    print(f"IA 1 : {bilan['IA1']} victoires")
+    print(f"IA 2 : {bilan['IA2']} victoires")
+    print(f"Égalités : {bilan['Egalite']}")
+    return bilan
+
+
+if __name__ == "__main__":
+    arguments = sys.argv[1:]
+    try:
+        nbPartiesDonne = extraireOption(arguments, "parties", int) or 50
+        processusDonnes = extraireOption(arguments, "processus", int)
+        sortieDonnee = extraireOption(arguments, "sortie", str) or "tournoi.jsonl"
+        cheminOuvertures = extraireOption(arguments, "ouvertures", str)
+        profondeursDonnees = extraireOption(arguments, "profondeurs", lambda v: tuple(int(p) for p in v.split(',')))
+        tempsDonne = extraireOption(arguments, "temps", float)
+        tablesDonnees = extraireOption(arguments, "tables", str)
+        if len(arguments) != 2 or any(niveau not in HEURISTIQUES for niveau in arguments):
+            raise ValueError
+        if profondeursDonnees is not None and len(profondeursDonnees) != 2:
+            raise ValueError
+        ouverturesDonnees = lireOuvertures(cheminOuvertures) if cheminOuvertures else None
+    except (ValueError, OSError) as erreur:
+        print(f"\033[91mErreur : {str(erreur) or 'arguments invalides'}.\033[0m")
+        print("Utilisation : python3 -m src.jeu.Tournoi <niveauIA1> <niveauIA2> [--parties 50] [--processus N] "
+              "[--sortie tournoi.jsonl] [--ouvertures fichier] [--profondeurs 4,6] [--temps T] [--tables répertoire]")
+        sys.exit(1)
+
+    tournoiParallele(arguments[0], arguments[1], nbPartiesDonne, processusDonnes, sortieDonnee, ouverturesDonnees,
+                     profondeursDonnees or (4, 6), tempsDonne, tablesDonnees)
@@ -0,0 +1,66 @@
+""" Tests de l'évaluation incrémentale (evaluation.py) : sur des positions aléatoires, puis après chaque coup d'une
+    suite aléatoire de coups légaux joués et défaits, les compteurs de l'état doivent donner exactement le score de
+    heuristiqueExperte. """
+
+import random
+
+import pytest
+
+from src.ia.bitboard import coupsPossibles
+from src.ia.etat import mainsSelonPhase
+from src.ia.evaluation import EtatExperte, contributionPosition, evaluationExperte
+from src.ia.heuristiques import heuristiqueExperte
+
+GRAINE = 0
+NOMBRE_POSITIONS = 500
+COUPS_PAR_SUITE = 8
+
+
+def positionsAleatoires(graine=GRAINE, nombre=NOMBRE_POSITIONS):
+    """ Tire des plateaux aléatoires, toujours les mêmes pour une graine donnée.
+        :param graine: int - Graine du générateur aléatoire.
+        :param nombre: int - Nombre de plateaux.
+        :return: list - Liste de plateaux de 24 cases 'x', '1' ou '2'. """
+
+    generateur = random.Random(graine)
+    return [[generateur.choice('x12') for _ in range(24)] for _ in range(nombre)]
+
+
+def verifierEtat(etat):
+    """ Compare les compteurs et l'évaluation d'un état au calcul complet de heuristiqueExperte.
+        :param etat: EtatExperte - L'état à vérifier. """
+
+    plateau = etat.versListe()
+    assert etat.total == sum(contributionPosition(q, *etat.pions) for q in range(24)), plateau
+    for phase1 in (True, False):
+        attendu = heuristiqueExperte(plateau, phase1)
+        assert evaluationExperte(etat.total, phase1) == attendu, (plateau, phase1)
+        assert etat.evaluer(None, phase1, 0) == attendu, (plateau, phase1)
+        assert etat.evaluer(None, phase1, 1) == -attendu, (plateau, phase1)
+
+
+def test_positionsAleatoires():
+    for plateau in positionsAleatoires():
+        verifierEtat(EtatExperte.depuisListe(plateau, enMain=mainsSelonPhase(True)))
+
+
+@pytest.mark.parametrize('etape1', [True, False])
+def test_suitesDeCoups(etape1):
+    generateur = random.Random(GRAINE + etape1)
+    for plateau in positionsAleatoires(GRAINE + 1 + etape1):
+        etat = EtatExperte.depuisListe(plateau, enMain=mainsSelonPhase(True))  # Placements possibles jusqu'au bout
+        joues = []
+        joueur = generateur.randrange(2)
+        for _ in range(COUPS_PAR_SUITE):
+            coups = coupsPossibles(etat.pions, joueur, etape1)
+            if not coups:
+                break
+            coup = generateur.choice(coups)
+            etat.appliquer(coup, joueur)
+            joues.append((coup, joueur))
+            verifierEtat(etat)
+            joueur = 1 - joueur
+        for coup, joueur in reversed(joues):  # Annulation dans l'ordre inverse
+            etat.annuler(coup, joueur)
+            verifierEtat(etat)
+        assert etat.versListe() == plateau and not etat.pile
@@ -0,0 +1,34 @@
+""" Tests de la notation compacte des coups (IAVsIA.py) : tout coup légal, placement ou déplacement, avec ou sans
+    prise, doit être relu par lireNotation tel que notationCoup l'a écrit. """
+
+import random
+
+import pytest
+
+from src.ia.bitboard import coupsPossibles
+from src.ia.etat import mainsSelonPhase
+from src.ia.evaluation import EtatExperte
+from src.jeu.IAVsIA import lireNotation, notationCoup
+
+GRAINE = 0
+NOMBRE_POSITIONS = 300
+
+
+@pytest.mark.parametrize('etape1', [True, False])
+def test_allerRetour(etape1):
+    generateur = random.Random(GRAINE + etape1)
+    prises = 0
+    for _ in range(NOMBRE_POSITIONS):
+        plateau = [generateur.choice('x12') for _ in range(24)]
+        etat = EtatExperte.depuisListe(plateau, enMain=mainsSelonPhase(True))
+        for joueur in (0, 1):
+            for coup in coupsPossibles(etat.pions, joueur, etape1):
+                assert lireNotation(notationCoup(coup)) == coup, coup
+                prises += coup.capture is not None
+    assert prises > 0  # Les prises ont bien été couvertes
+
+
+@pytest.mark.parametrize('texte', ["", "x3", "7-", "a-6", "7-6x", "-6"])
+def test_notationInvalide(texte):
+    with pytest.raises(ValueError):
+        lireNotation(texte)